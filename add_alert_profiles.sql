@@ -0,0 +1,48 @@
+-- Migration: Add saved opportunity alert profiles and the alert inbox
+-- Description: alert_profiles stores each organization's alert criteria.
+-- alert_profile_terms is an inverted index from NAICS and jurisdiction codes
+-- to active profiles. OpportunityService.create_opportunity uses it to score
+-- only the profiles that share a code with the new opportunity, and writes
+-- relevant matches to opportunity_alerts (the per-organization inbox).
+-- Date: 2025-12-02
+
+CREATE TABLE IF NOT EXISTS alert_profiles (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    name VARCHAR(255) NOT NULL,
+    naics_codes TEXT[] NOT NULL DEFAULT '{}',
+    jurisdiction_codes TEXT[] NOT NULL DEFAULT '{}',
+    min_relevance INTEGER NOT NULL DEFAULT 50,
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_alert_profiles_organization
+    ON alert_profiles(organization_id);
+
+CREATE TABLE IF NOT EXISTS alert_profile_terms (
+    term_type VARCHAR(20) NOT NULL,                -- 'naics' or 'jurisdiction'
+    term VARCHAR(50) NOT NULL,
+    profile_id UUID NOT NULL REFERENCES alert_profiles(id) ON DELETE CASCADE,
+    PRIMARY KEY (term_type, term, profile_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_alert_profile_terms_profile
+    ON alert_profile_terms(profile_id);
+
+CREATE TABLE IF NOT EXISTS opportunity_alerts (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    organization_id UUID NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+    profile_id UUID NOT NULL REFERENCES alert_profiles(id) ON DELETE CASCADE,
+    opportunity_id UUID NOT NULL REFERENCES opportunities(id) ON DELETE CASCADE,
+    relevance_score INTEGER NOT NULL,
+    is_read BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    UNIQUE (profile_id, opportunity_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_opportunity_alerts_inbox
+    ON opportunity_alerts(organization_id, created_at DESC);
+
+-- Verification query
+-- SELECT t.term_type, t.term, COUNT(*) FROM alert_profile_terms t GROUP BY 1, 2 ORDER BY 3 DESC LIMIT 20;
@@ -0,0 +1,23 @@
+-- Migration: Add input fingerprint and result snapshot to pre_bid_assessments
+-- Description: Hash of the opportunity row, the organization's network, the
+-- directory supply for the opportunity's jurisdiction and NAICS codes, and the
+-- day used for due-date scoring. perform_assessment returns the stored result of
+-- the latest assessment with the same fingerprint instead of writing a new one.
+-- subcontractor_directory.updated_at versions the directory supply.
+-- Date: 2025-11-29
+
+ALTER TABLE pre_bid_assessments
+ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR(64),
+ADD COLUMN IF NOT EXISTS result_snapshot JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_pre_bid_assessments_fingerprint
+ON pre_bid_assessments (organization_id, opportunity_id, input_fingerprint);
+
+ALTER TABLE subcontractor_directory
+ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+
+UPDATE subcontractor_directory
+SET updated_at = COALESCE(created_at, NOW());
+
+-- Verification query
+-- SELECT opportunity_id, input_fingerprint, assessed_at FROM pre_bid_assessments ORDER BY assessed_at DESC LIMIT 10;
@@ -0,0 +1,274 @@
+-- Migration: Add bid_participation table maintained by triggers
+-- Description: Per-bid, per-category participation totals in integer cents, computed
+-- in SQL with the same rules as app/validation/participation.py (ParticipationLedger):
+--   * lines with a category_breakdown claim each entry's share of subcontract_value;
+--     the share is certified when the subcontractor's directory entry holds that certification
+--   * lines without a breakdown count their full value toward every category the directory
+--     certifies (MBE additionally requires counts_toward_mbe)
+--   * lines whose subcontractor row is missing only count toward the subcontract total
+-- Rows are refreshed incrementally, for the affected bids only, by statement-level
+-- triggers on bids, bid_subcontractors, subcontractors and subcontractor_directory.
+-- A regular table is used instead of a materialized view because
+-- REFRESH MATERIALIZED VIEW always recomputes every bid.
+-- Date: 2025-11-26
+
+CREATE TABLE IF NOT EXISTS bid_participation (
+    bid_id UUID NOT NULL REFERENCES bids(id) ON DELETE CASCADE,
+    category VARCHAR(10) NOT NULL,                 -- mbe, vsbe, wbe, sbe, dbe, cbe
+    claimed_cents BIGINT NOT NULL DEFAULT 0,
+    certified_cents BIGINT NOT NULL DEFAULT 0,
+    subcontract_total_cents BIGINT NOT NULL DEFAULT 0,
+    bid_total_cents BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (bid_id, category)
+);
+
+-- True when a directory certifications object flags the category (keys are matched case-insensitively)
+CREATE OR REPLACE FUNCTION bid_participation_certified(certs JSONB, category TEXT)
+RETURNS BOOLEAN AS $$
+    SELECT CASE WHEN jsonb_typeof(certs) = 'object' THEN EXISTS (
+        SELECT 1
+        FROM jsonb_each(certs) c
+        WHERE lower(c.key) = category
+          AND c.value NOT IN ('false'::jsonb, 'null'::jsonb, '0'::jsonb, '""'::jsonb, '[]'::jsonb, '{}'::jsonb)
+    ) ELSE FALSE END;
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Recompute the rows of the given bids
+CREATE OR REPLACE FUNCTION refresh_bid_participation(p_bid_ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    IF p_bid_ids IS NULL OR cardinality(p_bid_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    DELETE FROM bid_participation WHERE bid_id = ANY(p_bid_ids);
+
+    INSERT INTO bid_participation (
+        bid_id, category, claimed_cents, certified_cents,
+        subcontract_total_cents, bid_total_cents, updated_at
+    )
+    WITH lines AS (
+        SELECT
+            bs.bid_id,
+            ROUND(COALESCE(bs.subcontract_value, 0) * 100)::BIGINT AS value_cents,
+            CASE
+                WHEN jsonb_typeof(bs.category_breakdown) = 'array'
+                     AND jsonb_array_length(bs.category_breakdown) > 0
+                THEN bs.category_breakdown
+            END AS breakdown,
+            COALESCE(bs.counts_toward_mbe, FALSE) AS counts_toward_mbe,
+            s.legal_name,
+            d.id AS directory_id,
+            d.certifications
+        FROM bid_subcontractors bs
+        LEFT JOIN subcontractors s ON s.id = bs.subcontractor_id
+        -- First directory entry per legal name, as load_bid_context picks it
+        LEFT JOIN LATERAL (
+            SELECT sd.id, sd.certifications
+            FROM subcontractor_directory sd
+            WHERE sd.legal_name = s.legal_name
+            ORDER BY sd.created_at, sd.id
+            LIMIT 1
+        ) d ON TRUE
+        WHERE bs.bid_id = ANY(p_bid_ids)
+    ),
+    allocations AS (
+        SELECT
+            l.bid_id,
+            lower(COALESCE(e->>'category', '')) AS category,
+            (l.value_cents * ROUND(COALESCE((e->>'percentage')::NUMERIC, 0) * 100)::BIGINT + 5000) / 10000 AS claimed_cents,
+            bid_participation_certified(l.certifications, lower(COALESCE(e->>'category', ''))) AS certified
+        FROM lines l
+        CROSS JOIN LATERAL jsonb_array_elements(l.breakdown) e
+        WHERE l.legal_name IS NOT NULL
+          AND l.breakdown IS NOT NULL
+
+        UNION ALL
+
+        SELECT l.bid_id, c.category, l.value_cents, TRUE
+        FROM lines l
+        CROSS JOIN (VALUES ('mbe'), ('vsbe'), ('wbe'), ('sbe'), ('dbe'), ('cbe')) c(category)
+        WHERE l.legal_name IS NOT NULL
+          AND l.breakdown IS NULL
+          AND l.directory_id IS NOT NULL
+          AND bid_participation_certified(l.certifications, c.category)
+          AND (c.category <> 'mbe' OR l.counts_toward_mbe)
+    ),
+    totals AS (
+        SELECT bid_id, SUM(value_cents)::BIGINT AS subcontract_total_cents
+        FROM lines
+        GROUP BY bid_id
+    )
+    SELECT
+        b.id,
+        c.category,
+        COALESCE(SUM(a.claimed_cents), 0)::BIGINT,
+        COALESCE(SUM(a.claimed_cents) FILTER (WHERE a.certified), 0)::BIGINT,
+        COALESCE(t.subcontract_total_cents, 0),
+        ROUND(COALESCE(b.total_amount, 0) * 100)::BIGINT,
+        NOW()
+    FROM bids b
+    CROSS JOIN (VALUES ('mbe'), ('vsbe'), ('wbe'), ('sbe'), ('dbe'), ('cbe')) c(category)
+    LEFT JOIN allocations a ON a.bid_id = b.id AND a.category = c.category
+    LEFT JOIN totals t ON t.bid_id = b.id
+    WHERE b.id = ANY(p_bid_ids)
+    GROUP BY b.id, c.category, t.subcontract_total_cents, b.total_amount;
+END;
+$$ LANGUAGE plpgsql;
+
+-- bids: new bids get zero rows, total_amount changes update bid_total_cents
+CREATE OR REPLACE FUNCTION bid_participation_on_bids()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_bid_participation(ARRAY(SELECT id FROM new_rows));
+    ELSE
+        PERFORM refresh_bid_participation(ARRAY(
+            SELECT n.id
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n.total_amount IS DISTINCT FROM o.total_amount
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- bid_subcontractors: any change refreshes the bids the changed lines belong to
+CREATE OR REPLACE FUNCTION bid_participation_on_lines()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_bid_participation(ARRAY(
+            SELECT DISTINCT bid_id FROM new_rows WHERE bid_id IS NOT NULL
+        ));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_bid_participation(ARRAY(
+            SELECT bid_id FROM new_rows WHERE bid_id IS NOT NULL
+            UNION
+            SELECT bid_id FROM old_rows WHERE bid_id IS NOT NULL
+        ));
+    ELSE
+        PERFORM refresh_bid_participation(ARRAY(
+            SELECT DISTINCT bid_id FROM old_rows WHERE bid_id IS NOT NULL
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- subcontractors: a renamed subcontractor may resolve to a different directory entry
+CREATE OR REPLACE FUNCTION bid_participation_on_subcontractors()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_bid_participation(ARRAY(
+        SELECT DISTINCT bs.bid_id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        JOIN bid_subcontractors bs ON bs.subcontractor_id = n.id
+        WHERE n.legal_name IS DISTINCT FROM o.legal_name
+          AND bs.bid_id IS NOT NULL
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- subcontractor_directory: certification or name changes refresh bids using those names
+CREATE OR REPLACE FUNCTION bid_participation_on_directory()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed_names TEXT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        changed_names := ARRAY(SELECT legal_name FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        changed_names := ARRAY(
+            SELECT n.legal_name
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n.certifications IS DISTINCT FROM o.certifications
+               OR n.legal_name IS DISTINCT FROM o.legal_name
+               OR n.created_at IS DISTINCT FROM o.created_at
+            UNION
+            SELECT o.legal_name
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n.legal_name IS DISTINCT FROM o.legal_name
+        );
+    ELSE
+        changed_names := ARRAY(SELECT legal_name FROM old_rows);
+    END IF;
+
+    PERFORM refresh_bid_participation(ARRAY(
+        SELECT DISTINCT bs.bid_id
+        FROM subcontractors s
+        JOIN bid_subcontractors bs ON bs.subcontractor_id = s.id
+        WHERE s.legal_name = ANY(changed_names)
+          AND bs.bid_id IS NOT NULL
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables allow one event per trigger, hence one trigger per event
+DROP TRIGGER IF EXISTS bid_participation_bids_insert ON bids;
+CREATE TRIGGER bid_participation_bids_insert
+    AFTER INSERT ON bids
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_bids();
+
+DROP TRIGGER IF EXISTS bid_participation_bids_update ON bids;
+CREATE TRIGGER bid_participation_bids_update
+    AFTER UPDATE ON bids
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_bids();
+
+DROP TRIGGER IF EXISTS bid_participation_lines_insert ON bid_subcontractors;
+CREATE TRIGGER bid_participation_lines_insert
+    AFTER INSERT ON bid_subcontractors
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_lines();
+
+DROP TRIGGER IF EXISTS bid_participation_lines_update ON bid_subcontractors;
+CREATE TRIGGER bid_participation_lines_update
+    AFTER UPDATE ON bid_subcontractors
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_lines();
+
+DROP TRIGGER IF EXISTS bid_participation_lines_delete ON bid_subcontractors;
+CREATE TRIGGER bid_participation_lines_delete
+    AFTER DELETE ON bid_subcontractors
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_lines();
+
+DROP TRIGGER IF EXISTS bid_participation_subcontractors_update ON subcontractors;
+CREATE TRIGGER bid_participation_subcontractors_update
+    AFTER UPDATE ON subcontractors
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_subcontractors();
+
+DROP TRIGGER IF EXISTS bid_participation_directory_insert ON subcontractor_directory;
+CREATE TRIGGER bid_participation_directory_insert
+    AFTER INSERT ON subcontractor_directory
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_directory();
+
+DROP TRIGGER IF EXISTS bid_participation_directory_update ON subcontractor_directory;
+CREATE TRIGGER bid_participation_directory_update
+    AFTER UPDATE ON subcontractor_directory
+    REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_directory();
+
+DROP TRIGGER IF EXISTS bid_participation_directory_delete ON subcontractor_directory;
+CREATE TRIGGER bid_participation_directory_delete
+    AFTER DELETE ON subcontractor_directory
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bid_participation_on_directory();
+
+-- Backfill existing bids
+SELECT refresh_bid_participation(ARRAY(SELECT id FROM bids));
+
+-- Verification query
+-- SELECT bid_id, category, claimed_cents, certified_cents, subcontract_total_cents, bid_total_cents
+-- FROM bid_participation ORDER BY bid_id, category LIMIT 20;
@@ -0,0 +1,43 @@
+-- Migration: Add compliance rule drafts and shadow evaluation diffs
+-- Description: A draft is a proposed version of a compliance rule (or a proposed new
+-- rule). While a draft is active it is evaluated in the background after every
+-- /bids/{id}/validate call, and the jurisdiction compliance outcome with the draft in
+-- place is compared with the live outcome. shadow_rule_diffs keeps the latest
+-- comparison per draft and bid; diverged marks bids whose status would change.
+-- Date: 2025-11-28
+
+CREATE TABLE IF NOT EXISTS compliance_rule_drafts (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    compliance_rule_id UUID REFERENCES compliance_rules(id) ON DELETE CASCADE,  -- NULL for a proposed new rule
+    jurisdiction_id UUID NOT NULL REFERENCES jurisdictions(id),
+    rule_name VARCHAR(255) NOT NULL,
+    rule_type VARCHAR(50) NOT NULL,
+    rule_definition JSONB NOT NULL DEFAULT '{}'::jsonb,
+    severity VARCHAR(20) NOT NULL DEFAULT 'ERROR',
+    is_active BOOLEAN NOT NULL DEFAULT TRUE,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_compliance_rule_drafts_active
+ON compliance_rule_drafts (jurisdiction_id) WHERE is_active;
+
+CREATE TABLE IF NOT EXISTS shadow_rule_diffs (
+    draft_id UUID NOT NULL REFERENCES compliance_rule_drafts(id) ON DELETE CASCADE,
+    bid_id UUID NOT NULL REFERENCES bids(id) ON DELETE CASCADE,
+    jurisdiction_id UUID NOT NULL REFERENCES jurisdictions(id),
+    live_status VARCHAR(20) NOT NULL,      -- jurisdiction_compliance status with the live rules
+    shadow_status VARCHAR(20) NOT NULL,    -- the same with the draft in place
+    diverged BOOLEAN NOT NULL,
+    live_findings JSONB,
+    shadow_findings JSONB,
+    evaluated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (draft_id, bid_id)
+);
+
+-- Divergence report groups by jurisdiction
+CREATE INDEX IF NOT EXISTS idx_shadow_rule_diffs_jurisdiction
+ON shadow_rule_diffs (jurisdiction_id);
+
+-- Verification query
+-- SELECT draft_id, COUNT(*) AS evaluated, COUNT(*) FILTER (WHERE diverged) AS diverged
+-- FROM shadow_rule_diffs GROUP BY draft_id;
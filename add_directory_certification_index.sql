@@ -0,0 +1,15 @@
+-- Migration: Index directory certifications and jurisdiction codes
+-- Description: GIN indexes for directory candidate lookups such as the goal optimizer's
+-- "certified for MBE or VSBE and active in one of these jurisdictions" query
+-- (certifications @> '{"mbe": true}' and jurisdiction_codes && ARRAY[...]).
+-- Date: 2025-11-27
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_certifications
+ON subcontractor_directory USING GIN (certifications jsonb_path_ops);
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_directory_jurisdiction_codes
+ON subcontractor_directory USING GIN (jurisdiction_codes);
+
+-- Verification query
+-- EXPLAIN SELECT id FROM subcontractor_directory
+-- WHERE certifications @> '{"mbe": true}' AND jurisdiction_codes && ARRAY['MD'];
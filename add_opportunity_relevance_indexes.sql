@@ -0,0 +1,17 @@
+-- Migration: Index active opportunities for relevance alerts
+-- Description: /opportunities/alerts/relevant scores active opportunities in one
+-- query. With a high min_relevance it also requires a NAICS overlap and/or a
+-- jurisdiction match, which these partial indexes serve.
+-- Date: 2025-12-01
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_active_naics_codes
+ON opportunities USING GIN (naics_codes)
+WHERE is_active = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_active_jurisdiction_due
+ON opportunities (jurisdiction_id, due_date)
+WHERE is_active = TRUE;
+
+-- Verification query
+-- EXPLAIN ANALYZE SELECT id FROM opportunities
+-- WHERE is_active = TRUE AND naics_codes && ARRAY['237310'];
@@ -0,0 +1,39 @@
+-- Migration: Add subcontractor_commitments table
+-- Description: Running totals of how many bids (across all organizations) each
+-- subcontractor is committed to, and the subcontract value committed. Kept up to
+-- date incrementally by BidService.add_subcontractor_to_bid and
+-- remove_subcontractor_from_bid, so the overcommitment check reads one row per
+-- subcontractor instead of aggregating bid_subcontractors.
+-- Date: 2025-11-28
+
+CREATE TABLE IF NOT EXISTS subcontractor_commitments (
+    subcontractor_id UUID PRIMARY KEY REFERENCES subcontractors(id) ON DELETE CASCADE,
+    bid_count INTEGER NOT NULL DEFAULT 0,          -- distinct bids the subcontractor is on
+    line_count INTEGER NOT NULL DEFAULT 0,         -- bid_subcontractors rows
+    committed_value NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_subcontractor_commitments_bid_count
+    ON subcontractor_commitments(bid_count DESC);
+
+-- Backfill from existing bid lines (re-running recomputes every row)
+INSERT INTO subcontractor_commitments (subcontractor_id, bid_count, line_count, committed_value, updated_at)
+SELECT
+    subcontractor_id,
+    COUNT(DISTINCT bid_id),
+    COUNT(*),
+    COALESCE(SUM(subcontract_value), 0),
+    NOW()
+FROM bid_subcontractors
+WHERE subcontractor_id IS NOT NULL
+GROUP BY subcontractor_id
+ON CONFLICT (subcontractor_id) DO UPDATE SET
+    bid_count = EXCLUDED.bid_count,
+    line_count = EXCLUDED.line_count,
+    committed_value = EXCLUDED.committed_value,
+    updated_at = EXCLUDED.updated_at;
+
+-- Verification query
+-- SELECT subcontractor_id, bid_count, line_count, committed_value
+-- FROM subcontractor_commitments ORDER BY bid_count DESC LIMIT 20;
@@ -0,0 +1,81 @@
+-- Migration: Add assessment_rollups and outreach_rollups tables
+-- Description: Running counts behind the assessment summary and outreach
+-- statistics endpoints. When SUMMARY_ROLLUPS=true, PreBidAssessmentService and
+-- SubcontractorOutreachService apply each create, status change and delete to
+-- these tables, and the summary endpoints read one row instead of aggregating.
+-- Run this (re-running recomputes every row) before turning SUMMARY_ROLLUPS on.
+-- Date: 2025-11-30
+
+CREATE TABLE IF NOT EXISTS assessment_rollups (
+    organization_id UUID PRIMARY KEY REFERENCES organizations(id) ON DELETE CASCADE,
+    total INTEGER NOT NULL DEFAULT 0,
+    bid_count INTEGER NOT NULL DEFAULT 0,
+    caution_count INTEGER NOT NULL DEFAULT 0,
+    no_bid_count INTEGER NOT NULL DEFAULT 0,
+    risk_score_sum BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS outreach_rollups (
+    scope VARCHAR(20) NOT NULL,                    -- 'organization' or 'opportunity'
+    scope_id UUID NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    contacted INTEGER NOT NULL DEFAULT 0,
+    responded INTEGER NOT NULL DEFAULT 0,
+    committed INTEGER NOT NULL DEFAULT 0,
+    declined INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (scope, scope_id)
+);
+
+-- Backfill from existing assessments
+INSERT INTO assessment_rollups (organization_id, total, bid_count, caution_count, no_bid_count, risk_score_sum, updated_at)
+SELECT
+    organization_id,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE recommendation = 'BID'),
+    COUNT(*) FILTER (WHERE recommendation = 'CAUTION'),
+    COUNT(*) FILTER (WHERE recommendation = 'NO_BID'),
+    COALESCE(SUM(overall_risk_score), 0),
+    NOW()
+FROM pre_bid_assessments
+WHERE organization_id IS NOT NULL
+GROUP BY organization_id
+ON CONFLICT (organization_id) DO UPDATE SET
+    total = EXCLUDED.total,
+    bid_count = EXCLUDED.bid_count,
+    caution_count = EXCLUDED.caution_count,
+    no_bid_count = EXCLUDED.no_bid_count,
+    risk_score_sum = EXCLUDED.risk_score_sum,
+    updated_at = EXCLUDED.updated_at;
+
+-- Backfill from existing outreach, once per organization and once per opportunity
+INSERT INTO outreach_rollups (scope, scope_id, total, contacted, responded, committed, declined, updated_at)
+SELECT
+    scope,
+    scope_id,
+    COUNT(*),
+    COUNT(*) FILTER (WHERE status = 'CONTACTED'),
+    COUNT(*) FILTER (WHERE status = 'RESPONDED'),
+    COUNT(*) FILTER (WHERE status = 'COMMITTED'),
+    COUNT(*) FILTER (WHERE status = 'DECLINED'),
+    NOW()
+FROM (
+    SELECT 'organization' AS scope, organization_id AS scope_id, status
+    FROM subcontractor_outreach WHERE organization_id IS NOT NULL
+    UNION ALL
+    SELECT 'opportunity', opportunity_id, status
+    FROM subcontractor_outreach WHERE opportunity_id IS NOT NULL
+) AS scoped
+GROUP BY scope, scope_id
+ON CONFLICT (scope, scope_id) DO UPDATE SET
+    total = EXCLUDED.total,
+    contacted = EXCLUDED.contacted,
+    responded = EXCLUDED.responded,
+    committed = EXCLUDED.committed,
+    declined = EXCLUDED.declined,
+    updated_at = EXCLUDED.updated_at;
+
+-- Verification query
+-- SELECT * FROM assessment_rollups ORDER BY total DESC LIMIT 10;
+-- SELECT * FROM outreach_rollups ORDER BY total DESC LIMIT 10;
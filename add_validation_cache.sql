@@ -0,0 +1,11 @@
+-- Migration: Add input fingerprint to validation_runs
+-- Description: Hash of the bid, its subcontractors, their directory rows, the
+-- jurisdictions and compliance rules, plus the rule set version. A validate call
+-- whose fingerprint matches the latest run returns that run without re-running rules.
+-- Date: 2025-11-24
+
+ALTER TABLE validation_runs
+ADD COLUMN IF NOT EXISTS input_fingerprint VARCHAR(64);
+
+-- Verification query
+-- SELECT bid_id, input_fingerprint, created_at FROM validation_runs ORDER BY created_at DESC LIMIT 10;
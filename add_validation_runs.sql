@@ -0,0 +1,38 @@
+-- Migration: Add validation_runs table and compact validation results
+-- Description: Keeps one row per validation run instead of deleting results on every
+-- re-validate. Results store a short rule code plus message parameters; the text is
+-- rendered by the API. A run whose results match the previous run writes no result
+-- rows and points at the earlier run through results_run_id.
+-- Date: 2025-11-24
+
+CREATE TABLE IF NOT EXISTS validation_runs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    bid_id UUID REFERENCES bids(id),
+    results_run_id UUID REFERENCES validation_runs(id),
+    results_digest VARCHAR(64),
+    overall_status VARCHAR(20),
+    total_validations INTEGER DEFAULT 0,
+    passed INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0,
+    warnings INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Run history is always read newest first per bid
+CREATE INDEX IF NOT EXISTS idx_validation_runs_bid_created
+ON validation_runs (bid_id, created_at DESC);
+
+ALTER TABLE validation_results
+ADD COLUMN IF NOT EXISTS run_id UUID REFERENCES validation_runs(id),
+ADD COLUMN IF NOT EXISTS position INTEGER DEFAULT 0,
+ADD COLUMN IF NOT EXISTS rule_code VARCHAR(8),
+ADD COLUMN IF NOT EXISTS message_params JSONB;
+
+COMMENT ON COLUMN validation_results.message_params IS
+'Message codes and parameters: [["MBE_BELOW", {"actual": "12.50", "goal": "25"}]]';
+
+CREATE INDEX IF NOT EXISTS idx_validation_results_run_id
+ON validation_results (run_id);
+
+-- Verification query
+-- SELECT bid_id, overall_status, created_at FROM validation_runs ORDER BY created_at DESC LIMIT 10;
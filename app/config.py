@@ -28,6 +28,33 @@ class Settings(BaseSettings):
     API_V1_PREFIX: str = "/api/v1"
     PROJECT_NAME: str = "ComplyForm API"
 
+    # Worker processes for bulk revalidation (0 = one per CPU core)
+    VALIDATION_WORKERS: int = int(os.getenv("VALIDATION_WORKERS", "0"))
+
+    # Revalidate affected bids in the background when compliance rules or directory entries change
+    AUTO_REVALIDATE: bool = os.getenv("AUTO_REVALIDATE", "True").lower() == "true"
+
+    # Seconds an organization's cached network capacity index is reused before reloading
+    NETWORK_INDEX_TTL_SECONDS: int = int(os.getenv("NETWORK_INDEX_TTL_SECONDS", "300"))
+
+    # Evaluate active compliance rule drafts in the background after each bid validation
+    SHADOW_EVALUATION: bool = os.getenv("SHADOW_EVALUATION", "True").lower() == "true"
+
+    # Seconds the team builder's directory candidate index is reused before reloading
+    TEAM_INDEX_TTL_SECONDS: int = int(os.getenv("TEAM_INDEX_TTL_SECONDS", "300"))
+
+    # Keep assessment and outreach summary counts in rollup tables and read summaries
+    # from them (run add_summary_rollups.sql, which also backfills, before enabling)
+    SUMMARY_ROLLUPS: bool = os.getenv("SUMMARY_ROLLUPS", "False").lower() == "true"
+
+    # A subcontractor on more concurrent bids, or with more subcontract value committed
+    # across all bids, than these limits is flagged as overcommitted (0 = no value limit)
+    OVERCOMMIT_MAX_BIDS: int = int(os.getenv("OVERCOMMIT_MAX_BIDS", "5"))
+    OVERCOMMIT_MAX_VALUE: float = float(os.getenv("OVERCOMMIT_MAX_VALUE", "0"))
+
+    # Record per-rule timing and SQL counts for /diagnostics/validation-rules
+    VALIDATION_PROFILING: bool = os.getenv("VALIDATION_PROFILING", "True").lower() == "true"
+
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.validation.impact import revalidation_queue
 from app.routes import (
     bids_router,
     subcontractors_router,
@@ -11,7 +12,9 @@ from app.routes import (
     opportunities_router,
     assessments_router,
     outreach_router,
-    compliance_rules_router
+    compliance_rules_router,
+    diagnostics_router,
+    alerts_router
 )
 
 app = FastAPI(
@@ -39,6 +42,10 @@ def health_check():
         "version": "2.0 - Enhanced Edition with Dynamic Compliance Rules"
     }
 
+@app.on_event("shutdown")
+def stop_revalidation_queue():
+    revalidation_queue.stop()
+
 # Include routers
 app.include_router(organizations_router, prefix=settings.API_V1_PREFIX)
 app.include_router(jurisdictions_router, prefix=settings.API_V1_PREFIX)
@@ -49,6 +56,8 @@ app.include_router(directory_router, prefix=settings.API_V1_PREFIX)
 app.include_router(opportunities_router, prefix=settings.API_V1_PREFIX)
 app.include_router(assessments_router, prefix=settings.API_V1_PREFIX)
 app.include_router(outreach_router, prefix=settings.API_V1_PREFIX)
+app.include_router(alerts_router, prefix=settings.API_V1_PREFIX)
+app.include_router(diagnostics_router, prefix=settings.API_V1_PREFIX)
 
 @app.get("/")
 def root():
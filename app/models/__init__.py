@@ -4,13 +4,19 @@ from app.models.certification import Certification
 from app.models.bid import Bid
 from app.models.bid_subcontractor import BidSubcontractor
 from app.models.validation_result import ValidationResult
+from app.models.validation_run import ValidationRun
+from app.models.bid_participation import BidParticipation
+from app.models.subcontractor_commitment import SubcontractorCommitment
 from app.models.naics_code import NAICSCode
 from app.models.jurisdiction import Jurisdiction
 from app.models.compliance_rule import ComplianceRule
+from app.models.compliance_rule_draft import ComplianceRuleDraft, ShadowRuleDiff
 from app.models.subcontractor_directory import SubcontractorDirectory
 from app.models.opportunity import Opportunity
 from app.models.pre_bid_assessment import PreBidAssessment
 from app.models.subcontractor_outreach import SubcontractorOutreach
+from app.models.summary_rollup import AssessmentRollup, OutreachRollup
+from app.models.alert import AlertProfile, AlertProfileTerm, OpportunityAlert
 
 __all__ = [
     "Organization",
@@ -19,11 +25,21 @@ __all__ = [
     "Bid",
     "BidSubcontractor",
     "ValidationResult",
+    "ValidationRun",
+    "BidParticipation",
+    "SubcontractorCommitment",
     "NAICSCode",
     "Jurisdiction",
     "ComplianceRule",
+    "ComplianceRuleDraft",
+    "ShadowRuleDiff",
     "SubcontractorDirectory",
     "Opportunity",
     "PreBidAssessment",
-    "SubcontractorOutreach"
+    "SubcontractorOutreach",
+    "AssessmentRollup",
+    "OutreachRollup",
+    "AlertProfile",
+    "AlertProfileTerm",
+    "OpportunityAlert"
 ]
\ No newline at end of file
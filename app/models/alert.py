@@ -0,0 +1,55 @@
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, DateTime, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+class AlertProfile(Base):
+    """Saved opportunity alert criteria of an organization"""
+    __tablename__ = "alert_profiles"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String(255), nullable=False)
+    naics_codes = Column(ARRAY(Text), nullable=False, default=list)
+    jurisdiction_codes = Column(ARRAY(Text), nullable=False, default=list)
+    min_relevance = Column(Integer, nullable=False, default=50)
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    organization = relationship("Organization")
+
+
+class AlertProfileTerm(Base):
+    """
+    Inverted index from a NAICS code or jurisdiction code to the profiles that list it
+
+    term_type is 'naics' or 'jurisdiction'. Rewritten by AlertService whenever
+    a profile is saved; only active profiles have terms.
+    """
+    __tablename__ = "alert_profile_terms"
+
+    term_type = Column(String(20), primary_key=True)
+    term = Column(String(50), primary_key=True)
+    profile_id = Column(UUID(as_uuid=True), ForeignKey("alert_profiles.id", ondelete="CASCADE"), primary_key=True)
+
+
+class OpportunityAlert(Base):
+    """An opportunity delivered to an organization's alert inbox by one of its profiles"""
+    __tablename__ = "opportunity_alerts"
+    __table_args__ = (UniqueConstraint("profile_id", "opportunity_id"),)
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    profile_id = Column(UUID(as_uuid=True), ForeignKey("alert_profiles.id", ondelete="CASCADE"), nullable=False)
+    opportunity_id = Column(UUID(as_uuid=True), ForeignKey("opportunities.id", ondelete="CASCADE"), nullable=False)
+    relevance_score = Column(Integer, nullable=False)
+    is_read = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    profile = relationship("AlertProfile")
+    opportunity = relationship("Opportunity")
@@ -17,4 +17,5 @@ class Bid(Base):
     # Relationships
     organization = relationship("Organization", back_populates="bids")
     bid_subcontractors = relationship("BidSubcontractor", back_populates="bid")
-    validation_results = relationship("ValidationResult", back_populates="bid")
\ No newline at end of file
+    validation_results = relationship("ValidationResult", back_populates="bid")
+    validation_runs = relationship("ValidationRun", back_populates="bid")
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, BigInteger, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.database import Base
+
+class BidParticipation(Base):
+    """
+    Per-bid, per-category participation totals in cents
+
+    Maintained by database triggers (see add_bid_participation.sql) with the
+    same rules as ParticipationLedger; the application only reads it.
+    """
+    __tablename__ = "bid_participation"
+
+    bid_id = Column(UUID(as_uuid=True), ForeignKey("bids.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(10), primary_key=True)  # mbe, vsbe, wbe, sbe, dbe, cbe
+    claimed_cents = Column(BigInteger, nullable=False, default=0)
+    certified_cents = Column(BigInteger, nullable=False, default=0)
+    subcontract_total_cents = Column(BigInteger, nullable=False, default=0)
+    bid_total_cents = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, String, Boolean, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+class ComplianceRuleDraft(Base):
+    """
+    Proposed version of a compliance rule, evaluated in shadow mode while active
+
+    compliance_rule_id is None for a proposed new rule.
+    """
+    __tablename__ = "compliance_rule_drafts"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    compliance_rule_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rules.id", ondelete="CASCADE"), nullable=True)
+    jurisdiction_id = Column(UUID(as_uuid=True), ForeignKey("jurisdictions.id"), nullable=False)
+    rule_name = Column(String(255), nullable=False)
+    rule_type = Column(String(50), nullable=False)
+    rule_definition = Column(JSONB, nullable=False, default=dict)
+    severity = Column(String(20), nullable=False, default='ERROR')
+    is_active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Relationships
+    jurisdiction = relationship("Jurisdiction")
+
+
+class ShadowRuleDiff(Base):
+    """Latest live vs. draft jurisdiction compliance outcome for one bid"""
+    __tablename__ = "shadow_rule_diffs"
+
+    draft_id = Column(UUID(as_uuid=True), ForeignKey("compliance_rule_drafts.id", ondelete="CASCADE"), primary_key=True)
+    bid_id = Column(UUID(as_uuid=True), ForeignKey("bids.id", ondelete="CASCADE"), primary_key=True)
+    jurisdiction_id = Column(UUID(as_uuid=True), ForeignKey("jurisdictions.id"), nullable=False)
+    live_status = Column(String(20), nullable=False)
+    shadow_status = Column(String(20), nullable=False)
+    diverged = Column(Boolean, nullable=False)
+    live_findings = Column(JSONB)  # [[message_code, params], ...]
+    shadow_findings = Column(JSONB)
+    evaluated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, String, Integer, Numeric, DateTime, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -19,6 +19,8 @@ class PreBidAssessment(Base):
     recommendation = Column(String(50))  # 'BID', 'NO_BID', 'CAUTION'
     recommendation_reason = Column(Text)
     assessed_at = Column(DateTime, default=datetime.utcnow)
+    input_fingerprint = Column(String(64))  # hash of the opportunity, network, directory supply and day
+    result_snapshot = Column(JSONB)  # perform_assessment result, returned again while the fingerprint matches
     
     # Relationships
     organization = relationship("Organization")
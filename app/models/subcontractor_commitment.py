@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.database import Base
+
+class SubcontractorCommitment(Base):
+    """
+    Bids and subcontract value a subcontractor is committed to, across all organizations
+
+    Updated incrementally by BidService when bid lines are added or removed
+    (see add_subcontractor_commitments.sql for the backfill).
+    """
+    __tablename__ = "subcontractor_commitments"
+
+    subcontractor_id = Column(UUID(as_uuid=True), ForeignKey("subcontractors.id", ondelete="CASCADE"), primary_key=True)
+    bid_count = Column(Integer, nullable=False, default=0)
+    line_count = Column(Integer, nullable=False, default=0)
+    committed_value = Column(Numeric(15, 2), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -24,6 +24,7 @@ class SubcontractorDirectory(Base):
     contractors_using_count = Column(Integer, default=0)  # Network effect: how many contractors use this sub
     is_verified = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     outreach = relationship("SubcontractorOutreach", back_populates="subcontractor")
\ No newline at end of file
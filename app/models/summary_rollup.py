@@ -0,0 +1,40 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.database import Base
+
+class AssessmentRollup(Base):
+    """
+    Recommendation counts and risk score total of an organization's assessments
+
+    Maintained by PreBidAssessmentService when SUMMARY_ROLLUPS is on
+    (see add_summary_rollups.sql for the backfill).
+    """
+    __tablename__ = "assessment_rollups"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    bid_count = Column(Integer, nullable=False, default=0)
+    caution_count = Column(Integer, nullable=False, default=0)
+    no_bid_count = Column(Integer, nullable=False, default=0)
+    risk_score_sum = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+class OutreachRollup(Base):
+    """
+    Outreach status counts per organization and per opportunity
+
+    scope is 'organization' or 'opportunity' and scope_id the matching id.
+    Maintained by SubcontractorOutreachService when SUMMARY_ROLLUPS is on.
+    """
+    __tablename__ = "outreach_rollups"
+
+    scope = Column(String(20), primary_key=True)
+    scope_id = Column(UUID(as_uuid=True), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    contacted = Column(Integer, nullable=False, default=0)
+    responded = Column(Integer, nullable=False, default=0)
+    committed = Column(Integer, nullable=False, default=0)
+    declined = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -11,10 +11,28 @@ class ValidationResult(Base):
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     bid_id = Column(UUID(as_uuid=True), ForeignKey("bids.id"))
-    rule_name = Column(String(255))
+    run_id = Column(UUID(as_uuid=True), ForeignKey("validation_runs.id"), index=True)
+    position = Column(Integer, default=0)
+    rule_code = Column(String(8))  # Compact rule code, see RuleRegistry.rule_name
     status = Column(String(20))  # PASS, FAIL, WARNING
-    error_message = Column(Text)
+    message_params = Column(JSONB)  # [[message_code, {param: value}], ...]
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Free-text columns, only populated on rows written before validation runs
+    legacy_rule_name = Column("rule_name", String(255))
+    legacy_error_message = Column("error_message", Text)
     
     # Relationships
-    bid = relationship("Bid", back_populates="validation_results")
\ No newline at end of file
+    bid = relationship("Bid", back_populates="validation_results")
+
+    @property
+    def rule_name(self) -> str:
+        from app.validation.registry import registry
+        return registry.rule_name(self.rule_code) or self.legacy_rule_name or ""
+
+    @property
+    def error_message(self) -> str:
+        if self.message_params is None:
+            return self.legacy_error_message or ""
+        from app.validation.messages import render_message
+        return render_message(self.message_params)
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+class ValidationRun(Base):
+    __tablename__ = "validation_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bid_id = Column(UUID(as_uuid=True), ForeignKey("bids.id"), index=True)
+    # Run whose validation_results rows apply to this run. Equal to id when the
+    # run wrote its own rows; points at an earlier run when nothing changed.
+    results_run_id = Column(UUID(as_uuid=True), ForeignKey("validation_runs.id"))
+    input_fingerprint = Column(String(64))  # hash of the validation context and rule set version
+    results_digest = Column(String(64))  # sha256 of the ordered (rule_code, status, params) list
+    overall_status = Column(String(20))  # PASS, FAIL, WARNING
+    total_validations = Column(Integer, default=0)
+    passed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    warnings = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Set on runs returned from the validation cache / by quick mode; not stored
+    cache_hit = False
+    mode = "full"
+
+    # Relationships
+    bid = relationship("Bid", back_populates="validation_runs")
+    results = relationship(
+        "ValidationResult",
+        primaryjoin="foreign(ValidationResult.run_id) == ValidationRun.results_run_id",
+        order_by="ValidationResult.position",
+        viewonly=True
+    )
@@ -7,6 +7,8 @@ from app.routes.opportunities import router as opportunities_router
 from app.routes.assessments import router as assessments_router
 from app.routes.outreach import router as outreach_router
 from app.routes.compliance_rules import router as compliance_rules_router
+from app.routes.diagnostics import router as diagnostics_router
+from app.routes.alerts import router as alerts_router
 
 __all__ = [
     "bids_router",
@@ -17,5 +19,7 @@ __all__ = [
     "opportunities_router",
     "assessments_router",
     "outreach_router",
-    "compliance_rules_router"
+    "compliance_rules_router",
+    "diagnostics_router",
+    "alerts_router"
 ]
\ No newline at end of file
@@ -0,0 +1,135 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List
+from uuid import UUID
+
+from app.database import get_db
+from app.schemas.alert import (
+    AlertProfile,
+    AlertProfileCreate,
+    AlertProfileUpdate,
+    OpportunityAlert
+)
+from app.services import AlertService
+
+router = APIRouter(prefix="/alerts", tags=["opportunity-alerts"])
+
+@router.post("/profiles", response_model=AlertProfile, status_code=status.HTTP_201_CREATED)
+def create_profile(
+    profile: AlertProfileCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Save an alert profile for an organization
+
+    Opportunities created from now on that share a NAICS or jurisdiction code
+    with the profile, and reach its min_relevance, are added to the
+    organization's alert inbox.
+    """
+    service = AlertService(db)
+    try:
+        return service.create_profile(profile)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/profiles/organization/{organization_id}", response_model=List[AlertProfile])
+def get_organization_profiles(
+    organization_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Get all alert profiles of an organization"""
+    service = AlertService(db)
+    return service.get_profiles(organization_id)
+
+@router.get("/profiles/{profile_id}", response_model=AlertProfile)
+def get_profile(
+    profile_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Get an alert profile"""
+    service = AlertService(db)
+    profile = service.get_profile(profile_id)
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert profile {profile_id} not found"
+        )
+
+    return profile
+
+@router.put("/profiles/{profile_id}", response_model=AlertProfile)
+def update_profile(
+    profile_id: UUID,
+    update_data: AlertProfileUpdate,
+    db: Session = Depends(get_db)
+):
+    """Update an alert profile (set is_active to false to pause it)"""
+    service = AlertService(db)
+    try:
+        profile = service.update_profile(profile_id, update_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert profile {profile_id} not found"
+        )
+
+    return profile
+
+@router.delete("/profiles/{profile_id}")
+def delete_profile(
+    profile_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Delete an alert profile and its alerts"""
+    service = AlertService(db)
+    success = service.delete_profile(profile_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert profile {profile_id} not found"
+        )
+
+    return {"message": "Alert profile deleted successfully"}
+
+@router.get("/inbox/organization/{organization_id}", response_model=List[OpportunityAlert])
+def get_inbox(
+    organization_id: UUID,
+    unread_only: bool = Query(False),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """Get an organization's alert inbox, newest first"""
+    service = AlertService(db)
+    return service.get_inbox(organization_id, unread_only=unread_only, skip=skip, limit=limit)
+
+@router.put("/inbox/organization/{organization_id}/read")
+def mark_inbox_read(
+    organization_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Mark every unread alert of an organization as read"""
+    service = AlertService(db)
+    return {"marked_read": service.mark_all_read(organization_id)}
+
+@router.put("/inbox/{alert_id}/read", response_model=OpportunityAlert)
+def mark_alert_read(
+    alert_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Mark one alert as read"""
+    service = AlertService(db)
+    alert = service.mark_read(alert_id)
+
+    if not alert:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert {alert_id} not found"
+        )
+
+    return alert
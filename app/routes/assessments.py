@@ -5,16 +5,18 @@ from uuid import UUID
 
 from app.database import get_db
 from app.schemas.pre_bid_assessment import (
-    PreBidAssessment,
     PreBidAssessmentCreate,
     PreBidAssessmentDetail,
-    AssessmentRequest
+    PreBidAssessmentResult,
+    AssessmentRequest,
+    PortfolioTriageRequest,
+    PortfolioTriageResponse
 )
 from app.services import PreBidAssessmentService
 
 router = APIRouter(prefix="/assessments", tags=["pre-bid-assessments"])
 
-@router.post("/perform")
+@router.post("/perform", response_model=PreBidAssessmentResult)
 def perform_assessment(
     request: AssessmentRequest,
     db: Session = Depends(get_db)
@@ -50,12 +52,32 @@ def perform_assessment(
             detail=f"Internal server error: {str(e)}"
         )
 
-@router.get("/{assessment_id}", response_model=PreBidAssessment)
+@router.post("/triage", response_model=PortfolioTriageResponse)
+def triage_portfolio(
+    request: PortfolioTriageRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Bid/no-bid triage across all active opportunities
+
+    Scores every active opportunity (optionally in one jurisdiction) the same
+    way as /assessments/perform and returns them ranked lowest risk first.
+    Assessments are only saved when persist is true.
+    """
+    service = PreBidAssessmentService(db)
+    return service.triage_portfolio(request)
+
+@router.get("/{assessment_id}", response_model=PreBidAssessmentResult)
 def get_assessment(
     assessment_id: UUID,
     db: Session = Depends(get_db)
 ):
-    """Get a specific pre-bid assessment"""
+    """
+    Get a specific pre-bid assessment
+
+    Returns the stored result, including risk factors, matching subcontractors
+    and network statistics, without re-running the assessment.
+    """
     service = PreBidAssessmentService(db)
     assessment = service.get_assessment(assessment_id)
     
@@ -67,12 +89,12 @@ def get_assessment(
     
     return assessment
 
-@router.get("/organization/{organization_id}", response_model=List[PreBidAssessment])
+@router.get("/organization/{organization_id}", response_model=List[PreBidAssessmentResult])
 def get_organization_assessments(
     organization_id: UUID,
     db: Session = Depends(get_db)
 ):
-    """Get all assessments for an organization"""
+    """Get all assessments for an organization, with their stored results"""
     service = PreBidAssessmentService(db)
     return service.get_assessments_by_organization(organization_id)
 
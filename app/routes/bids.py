@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
@@ -11,8 +11,18 @@ from app.schemas.bid import (
     BidSubcontractorCreate,
     BidSubcontractor
 )
-from app.schemas.validation import ValidationResponse
-from app.services import BidService, ValidationService
+from app.schemas.validation import (
+    ValidationResponse,
+    ValidationRun,
+    WhatIfValidationRequest,
+    BulkRevalidationRequest,
+    BulkRevalidationResponse,
+    GoalOptimizationRequest,
+    GoalOptimizationResponse
+)
+from app.schemas.participation import BidParticipationSummary
+from app.services import BidService, ValidationService, ParticipationService
+from app.validation.shadow import has_active_drafts, run_shadow_evaluation
 
 router = APIRouter(prefix="/bids", tags=["bids"])
 
@@ -22,6 +32,43 @@ def create_bid(bid: BidCreate, db: Session = Depends(get_db)):
     service = BidService(db)
     return service.create_bid(bid)
 
+@router.post("/validate/what-if", response_model=ValidationResponse)
+def validate_what_if(request: WhatIfValidationRequest, db: Session = Depends(get_db)):
+    """
+    Validate a proposed bid and team without saving anything
+    
+    Runs every validation rule against the current directory and compliance
+    rules. No bid, subcontractor or validation result rows are written.
+    """
+    validation_service = ValidationService(db)
+    return validation_service.validate_what_if(request)
+
+@router.post("/revalidate", response_model=BulkRevalidationResponse)
+def revalidate_bids(request: BulkRevalidationRequest, db: Session = Depends(get_db)):
+    """
+    Revalidate many bids in one call
+    
+    Bids whose inputs are unchanged since their latest run are skipped unless
+    force is set. The rest are evaluated in parallel and written in batches.
+    """
+    validation_service = ValidationService(db)
+    return validation_service.revalidate_bids(request)
+
+@router.get("/participation", response_model=List[BidParticipationSummary])
+def list_bid_participation(
+    organization_id: Optional[UUID] = None,
+    below_goal: bool = Query(False, description="Only bids whose certified MBE share is below their goal"),
+    db: Session = Depends(get_db)
+):
+    """
+    Certified participation and MBE goal status for many bids
+    
+    Read from the trigger-maintained bid_participation table in a single
+    grouped query; no bid lines are loaded.
+    """
+    service = ParticipationService(db)
+    return service.get_participation(organization_id, below_goal=below_goal)
+
 @router.get("/", response_model=List[BidDetail])
 def list_bids(
     organization_id: Optional[UUID] = None,
@@ -91,7 +138,14 @@ def remove_subcontractor_from_bid(
     return {"message": "Subcontractor removed successfully"}
 
 @router.get("/{bid_id}/validate", response_model=ValidationResponse)
-def validate_bid(bid_id: UUID, db: Session = Depends(get_db)):
+def validate_bid(
+    bid_id: UUID,
+    background_tasks: BackgroundTasks,
+    refresh: bool = Query(False, description="Re-run all rules even if nothing changed"),
+    mode: str = Query("full", pattern="^(full|quick)$", description="quick: stop at the first failure, never cached or stored"),
+    trace: bool = Query(False, description="Include the steps each rule checked"),
+    db: Session = Depends(get_db)
+):
     """Validate a bid and return results"""
     bid_service = BidService(db)
     validation_service = ValidationService(db)
@@ -104,4 +158,84 @@ def validate_bid(bid_id: UUID, db: Session = Depends(get_db)):
             detail=f"Bid {bid_id} not found"
         )
     
-    return validation_service.validate_bid(bid_id)
\ No newline at end of file
+    response = validation_service.validate_bid(bid_id, use_cache=not refresh, mode=mode, trace=trace)
+
+    # Compliance rule drafts are evaluated after the response has been sent, only
+    # when this call recorded a new run (not a cache hit or an unsaved quick run)
+    if response.run_id is not None and not response.cached and has_active_drafts(db):
+        background_tasks.add_task(run_shadow_evaluation, bid_id)
+
+    return response
+
+@router.get("/{bid_id}/participation", response_model=BidParticipationSummary)
+def get_bid_participation(bid_id: UUID, db: Session = Depends(get_db)):
+    """Certified participation per category and MBE goal status for a bid"""
+    service = ParticipationService(db)
+    participation = service.get_bid_participation(bid_id)
+    
+    if not participation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bid {bid_id} not found"
+        )
+    
+    return participation
+
+@router.post("/{bid_id}/optimize-goals", response_model=GoalOptimizationResponse)
+def optimize_goals(
+    bid_id: UUID,
+    request: Optional[GoalOptimizationRequest] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest the fewest changes that meet every participation goal at once
+    
+    Considers counting MBE-certified lines toward MBE, moving uncounted
+    category_breakdown shares onto certified categories, and adding certified
+    directory subcontractors. Nothing is saved; apply the changes and
+    validate again.
+    """
+    bid_service = BidService(db)
+    validation_service = ValidationService(db)
+    
+    bid = bid_service.get_bid(bid_id)
+    if not bid:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bid {bid_id} not found"
+        )
+    
+    return validation_service.optimize_goals(bid_id, request or GoalOptimizationRequest())
+
+@router.get("/{bid_id}/validation-runs", response_model=List[ValidationRun])
+def list_validation_runs(
+    bid_id: UUID,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """List validation runs for a bid, newest first"""
+    bid_service = BidService(db)
+    
+    if not bid_service.get_bid(bid_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bid {bid_id} not found"
+        )
+    
+    validation_service = ValidationService(db)
+    return validation_service.get_validation_runs(bid_id, skip=skip, limit=limit)
+
+@router.get("/{bid_id}/validation-runs/{run_id}", response_model=ValidationResponse)
+def get_validation_run(bid_id: UUID, run_id: UUID, db: Session = Depends(get_db)):
+    """Get a validation run with its results"""
+    validation_service = ValidationService(db)
+    response = validation_service.get_validation_run(bid_id, run_id)
+    
+    if not response:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Validation run not found"
+        )
+    
+    return response
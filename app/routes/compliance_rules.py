@@ -8,9 +8,14 @@ from app.schemas.compliance_rule import (
     ComplianceRule,
     ComplianceRuleCreate,
     ComplianceRuleUpdate,
-    ComplianceRuleDetail
+    ComplianceRuleDetail,
+    ComplianceRuleDraft,
+    ComplianceRuleDraftCreate,
+    ShadowRuleDiff,
+    ShadowDivergenceReport
 )
 from app.services.compliance_rule_service import ComplianceRuleService
+from app.services.compliance_rule_draft_service import ComplianceRuleDraftService
 
 router = APIRouter(prefix="/compliance-rules", tags=["compliance-rules"])
 
@@ -37,9 +42,23 @@ def create_compliance_rule(
         "threshold": 29.0,
         "description": "MBE participation must meet or exceed 29% of total contract value"
     }
+    
+    Optional rule_definition keys:
+    - categories: categories summed toward the threshold, e.g. ["MBE", "WBE"]
+    - denominator: "bid_total" or "subcontract_total"
+    - basis: "claimed" or "certified"
+    - severity: overrides the severity field
+    - when: {"contract_value": {"gte": 1000000}, "naics": ["2382"]}
     """
     service = ComplianceRuleService(db)
-    return service.create_rule(rule)
+    
+    try:
+        return service.create_rule(rule)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 @router.get("/", response_model=List[ComplianceRuleDetail])
 def list_compliance_rules(db: Session = Depends(get_db)):
@@ -47,6 +66,131 @@ def list_compliance_rules(db: Session = Depends(get_db)):
     service = ComplianceRuleService(db)
     return service.get_all_rules()
 
+@router.post("/drafts", response_model=ComplianceRuleDraft, status_code=status.HTTP_201_CREATED)
+def create_compliance_rule_draft(
+    draft: ComplianceRuleDraftCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a draft of a compliance rule to evaluate in shadow mode
+
+    While the draft is active, every bid validation also evaluates the draft in
+    the background, after the response is sent, and records where the outcome
+    would differ from the live rules. Leave out compliance_rule_id to draft a new rule.
+    """
+    service = ComplianceRuleDraftService(db)
+
+    try:
+        created = service.create_draft(draft)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if not created:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Compliance rule {draft.compliance_rule_id} not found"
+        )
+
+    return created
+
+@router.get("/drafts", response_model=List[ComplianceRuleDraft])
+def list_compliance_rule_drafts(
+    active_only: bool = Query(False, description="Only drafts being shadow-evaluated"),
+    db: Session = Depends(get_db)
+):
+    """List compliance rule drafts, newest first"""
+    service = ComplianceRuleDraftService(db)
+    return service.get_drafts(active_only)
+
+@router.get("/drafts/divergence", response_model=ShadowDivergenceReport)
+def get_shadow_divergence_report(
+    jurisdiction_id: Optional[UUID] = Query(None),
+    active_only: bool = Query(False, description="Only drafts being shadow-evaluated"),
+    db: Session = Depends(get_db)
+):
+    """How many evaluated bids each draft would change, per rule and per jurisdiction"""
+    service = ComplianceRuleDraftService(db)
+    return service.get_divergence_report(jurisdiction_id, active_only)
+
+@router.get("/drafts/{draft_id}/diffs", response_model=List[ShadowRuleDiff])
+def get_compliance_rule_draft_diffs(
+    draft_id: UUID,
+    diverged_only: bool = Query(True, description="Only bids whose outcome would change"),
+    db: Session = Depends(get_db)
+):
+    """Per-bid live and shadow outcomes for a draft"""
+    service = ComplianceRuleDraftService(db)
+
+    if not service.get_draft(draft_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Compliance rule draft {draft_id} not found"
+        )
+
+    return service.get_diffs(draft_id, diverged_only)
+
+@router.put("/drafts/{draft_id}/active", response_model=ComplianceRuleDraft)
+def set_compliance_rule_draft_active(
+    draft_id: UUID,
+    is_active: bool = Query(..., description="Start (true) or stop (false) shadow evaluation"),
+    db: Session = Depends(get_db)
+):
+    """Start or stop shadow evaluation of a draft"""
+    service = ComplianceRuleDraftService(db)
+    draft = service.set_active(draft_id, is_active)
+
+    if not draft:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Compliance rule draft {draft_id} not found"
+        )
+
+    return draft
+
+@router.post("/drafts/{draft_id}/promote", response_model=ComplianceRule)
+def promote_compliance_rule_draft(
+    draft_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Apply a draft to the live compliance rules and stop shadowing it"""
+    service = ComplianceRuleDraftService(db)
+
+    try:
+        rule = service.promote_draft(draft_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Compliance rule draft {draft_id} not found"
+        )
+
+    return rule
+
+@router.delete("/drafts/{draft_id}")
+def delete_compliance_rule_draft(
+    draft_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """Delete a draft and its shadow results"""
+    service = ComplianceRuleDraftService(db)
+    success = service.delete_draft(draft_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Compliance rule draft {draft_id} not found"
+        )
+
+    return {"message": "Compliance rule draft deleted successfully"}
+
 @router.get("/{rule_id}", response_model=ComplianceRuleDetail)
 def get_compliance_rule(
     rule_id: UUID,
@@ -124,7 +268,14 @@ def update_compliance_rule(
 ):
     """Update a compliance rule"""
     service = ComplianceRuleService(db)
-    rule = service.update_rule(rule_id, update_data)
+    
+    try:
+        rule = service.update_rule(rule_id, update_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not rule:
         raise HTTPException(
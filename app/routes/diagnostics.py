@@ -0,0 +1,24 @@
+from fastapi import APIRouter, status
+from typing import List
+
+from app.schemas.diagnostics import RuleProfile
+from app.validation.profiling import rule_profiler
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+@router.get("/validation-rules", response_model=List[RuleProfile])
+def get_validation_rule_profiles():
+    """
+    Per-rule validation timing for this process, slowest first
+    
+    Covers the most recent runs of each rule (rolling window): wall time
+    percentiles in milliseconds, SQL statements executed and rows fetched.
+    `context_load` is the shared context load that precedes the rules.
+    Empty when VALIDATION_PROFILING is off.
+    """
+    return rule_profiler.snapshot()
+
+@router.delete("/validation-rules", status_code=status.HTTP_204_NO_CONTENT)
+def reset_validation_rule_profiles():
+    """Clear the collected samples, e.g. before comparing a change"""
+    rule_profiler.reset()
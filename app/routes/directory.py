@@ -9,9 +9,11 @@ from app.schemas.subcontractor_directory import (
     SubcontractorDirectory,
     SubcontractorDirectoryCreate,
     SubcontractorDirectoryUpdate,
-    SubcontractorSearchFilters
+    SubcontractorSearchFilters,
+    DirectoryMatchSummary,
+    TeamBuilderResponse
 )
-from app.services import SubcontractorDirectoryService
+from app.services import SubcontractorDirectoryService, TeamBuilderService
 
 router = APIRouter(prefix="/directory", tags=["subcontractor-directory"])
 
@@ -164,6 +166,88 @@ def find_matching_subcontractors(
         min_rating=min_rating
     )
 
+@router.get("/match/opportunity/{opportunity_id}/summary", response_model=DirectoryMatchSummary)
+def summarize_matching_subcontractors(
+    opportunity_id: UUID,
+    categories: List[str] = Query(["MBE", "VSBE"], description="Certification categories to count"),
+    top_category: Optional[str] = Query("MBE", description="Category the top rows are taken from"),
+    top_k: int = Query(10, ge=0, le=100),
+    min_rating: float = Query(2.0, ge=0.0, le=5.0),
+    db: Session = Depends(get_db)
+):
+    """
+    Count matching subcontractors per category and return the best-rated few
+
+    One query returns the per-category counts, the number of distinct entries
+    matching any category and the top_k best-rated entries.
+    """
+    from app.services import OpportunityService
+
+    opp_service = OpportunityService(db)
+    opportunity = opp_service.get_opportunity(opportunity_id)
+
+    if not opportunity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Opportunity {opportunity_id} not found"
+        )
+
+    if not opportunity.jurisdiction:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Opportunity {opportunity_id} has no associated jurisdiction"
+        )
+
+    service = SubcontractorDirectoryService(db)
+    summary = service.get_matching_summary(
+        naics_codes=opportunity.naics_codes or [],
+        jurisdiction_code=opportunity.jurisdiction.code,
+        categories=categories,
+        min_rating=min_rating,
+        top_k=top_k,
+        top_category=top_category
+    )
+
+    return {
+        "opportunity_id": opportunity_id,
+        "counts": {category.upper(): count for category, count in summary["counts"].items()},
+        "total": summary["total"],
+        "top": summary["top"]
+    }
+
+@router.get("/match/opportunity/{opportunity_id}/teams", response_model=TeamBuilderResponse)
+def build_teams_for_opportunity(
+    opportunity_id: UUID,
+    max_team_size: int = Query(5, ge=1, le=20),
+    alternatives: int = Query(3, ge=1, le=10),
+    min_rating: float = Query(0.0, ge=0.0, le=5.0),
+    db: Session = Depends(get_db)
+):
+    """
+    Assemble small subcontractor teams for an opportunity
+    
+    Each team covers as many of the opportunity's NAICS codes and MBE/VSBE
+    certification goals as possible with as few members as possible. The goal
+    amounts are allocated to certified members within their remaining capacity.
+    Teams are ranked by requirements left uncovered, whether the goal amounts are
+    reached, team size, then mean rating.
+    """
+    service = TeamBuilderService(db)
+    result = service.build_teams(
+        opportunity_id,
+        max_team_size=max_team_size,
+        alternatives=alternatives,
+        min_rating=min_rating
+    )
+
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Opportunity {opportunity_id} not found"
+        )
+
+    return result
+
 @router.post("/{subcontractor_id}/update-usage-count", response_model=SubcontractorDirectory)
 def update_usage_count(
     subcontractor_id: UUID,
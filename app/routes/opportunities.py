@@ -142,30 +142,22 @@ def get_relevant_opportunities(
     organization_naics: List[str] = Query(..., description="Organization NAICS codes"),
     organization_jurisdictions: List[str] = Query(..., description="Organization jurisdictions"),
     min_relevance: int = Query(50, ge=0, le=100, description="Minimum relevance score"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db)
 ):
     """
     Get opportunities relevant to an organization based on NAICS and jurisdiction
     This powers the opportunity alerts feature
+
+    All active opportunities are scored in the database; results are sorted by
+    relevance score and paginated with skip/limit.
     """
     service = OpportunityService(db)
-    
-    # Get all active opportunities
-    opportunities = service.get_all_opportunities(is_active=True)
-    
-    # Calculate relevance scores and filter
-    relevant_opportunities = []
-    for opp in opportunities:
-        score = service.calculate_relevance_score(
-            opp,
-            organization_naics,
-            organization_jurisdictions
-        )
-        if score >= min_relevance:
-            opp.relevance_score = score
-            relevant_opportunities.append(opp)
-    
-    # Sort by relevance score
-    relevant_opportunities.sort(key=lambda x: x.relevance_score, reverse=True)
-    
-    return relevant_opportunities
\ No newline at end of file
+    return service.get_relevant_opportunities(
+        organization_naics,
+        organization_jurisdictions,
+        min_relevance=min_relevance,
+        skip=skip,
+        limit=limit
+    )
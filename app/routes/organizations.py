@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session, joinedload
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
 from app.models import Organization, Subcontractor
-from app.schemas.organization import Organization as OrgSchema, OrganizationCreate
+from app.schemas.organization import Organization as OrgSchema, OrganizationCreate, NetworkCapacity
+from app.services.network_capacity_index import network_index
 from app.schemas.subcontractor import SubcontractorDetail
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
@@ -74,4 +75,45 @@ def get_organization_network(
         Subcontractor.organization_id == organization_id
     ).all()
 
-    return subcontractors
\ No newline at end of file
+    return subcontractors
+
+@router.get("/{organization_id}/network/capacity", response_model=NetworkCapacity)
+def get_organization_network_capacity(
+    organization_id: UUID,
+    cert_types: List[str] = Query(["MBE", "VSBE"], description="Certification types to count"),
+    naics_codes: Optional[List[str]] = Query(None, description="Only certifications covering one of these NAICS codes"),
+    db: Session = Depends(get_db)
+):
+    """
+    Count the organization's network subcontractors per certification type
+
+    Uses the same matching as pre-bid assessments: a certification counts when
+    its type contains the requested type and it either has no NAICS list or
+    lists one of naics_codes; is_mbe alone counts for MBE. Answered from the
+    cached network capacity index.
+    """
+    org = db.query(Organization).filter(Organization.id == organization_id).first()
+
+    if not org:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Organization {organization_id} not found"
+        )
+
+    network = network_index.get(db, organization_id)
+
+    capacity = []
+    for cert_type in cert_types:
+        ids = network.matching(cert_type, naics_codes)
+        capacity.append({
+            "cert_type": cert_type.upper(),
+            "count": len(ids),
+            "subcontractor_ids": sorted(ids, key=str)
+        })
+
+    return {
+        "organization_id": organization_id,
+        "network_count": len(network),
+        "naics_codes": naics_codes,
+        "capacity": capacity
+    }
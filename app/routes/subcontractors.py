@@ -2,12 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
+from decimal import Decimal
 
 from app.database import get_db
 from app.schemas.subcontractor import (
     Subcontractor,
     SubcontractorCreate,
-    SubcontractorDetail
+    SubcontractorDetail,
+    SubcontractorCommitment
 )
 from app.services import SubcontractorService
 
@@ -42,6 +44,17 @@ def search_subcontractors(
     service = SubcontractorService(db)
     return service.search_subcontractors(q, is_mbe, organization_id)
 
+@router.get("/overcommitted", response_model=List[SubcontractorCommitment])
+def list_overcommitted_subcontractors(
+    organization_id: Optional[UUID] = Query(None, description="Filter by organization"),
+    max_bids: Optional[int] = Query(None, ge=0, description="Bid limit (default OVERCOMMIT_MAX_BIDS, 0 = none)"),
+    max_value: Optional[Decimal] = Query(None, ge=0, description="Committed value limit (default OVERCOMMIT_MAX_VALUE, 0 = none)"),
+    db: Session = Depends(get_db)
+):
+    """List subcontractors committed across more bids or value than the limits allow"""
+    service = SubcontractorService(db)
+    return service.get_overcommitted(organization_id, max_bids, max_value)
+
 @router.get("/{subcontractor_id}", response_model=SubcontractorDetail)
 def get_subcontractor(
     subcontractor_id: UUID,
@@ -1,8 +1,9 @@
-from app.schemas.organization import Organization, OrganizationCreate
+from app.schemas.organization import Organization, OrganizationCreate, NetworkCapacity
 from app.schemas.subcontractor import (
     Subcontractor, 
     SubcontractorCreate, 
-    SubcontractorDetail
+    SubcontractorDetail,
+    SubcontractorCommitment
 )
 from app.schemas.bid import (
     Bid, 
@@ -11,19 +12,33 @@ from app.schemas.bid import (
     BidSubcontractorCreate,
     BidSubcontractor
 )
-from app.schemas.validation import ValidationResult, ValidationResponse
+from app.schemas.validation import (
+    ValidationResult,
+    ValidationResponse,
+    ValidationRun,
+    WhatIfValidationRequest,
+    BulkRevalidationRequest,
+    BulkRevalidationResponse,
+    GoalOptimizationRequest,
+    GoalOptimizationResponse
+)
 from app.schemas.jurisdiction import Jurisdiction, JurisdictionCreate
 from app.schemas.compliance_rule import (
     ComplianceRule,
     ComplianceRuleCreate,
     ComplianceRuleUpdate,
-    ComplianceRuleDetail
+    ComplianceRuleDetail,
+    ComplianceRuleDraft,
+    ComplianceRuleDraftCreate,
+    ShadowDivergenceReport
 )
 from app.schemas.subcontractor_directory import (
     SubcontractorDirectory,
     SubcontractorDirectoryCreate,
     SubcontractorDirectoryUpdate,
-    SubcontractorSearchFilters
+    SubcontractorSearchFilters,
+    DirectoryMatchSummary,
+    TeamBuilderResponse
 )
 from app.schemas.opportunity import (
     Opportunity,
@@ -35,7 +50,10 @@ from app.schemas.pre_bid_assessment import (
     PreBidAssessment,
     PreBidAssessmentCreate,
     PreBidAssessmentDetail,
-    AssessmentRequest
+    PreBidAssessmentResult,
+    AssessmentRequest,
+    PortfolioTriageRequest,
+    PortfolioTriageResponse
 )
 from app.schemas.subcontractor_outreach import (
     SubcontractorOutreach,
@@ -43,13 +61,23 @@ from app.schemas.subcontractor_outreach import (
     SubcontractorOutreachUpdate,
     SubcontractorOutreachDetail
 )
+from app.schemas.alert import (
+    AlertProfile,
+    AlertProfileCreate,
+    AlertProfileUpdate,
+    OpportunityAlert
+)
+from app.schemas.participation import BidParticipationSummary, CategoryParticipation
+from app.schemas.diagnostics import RuleProfile
 
 __all__ = [
     "Organization",
     "OrganizationCreate",
+    "NetworkCapacity",
     "Subcontractor",
     "SubcontractorCreate",
     "SubcontractorDetail",
+    "SubcontractorCommitment",
     "Bid",
     "BidCreate",
     "BidDetail",
@@ -57,16 +85,27 @@ __all__ = [
     "BidSubcontractor",
     "ValidationResult",
     "ValidationResponse",
+    "ValidationRun",
+    "WhatIfValidationRequest",
+    "BulkRevalidationRequest",
+    "BulkRevalidationResponse",
+    "GoalOptimizationRequest",
+    "GoalOptimizationResponse",
     "Jurisdiction",
     "JurisdictionCreate",
     "ComplianceRule",
     "ComplianceRuleCreate",
     "ComplianceRuleUpdate",
     "ComplianceRuleDetail",
+    "ComplianceRuleDraft",
+    "ComplianceRuleDraftCreate",
+    "ShadowDivergenceReport",
     "SubcontractorDirectory",
     "SubcontractorDirectoryCreate",
     "SubcontractorDirectoryUpdate",
     "SubcontractorSearchFilters",
+    "DirectoryMatchSummary",
+    "TeamBuilderResponse",
     "Opportunity",
     "OpportunityCreate",
     "OpportunityDetail",
@@ -74,9 +113,19 @@ __all__ = [
     "PreBidAssessment",
     "PreBidAssessmentCreate",
     "PreBidAssessmentDetail",
+    "PreBidAssessmentResult",
     "AssessmentRequest",
+    "PortfolioTriageRequest",
+    "PortfolioTriageResponse",
     "SubcontractorOutreach",
     "SubcontractorOutreachCreate",
     "SubcontractorOutreachUpdate",
-    "SubcontractorOutreachDetail"
+    "SubcontractorOutreachDetail",
+    "AlertProfile",
+    "AlertProfileCreate",
+    "AlertProfileUpdate",
+    "OpportunityAlert",
+    "BidParticipationSummary",
+    "CategoryParticipation",
+    "RuleProfile"
 ]
\ No newline at end of file
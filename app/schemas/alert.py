@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from uuid import UUID
+from typing import Optional, List
+from datetime import datetime
+
+class AlertProfileBase(BaseModel):
+    name: str
+    naics_codes: List[str] = []
+    jurisdiction_codes: List[str] = []
+    min_relevance: int = Field(50, ge=0, le=100)
+    is_active: bool = True
+
+class AlertProfileCreate(AlertProfileBase):
+    organization_id: UUID
+
+class AlertProfileUpdate(BaseModel):
+    name: Optional[str] = None
+    naics_codes: Optional[List[str]] = None
+    jurisdiction_codes: Optional[List[str]] = None
+    min_relevance: Optional[int] = Field(None, ge=0, le=100)
+    is_active: Optional[bool] = None
+
+class AlertProfile(AlertProfileBase):
+    id: UUID
+    organization_id: UUID
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class OpportunityAlert(BaseModel):
+    id: UUID
+    organization_id: UUID
+    profile_id: UUID
+    opportunity_id: UUID
+    relevance_score: int
+    is_read: bool
+    created_at: datetime
+    opportunity: Optional["OpportunitySchema"] = None
+
+    class Config:
+        from_attributes = True
+
+# Avoid circular imports
+from app.schemas.opportunity import Opportunity as OpportunitySchema
+OpportunityAlert.model_rebuild()
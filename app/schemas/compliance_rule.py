@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
-from typing import Optional, Dict
+from typing import Optional, Dict, List
+from datetime import datetime
 from app.schemas.jurisdiction import Jurisdiction
 
 class ComplianceRuleBase(BaseModel):
@@ -29,4 +30,65 @@ class ComplianceRuleDetail(ComplianceRule):
     jurisdiction: Optional[Jurisdiction] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class ComplianceRuleDraftCreate(BaseModel):
+    """
+    Proposed rule version to evaluate in shadow mode
+
+    With compliance_rule_id, fields left out are taken from the live rule.
+    Without it the draft is a proposed new rule and needs jurisdiction_id,
+    rule_name and rule_type.
+    """
+    compliance_rule_id: Optional[UUID] = None
+    jurisdiction_id: Optional[UUID] = None
+    rule_name: Optional[str] = None
+    rule_type: Optional[str] = None
+    rule_definition: Optional[Dict] = None
+    severity: Optional[str] = None
+
+class ComplianceRuleDraft(BaseModel):
+    id: UUID
+    compliance_rule_id: Optional[UUID] = None
+    jurisdiction_id: UUID
+    rule_name: str
+    rule_type: str
+    rule_definition: Dict
+    severity: str
+    is_active: bool
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ShadowRuleDiff(BaseModel):
+    """Latest live vs. draft jurisdiction compliance outcome for one bid"""
+    bid_id: UUID
+    live_status: str
+    shadow_status: str
+    live_message: str
+    shadow_message: str
+    evaluated_at: datetime
+
+class DivergenceCounts(BaseModel):
+    bids_evaluated: int
+    bids_diverged: int
+    newly_failing: int   # not FAIL live, FAIL with the draft
+    newly_passing: int   # FAIL live, not FAIL with the draft
+    last_evaluated_at: Optional[datetime] = None
+
+class RuleDivergence(DivergenceCounts):
+    draft_id: UUID
+    compliance_rule_id: Optional[UUID] = None
+    rule_name: str
+    jurisdiction_id: UUID
+    is_active: bool
+
+class JurisdictionDivergence(DivergenceCounts):
+    jurisdiction_id: UUID
+    jurisdiction_code: Optional[str] = None
+    drafts: int
+
+class ShadowDivergenceReport(BaseModel):
+    by_rule: List[RuleDivergence]
+    by_jurisdiction: List[JurisdictionDivergence]
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class RuleProfile(BaseModel):
+    """Rolling timing and SQL statistics for one validation rule"""
+    rule_code: str
+    rule_name: Optional[str] = None
+    samples: int
+    wall_ms_p50: float
+    wall_ms_p95: float
+    wall_ms_p99: float
+    wall_ms_max: float
+    sql_statements_mean: float
+    sql_statements_max: int
+    rows_fetched_mean: float
+    rows_fetched_max: int
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from uuid import UUID
+from typing import List, Optional
 
 class OrganizationBase(BaseModel):
     name: str
@@ -11,4 +12,16 @@ class Organization(OrganizationBase):
     id: UUID
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class CertificationCapacity(BaseModel):
+    cert_type: str
+    count: int
+    subcontractor_ids: List[UUID]
+
+class NetworkCapacity(BaseModel):
+    """How many network subcontractors count toward each certification type"""
+    organization_id: UUID
+    network_count: int
+    naics_codes: Optional[List[str]] = None
+    capacity: List[CertificationCapacity]
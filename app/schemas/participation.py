@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import List, Optional
+from decimal import Decimal
+
+class CategoryParticipation(BaseModel):
+    category: str
+    claimed_amount: Decimal
+    certified_amount: Decimal
+    certified_percentage: Decimal  # of the bid total
+
+class BidParticipationSummary(BaseModel):
+    """Certified participation of one bid, read from bid_participation"""
+    bid_id: UUID
+    solicitation_number: Optional[str] = None
+    total_amount: Decimal
+    subcontract_total: Decimal
+    mbe_goal: Optional[Decimal] = None
+    mbe_percentage: Decimal  # certified MBE share of the subcontracted amount, as in validation
+    meets_mbe_goal: Optional[bool] = None  # None when the bid has no MBE goal
+    categories: List[CategoryParticipation]
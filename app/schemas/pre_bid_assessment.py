@@ -1,8 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from uuid import UUID
-from typing import Optional, List
+from typing import Dict, Optional, List
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 class PreBidAssessmentBase(BaseModel):
     organization_id: UUID
@@ -32,11 +32,59 @@ class PreBidAssessmentDetail(PreBidAssessment):
     class Config:
         from_attributes = True
 
+class PreBidAssessmentResult(PreBidAssessment):
+    """A saved assessment as /assessments/perform returned it"""
+    mbe_gap_percentage: Optional[float] = None   # stored as JSON numbers in result_snapshot
+    vsbe_gap_percentage: Optional[float] = None
+    risk_factors: List[str] = []
+    matching_subcontractors: List[Dict] = []
+    opportunity: Optional[Dict] = None
+    organization_network: Optional[Dict[str, int]] = None  # total_count, mbe_count, vsbe_count
+
 class AssessmentRequest(BaseModel):
     opportunity_id: UUID
     organization_id: UUID
     estimated_subcontract_percentage: Optional[Decimal] = 30.0
 
+class PortfolioTriageRequest(BaseModel):
+    """Score every active opportunity for an organization"""
+    organization_id: UUID
+    jurisdiction_code: Optional[str] = None
+    limit: Optional[int] = Field(None, ge=1)  # keep only the best-ranked opportunities
+    persist: bool = False  # also save a PreBidAssessment row per ranked opportunity
+
+class PortfolioTriageEntry(BaseModel):
+    opportunity_id: UUID
+    solicitation_number: Optional[str] = None
+    title: Optional[str] = None
+    jurisdiction_code: str
+    due_date: Optional[date] = None
+    total_value: Optional[Decimal] = None
+    mbe_goal: Optional[Decimal] = None
+    vsbe_goal: Optional[Decimal] = None
+    overall_risk_score: int
+    recommendation: str
+    recommendation_reason: str
+    risk_factors: List[str]
+    mbe_gap_percentage: Decimal
+    vsbe_gap_percentage: Decimal
+    available_subcontractors_count: int
+    organization_network_mbe_count: int
+    organization_network_vsbe_count: int
+    directory_mbe_count: int
+    directory_vsbe_count: int
+    assessment_id: Optional[UUID] = None  # set when persisted
+
+class PortfolioTriageResponse(BaseModel):
+    organization_id: UUID
+    opportunities_scored: int
+    skipped_without_jurisdiction: int
+    bid_recommended: int
+    caution_recommended: int
+    no_bid_recommended: int
+    persisted: bool
+    board: List[PortfolioTriageEntry]
+
 # Avoid circular imports
 from app.schemas.opportunity import Opportunity as OpportunitySchema
 from app.schemas.subcontractor_directory import SubcontractorDirectory as SubcontractorDirectorySchema
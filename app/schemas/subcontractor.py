@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from uuid import UUID
 from typing import Optional, List
+from decimal import Decimal
 
 class SubcontractorBase(BaseModel):
     legal_name: str
@@ -30,4 +31,15 @@ class SubcontractorDetail(Subcontractor):
     certifications: List[CertificationSchema] = []
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class SubcontractorCommitment(BaseModel):
+    """A subcontractor's commitments across all bids and organizations"""
+    subcontractor_id: UUID
+    legal_name: Optional[str] = None
+    organization_id: Optional[UUID] = None
+    bid_count: int
+    line_count: int
+    committed_value: Decimal
+    over_bid_limit: bool
+    over_value_limit: bool
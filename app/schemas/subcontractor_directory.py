@@ -56,4 +56,36 @@ class SubcontractorSearchFilters(BaseModel):
     is_mbe: Optional[bool] = None
     is_vsbe: Optional[bool] = None
     is_verified: Optional[bool] = None
-    min_rating: Optional[Decimal] = None
\ No newline at end of file
+    min_rating: Optional[Decimal] = None
+
+class DirectoryMatchSummary(BaseModel):
+    """Directory supply for an opportunity, counted in one query"""
+    opportunity_id: UUID
+    counts: Dict[str, int]  # matches per certification category
+    total: int  # distinct entries matching any of the categories
+    top: List[SubcontractorDirectory]
+
+class TeamMember(BaseModel):
+    directory_id: UUID
+    legal_name: str
+    rating: float
+    certifications: List[str]
+    covers: List[str]  # requirements this member covers, e.g. "naics:238210", "certification:mbe"
+    suggested_value: Optional[Decimal] = None  # share of the certification goal amounts allocated to this member
+    capacity: Optional[Decimal] = None  # value left under OVERCOMMIT_MAX_VALUE; None when unlimited
+
+class TeamProposal(BaseModel):
+    members: List[TeamMember]
+    covers_all: bool
+    missing: List[str]
+    mean_rating: float
+    goal_amounts: Dict[str, Decimal]  # certification goal in dollars of the opportunity value
+    allocated: Dict[str, Decimal]  # suggested dollars counting toward each goal
+    reaches_goals: bool  # allocated meets every goal amount within member capacity
+
+class TeamBuilderResponse(BaseModel):
+    opportunity_id: UUID
+    jurisdiction_code: Optional[str] = None
+    requirements: List[str]
+    candidates_considered: int
+    teams: List[TeamProposal]
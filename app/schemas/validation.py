@@ -1,24 +1,98 @@
 from pydantic import BaseModel
 from uuid import UUID
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
+from app.schemas.bid import BidBase, BidSubcontractorCreate
 
 class ValidationResult(BaseModel):
-    id: UUID
-    bid_id: UUID
+    id: Optional[UUID] = None  # None for what-if results, which are never stored
+    bid_id: Optional[UUID] = None
     rule_name: str
+    rule_code: Optional[str] = None
     status: str
     error_message: str
-    created_at: datetime
+    created_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
 
 class ValidationResponse(BaseModel):
+    bid_id: Optional[UUID] = None
+    run_id: Optional[UUID] = None
+    overall_status: str
+    total_validations: int
+    passed: int
+    failed: int
+    warnings: int
+    cached: bool = False
+    mode: str = "full"  # "quick" responses stop at the first failure and are not stored
+    validations: List[ValidationResult]
+    trace: Optional[List[Dict[str, Any]]] = None  # per-rule evaluation steps, only with ?trace=true
+
+class ValidationRun(BaseModel):
+    """Summary of one validation run, without its results"""
+    id: UUID
     bid_id: UUID
     overall_status: str
     total_validations: int
     passed: int
     failed: int
     warnings: int
-    validations: List[ValidationResult]
\ No newline at end of file
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class WhatIfValidationRequest(BaseModel):
+    """Proposed bid and team to validate without saving anything"""
+    bid: BidBase
+    subcontractors: List[BidSubcontractorCreate] = []
+
+class BulkRevalidationRequest(BaseModel):
+    """Bids to revalidate - explicit ids, one organization, or all bids when both are empty"""
+    bid_ids: Optional[List[UUID]] = None
+    organization_id: Optional[UUID] = None
+    force: bool = False
+
+class BulkRevalidationResponse(BaseModel):
+    total: int
+    revalidated: int
+    unchanged: int
+    results_written: int
+    elapsed_seconds: float
+    bids_per_second: float
+
+class GoalOptimizationRequest(BaseModel):
+    """Goals to close - all certified participation goals when categories is empty"""
+    categories: Optional[List[str]] = None  # e.g. ["MBE", "VSBE"]
+    allow_additions: bool = True  # also suggest adding directory subcontractors
+
+class GoalStatus(BaseModel):
+    category: str
+    denominator: str  # bid_total or subcontract_total
+    required: Decimal
+    sources: List[str]  # "bid" for the bid's own MBE goal, otherwise jurisdiction codes
+    current_percentage: Decimal
+    projected_percentage: Decimal
+    met: bool
+
+class GoalChange(BaseModel):
+    action: str  # count_toward_mbe, reallocate, add_subcontractor
+    legal_name: str
+    bid_subcontractor_id: Optional[UUID] = None  # existing line to change
+    category: Optional[str] = None  # reallocate: category whose breakdown share grows
+    percentage: Optional[Decimal] = None  # reallocate: new breakdown percentage for category
+    reduced: Optional[Dict[str, Decimal]] = None  # reallocate: new percentage of each category giving up the share
+    directory_id: Optional[UUID] = None  # add_subcontractor: directory entry to add
+    subcontract_value: Optional[Decimal] = None  # add_subcontractor
+    naics_code: Optional[str] = None  # add_subcontractor
+    counts_toward_mbe: Optional[bool] = None  # add_subcontractor
+    gains: Dict[str, Decimal]  # certified dollars gained per category
+
+class GoalOptimizationResponse(BaseModel):
+    bid_id: UUID
+    satisfied: bool  # every goal is met once the changes are applied
+    proven_minimal: bool  # no plan with fewer changes exists among the candidates considered
+    goals: List[GoalStatus]
+    changes: List[GoalChange]
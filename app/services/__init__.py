@@ -1,19 +1,25 @@
 from app.services.bid_service import BidService
 from app.services.subcontractor_service import SubcontractorService
 from app.services.validation_service import ValidationService
+from app.services.participation_service import ParticipationService
 from app.services.jurisdiction_service import JurisdictionService
 from app.services.subcontractor_directory_service import SubcontractorDirectoryService
 from app.services.opportunity_service import OpportunityService
 from app.services.pre_bid_assessment_service import PreBidAssessmentService
 from app.services.subcontractor_outreach_service import SubcontractorOutreachService
+from app.services.team_builder_service import TeamBuilderService
+from app.services.alert_service import AlertService
 
 __all__ = [
     "BidService",
     "SubcontractorService",
     "ValidationService",
+    "ParticipationService",
     "JurisdictionService",
     "SubcontractorDirectoryService",
     "OpportunityService",
     "PreBidAssessmentService",
-    "SubcontractorOutreachService"
+    "SubcontractorOutreachService",
+    "TeamBuilderService",
+    "AlertService"
 ]
\ No newline at end of file
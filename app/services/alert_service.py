@@ -0,0 +1,204 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import and_, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+from app.models import AlertProfile, AlertProfileTerm, Opportunity, OpportunityAlert
+from app.schemas.alert import AlertProfileCreate, AlertProfileUpdate
+from app.services.relevance import score_relevance
+
+NAICS_TERM = "naics"
+JURISDICTION_TERM = "jurisdiction"
+
+
+def _clean_codes(codes: Optional[List[str]]) -> List[str]:
+    """Stripped, de-duplicated codes in their original order"""
+    cleaned = []
+    for code in codes or []:
+        code = code.strip()
+        if code and code not in cleaned:
+            cleaned.append(code)
+    return cleaned
+
+
+class AlertService:
+    """
+    Service for saved opportunity alert profiles and the alert inbox
+
+    Each active profile's NAICS and jurisdiction codes are kept in
+    alert_profile_terms. A new opportunity looks up the profiles listing one of
+    its codes there and is scored only against those, so its cost depends on
+    the number of matching profiles rather than on the number of organizations.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_profile(self, profile_data: AlertProfileCreate) -> AlertProfile:
+        """Save an alert profile (raises ValueError if it lists no codes)"""
+        profile = AlertProfile(**profile_data.model_dump())
+        self._normalize(profile)
+
+        self.db.add(profile)
+        self.db.flush()
+        self._write_terms(profile)
+        self.db.commit()
+        self.db.refresh(profile)
+        return profile
+
+    def get_profile(self, profile_id: UUID) -> Optional[AlertProfile]:
+        return self.db.query(AlertProfile).filter(AlertProfile.id == profile_id).first()
+
+    def get_profiles(self, organization_id: UUID) -> List[AlertProfile]:
+        return self.db.query(AlertProfile).filter(
+            AlertProfile.organization_id == organization_id
+        ).order_by(AlertProfile.created_at).all()
+
+    def update_profile(
+        self,
+        profile_id: UUID,
+        update_data: AlertProfileUpdate
+    ) -> Optional[AlertProfile]:
+        """Update a profile and its index terms (raises ValueError if it would list no codes)"""
+        profile = self.get_profile(profile_id)
+        if not profile:
+            return None
+
+        for key, value in update_data.model_dump(exclude_unset=True).items():
+            if value is not None and hasattr(profile, key):
+                setattr(profile, key, value)
+        self._normalize(profile)
+
+        self._write_terms(profile)
+        self.db.commit()
+        self.db.refresh(profile)
+        return profile
+
+    def delete_profile(self, profile_id: UUID) -> bool:
+        """Delete a profile; its index terms and inbox alerts go with it"""
+        profile = self.get_profile(profile_id)
+        if not profile:
+            return False
+
+        self.db.query(AlertProfileTerm).filter(AlertProfileTerm.profile_id == profile_id).delete()
+        self.db.query(OpportunityAlert).filter(OpportunityAlert.profile_id == profile_id).delete()
+        self.db.delete(profile)
+        self.db.commit()
+        return True
+
+    def _normalize(self, profile: AlertProfile) -> None:
+        profile.naics_codes = _clean_codes(profile.naics_codes)
+        profile.jurisdiction_codes = [code.upper() for code in _clean_codes(profile.jurisdiction_codes)]
+        if not profile.naics_codes and not profile.jurisdiction_codes:
+            raise ValueError("An alert profile needs at least one NAICS code or jurisdiction code")
+
+    def _write_terms(self, profile: AlertProfile) -> None:
+        """Replace the profile's rows in the inverted index; inactive profiles have none"""
+        self.db.query(AlertProfileTerm).filter(AlertProfileTerm.profile_id == profile.id).delete()
+        if not profile.is_active:
+            return
+
+        self.db.add_all(
+            [AlertProfileTerm(term_type=NAICS_TERM, term=code, profile_id=profile.id) for code in profile.naics_codes]
+            + [
+                AlertProfileTerm(term_type=JURISDICTION_TERM, term=code, profile_id=profile.id)
+                for code in profile.jurisdiction_codes
+            ]
+        )
+
+    def match_opportunity(self, opportunity: Opportunity, jurisdiction_code: Optional[str]) -> int:
+        """
+        Deliver a new opportunity to the inbox of every profile it is relevant to
+
+        Only profiles sharing a NAICS or jurisdiction code with the opportunity are
+        loaded, through the term index. Each is scored with the alert relevance
+        score and gets an alert if it reaches the profile's min_relevance. Does not
+        commit. Returns the number of alerts written.
+        """
+        terms = []
+        if opportunity.naics_codes:
+            terms.append(and_(
+                AlertProfileTerm.term_type == NAICS_TERM,
+                AlertProfileTerm.term.in_(opportunity.naics_codes)
+            ))
+        if jurisdiction_code:
+            terms.append(and_(
+                AlertProfileTerm.term_type == JURISDICTION_TERM,
+                AlertProfileTerm.term == jurisdiction_code.upper()
+            ))
+        if not terms:
+            return 0
+
+        profiles = self.db.query(AlertProfile).filter(
+            AlertProfile.id.in_(select(AlertProfileTerm.profile_id).where(or_(*terms))),
+            AlertProfile.is_active.is_(True)
+        ).all()
+
+        today = date.today()
+        rows = []
+        for profile in profiles:
+            score = score_relevance(
+                opportunity,
+                jurisdiction_code.upper() if jurisdiction_code else None,
+                profile.naics_codes,
+                profile.jurisdiction_codes,
+                today
+            )
+            if score >= profile.min_relevance:
+                rows.append({
+                    "organization_id": profile.organization_id,
+                    "profile_id": profile.id,
+                    "opportunity_id": opportunity.id,
+                    "relevance_score": score
+                })
+
+        if not rows:
+            return 0
+
+        table = OpportunityAlert.__table__
+        self.db.execute(
+            pg_insert(table).values(rows).on_conflict_do_nothing(
+                index_elements=[table.c.profile_id, table.c.opportunity_id]
+            )
+        )
+        return len(rows)
+
+    def get_inbox(
+        self,
+        organization_id: UUID,
+        unread_only: bool = False,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[OpportunityAlert]:
+        """An organization's alerts, newest first"""
+        query = self.db.query(OpportunityAlert).options(
+            joinedload(OpportunityAlert.opportunity)
+        ).filter(OpportunityAlert.organization_id == organization_id)
+
+        if unread_only:
+            query = query.filter(OpportunityAlert.is_read.is_(False))
+
+        return query.order_by(
+            OpportunityAlert.created_at.desc(),
+            OpportunityAlert.relevance_score.desc()
+        ).offset(skip).limit(limit).all()
+
+    def mark_read(self, alert_id: UUID) -> Optional[OpportunityAlert]:
+        alert = self.db.query(OpportunityAlert).filter(OpportunityAlert.id == alert_id).first()
+        if not alert:
+            return None
+
+        alert.is_read = True
+        self.db.commit()
+        self.db.refresh(alert)
+        return alert
+
+    def mark_all_read(self, organization_id: UUID) -> int:
+        """Mark every unread alert of an organization as read; returns how many"""
+        count = self.db.query(OpportunityAlert).filter(
+            OpportunityAlert.organization_id == organization_id,
+            OpportunityAlert.is_read.is_(False)
+        ).update({OpportunityAlert.is_read: True}, synchronize_session=False)
+        self.db.commit()
+        return count
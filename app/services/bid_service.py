@@ -1,8 +1,19 @@
+from datetime import datetime
+from decimal import Decimal
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, joinedload
-from app.models import Bid, BidSubcontractor, Subcontractor, SubcontractorDirectory
+from app.models import (
+    Bid,
+    BidSubcontractor,
+    Subcontractor,
+    SubcontractorCommitment,
+    SubcontractorDirectory
+)
 from app.schemas.bid import BidCreate, BidSubcontractorCreate
+from app.services.network_capacity_index import network_index
 
 class BidService:
     """Service for bid operations"""
@@ -41,10 +52,10 @@ class BidService:
             SubcontractorDirectory.id == subcontractor_id
         ).first() is not None
 
-    def _ensure_subcontractor_in_org(self, subcontractor_id: UUID, bid_id: UUID) -> None:
+    def _ensure_subcontractor_in_org(self, subcontractor_id: UUID, bid_id: UUID) -> bool:
         """
         Ensure subcontractor from directory exists in organization's subcontractors table.
-        If not, copy it from the directory.
+        If not, copy it from the directory. Returns True when a copy was added.
         """
         # Check if already in organization's subcontractors
         existing = self.db.query(Subcontractor).filter(
@@ -52,7 +63,7 @@ class BidService:
         ).first()
 
         if existing:
-            return  # Already exists
+            return False  # Already exists
 
         # Get from directory
         directory_sub = self.db.query(SubcontractorDirectory).filter(
@@ -60,12 +71,12 @@ class BidService:
         ).first()
 
         if not directory_sub:
-            return  # Will fail on foreign key, but validation should catch this
+            return False  # Will fail on foreign key, but validation should catch this
 
         # Get organization_id from the bid
         bid = self.db.query(Bid).filter(Bid.id == bid_id).first()
         if not bid:
-            return
+            return False
 
         # Copy to organization's subcontractors
         org_subcontractor = Subcontractor(
@@ -77,6 +88,47 @@ class BidService:
         )
         self.db.add(org_subcontractor)
         self.db.flush()  # Flush but don't commit yet
+        return True
+
+    def _adjust_commitment(self, bid_sub: BidSubcontractor, sign: int) -> None:
+        """
+        Apply one added (sign=1) or removed (sign=-1) bid line to subcontractor_commitments
+
+        Must run after the line change is flushed: bid_count only moves when the
+        subcontractor's first line on the bid is added or its last one removed.
+        Increments are applied in SQL so concurrent requests do not overwrite each other.
+        The bid row is locked until commit before counting, so concurrent changes to
+        the same bid count in turn and each sees the lines the other committed.
+        """
+        if bid_sub.subcontractor_id is None:
+            return
+
+        self.db.query(Bid.id).filter(Bid.id == bid_sub.bid_id).with_for_update().scalar()
+        lines_on_bid = self.db.query(func.count(BidSubcontractor.id)).filter(
+            BidSubcontractor.bid_id == bid_sub.bid_id,
+            BidSubcontractor.subcontractor_id == bid_sub.subcontractor_id
+        ).scalar()
+        bid_delta = sign if lines_on_bid == (1 if sign > 0 else 0) else 0
+        value_delta = sign * (bid_sub.subcontract_value or Decimal('0'))
+
+        table = SubcontractorCommitment.__table__
+        statement = pg_insert(table).values(
+            subcontractor_id=bid_sub.subcontractor_id,
+            bid_count=max(bid_delta, 0),
+            line_count=max(sign, 0),
+            committed_value=max(value_delta, Decimal('0')),
+            updated_at=datetime.utcnow()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.subcontractor_id],
+            set_={
+                "bid_count": table.c.bid_count + bid_delta,
+                "line_count": table.c.line_count + sign,
+                "committed_value": table.c.committed_value + value_delta,
+                "updated_at": statement.excluded.updated_at
+            }
+        )
+        self.db.execute(statement)
 
     def add_subcontractor_to_bid(
         self,
@@ -85,7 +137,7 @@ class BidService:
     ) -> BidSubcontractor:
         """Add a subcontractor to a bid"""
         # Ensure the subcontractor exists in the organization's table
-        self._ensure_subcontractor_in_org(subcontractor_data.subcontractor_id, bid_id)
+        copied = self._ensure_subcontractor_in_org(subcontractor_data.subcontractor_id, bid_id)
 
         # Convert category_breakdown to dict format for JSONB storage
         data_dict = subcontractor_data.model_dump()
@@ -101,8 +153,13 @@ class BidService:
             **data_dict
         )
         self.db.add(bid_sub)
+        self.db.flush()
+        self._adjust_commitment(bid_sub, 1)
         self.db.commit()
         self.db.refresh(bid_sub)
+
+        if copied:
+            network_index.refresh_member(self.db, subcontractor_data.subcontractor_id)
         return bid_sub
     
     def remove_subcontractor_from_bid(
@@ -120,6 +177,8 @@ class BidService:
             return False
         
         self.db.delete(bid_sub)
+        self.db.flush()
+        self._adjust_commitment(bid_sub, -1)
         self.db.commit()
         return True
     
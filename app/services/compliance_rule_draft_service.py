@@ -0,0 +1,224 @@
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import and_, case, func
+from sqlalchemy.orm import Session
+from app.models import ComplianceRule, ComplianceRuleDraft, Jurisdiction, ShadowRuleDiff
+from app.schemas.compliance_rule import (
+    ComplianceRuleCreate,
+    ComplianceRuleDraftCreate,
+    ComplianceRuleUpdate
+)
+from app.services.compliance_rule_service import ComplianceRuleService
+from app.validation.messages import render_message
+from app.validation.rule_definitions import compile_definition, invalidate_compiled_rule
+
+class ComplianceRuleDraftService:
+    """Service for compliance rule drafts and their shadow evaluation results"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_draft(self, draft_data: ComplianceRuleDraftCreate) -> Optional[ComplianceRuleDraft]:
+        """
+        Create an active draft (raises ValueError for an invalid draft)
+
+        Returns None if compliance_rule_id does not exist.
+        """
+        fields = draft_data.model_dump(exclude_unset=True)
+
+        if draft_data.compliance_rule_id:
+            live = self.db.query(ComplianceRule).filter(
+                ComplianceRule.id == draft_data.compliance_rule_id
+            ).first()
+            if not live:
+                return None
+            for key in ('jurisdiction_id', 'rule_name', 'rule_type', 'rule_definition', 'severity'):
+                if fields.get(key) is None:
+                    fields[key] = getattr(live, key)
+        else:
+            missing = [k for k in ('jurisdiction_id', 'rule_name', 'rule_type') if not fields.get(k)]
+            if missing:
+                raise ValueError(f"A draft for a new rule needs {', '.join(missing)}")
+
+        fields['rule_definition'] = fields.get('rule_definition') or {}
+        fields['severity'] = fields.get('severity') or 'ERROR'
+
+        compile_definition(
+            fields['rule_name'],
+            fields['rule_type'],
+            fields['rule_definition'],
+            fields['severity']
+        )
+
+        draft = ComplianceRuleDraft(**fields)
+        self.db.add(draft)
+        self.db.commit()
+        self.db.refresh(draft)
+        return draft
+
+    def get_draft(self, draft_id: UUID) -> Optional[ComplianceRuleDraft]:
+        return self.db.query(ComplianceRuleDraft).filter(ComplianceRuleDraft.id == draft_id).first()
+
+    def get_drafts(self, active_only: bool = False) -> List[ComplianceRuleDraft]:
+        query = self.db.query(ComplianceRuleDraft)
+        if active_only:
+            query = query.filter(ComplianceRuleDraft.is_active.is_(True))
+        return query.order_by(ComplianceRuleDraft.created_at.desc()).all()
+
+    def set_active(self, draft_id: UUID, is_active: bool) -> Optional[ComplianceRuleDraft]:
+        """Start or stop shadow evaluation of a draft"""
+        draft = self.get_draft(draft_id)
+        if not draft:
+            return None
+
+        draft.is_active = is_active
+        self.db.commit()
+        self.db.refresh(draft)
+        return draft
+
+    def delete_draft(self, draft_id: UUID) -> bool:
+        """Delete a draft and its shadow results"""
+        draft = self.get_draft(draft_id)
+        if not draft:
+            return False
+
+        self.db.delete(draft)
+        self.db.commit()
+        invalidate_compiled_rule(draft_id)
+        return True
+
+    def promote_draft(self, draft_id: UUID) -> Optional[ComplianceRule]:
+        """
+        Make the draft the live rule and stop shadowing it
+
+        Updates the rule the draft was made from, or creates it for a new-rule draft.
+        Returns None if the draft (or the rule it replaces) no longer exists.
+        """
+        draft = self.get_draft(draft_id)
+        if not draft:
+            return None
+
+        values = {
+            "jurisdiction_id": draft.jurisdiction_id,
+            "rule_name": draft.rule_name,
+            "rule_type": draft.rule_type,
+            "rule_definition": draft.rule_definition,
+            "severity": draft.severity,
+        }
+
+        draft.is_active = False
+        self.db.flush()
+
+        rule_service = ComplianceRuleService(self.db)
+        if draft.compliance_rule_id:
+            # Commits the draft change together with the rule update
+            return rule_service.update_rule(draft.compliance_rule_id, ComplianceRuleUpdate(**values))
+
+        rule = rule_service.create_rule(ComplianceRuleCreate(**values))
+        draft.compliance_rule_id = rule.id
+        self.db.commit()
+        return rule
+
+    def get_diffs(self, draft_id: UUID, diverged_only: bool = True) -> List[Dict]:
+        """Per-bid shadow results for a draft, with rendered messages"""
+        query = self.db.query(ShadowRuleDiff).filter(ShadowRuleDiff.draft_id == draft_id)
+        if diverged_only:
+            query = query.filter(ShadowRuleDiff.diverged.is_(True))
+
+        return [
+            {
+                "bid_id": diff.bid_id,
+                "live_status": diff.live_status,
+                "shadow_status": diff.shadow_status,
+                "live_message": render_message(diff.live_findings or []),
+                "shadow_message": render_message(diff.shadow_findings or []),
+                "evaluated_at": diff.evaluated_at
+            }
+            for diff in query.order_by(ShadowRuleDiff.evaluated_at.desc()).all()
+        ]
+
+    def get_divergence_report(
+        self,
+        jurisdiction_id: Optional[UUID] = None,
+        active_only: bool = False
+    ) -> Dict:
+        """Shadow results aggregated per draft and per jurisdiction, one grouped query each"""
+        counts = [
+            func.count().label("bids_evaluated"),
+            func.coalesce(func.sum(case((ShadowRuleDiff.diverged, 1), else_=0)), 0).label("bids_diverged"),
+            func.coalesce(func.sum(case(
+                (and_(ShadowRuleDiff.live_status != "FAIL", ShadowRuleDiff.shadow_status == "FAIL"), 1),
+                else_=0
+            )), 0).label("newly_failing"),
+            func.coalesce(func.sum(case(
+                (and_(ShadowRuleDiff.live_status == "FAIL", ShadowRuleDiff.shadow_status != "FAIL"), 1),
+                else_=0
+            )), 0).label("newly_passing"),
+            func.max(ShadowRuleDiff.evaluated_at).label("last_evaluated_at"),
+        ]
+
+        filters = []
+        if jurisdiction_id:
+            filters.append(ShadowRuleDiff.jurisdiction_id == jurisdiction_id)
+        if active_only:
+            filters.append(ComplianceRuleDraft.is_active.is_(True))
+
+        by_rule = self.db.query(
+            ComplianceRuleDraft.id,
+            ComplianceRuleDraft.compliance_rule_id,
+            ComplianceRuleDraft.rule_name,
+            ComplianceRuleDraft.jurisdiction_id,
+            ComplianceRuleDraft.is_active,
+            *counts
+        ).join(
+            ShadowRuleDiff, ShadowRuleDiff.draft_id == ComplianceRuleDraft.id
+        ).filter(*filters).group_by(ComplianceRuleDraft.id).all()
+
+        by_jurisdiction = self.db.query(
+            ShadowRuleDiff.jurisdiction_id,
+            Jurisdiction.code,
+            func.count(func.distinct(ShadowRuleDiff.draft_id)).label("drafts"),
+            *counts
+        ).join(
+            ComplianceRuleDraft, ComplianceRuleDraft.id == ShadowRuleDiff.draft_id
+        ).outerjoin(
+            Jurisdiction, Jurisdiction.id == ShadowRuleDiff.jurisdiction_id
+        ).filter(*filters).group_by(ShadowRuleDiff.jurisdiction_id, Jurisdiction.code).all()
+
+        def totals(row) -> Dict:
+            return {
+                "bids_evaluated": row.bids_evaluated,
+                "bids_diverged": row.bids_diverged,
+                "newly_failing": row.newly_failing,
+                "newly_passing": row.newly_passing,
+                "last_evaluated_at": row.last_evaluated_at
+            }
+
+        return {
+            "by_rule": sorted(
+                (
+                    {
+                        "draft_id": row.id,
+                        "compliance_rule_id": row.compliance_rule_id,
+                        "rule_name": row.rule_name,
+                        "jurisdiction_id": row.jurisdiction_id,
+                        "is_active": row.is_active,
+                        **totals(row)
+                    }
+                    for row in by_rule
+                ),
+                key=lambda r: (-r["newly_failing"], -r["bids_diverged"], r["rule_name"])
+            ),
+            "by_jurisdiction": sorted(
+                (
+                    {
+                        "jurisdiction_id": row.jurisdiction_id,
+                        "jurisdiction_code": row.code,
+                        "drafts": row.drafts,
+                        **totals(row)
+                    }
+                    for row in by_jurisdiction
+                ),
+                key=lambda r: (-r["newly_failing"], -r["bids_diverged"], r["jurisdiction_code"] or "")
+            )
+        }
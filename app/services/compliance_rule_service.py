@@ -3,6 +3,8 @@ from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from app.models import ComplianceRule, Jurisdiction
 from app.schemas.compliance_rule import ComplianceRuleCreate, ComplianceRuleUpdate
+from app.validation.impact import revalidate_impacted
+from app.validation.rule_definitions import compile_definition, invalidate_compiled_rule
 
 class ComplianceRuleService:
     """Service for managing jurisdiction-specific compliance rules"""
@@ -11,11 +13,20 @@ class ComplianceRuleService:
         self.db = db
     
     def create_rule(self, rule_data: ComplianceRuleCreate) -> ComplianceRule:
-        """Create a new compliance rule"""
+        """Create a new compliance rule (raises ValueError for an invalid rule_definition)"""
+        compile_definition(
+            rule_data.rule_name,
+            rule_data.rule_type,
+            rule_data.rule_definition,
+            rule_data.severity
+        )
+
         rule = ComplianceRule(**rule_data.model_dump())
         self.db.add(rule)
         self.db.commit()
         self.db.refresh(rule)
+
+        revalidate_impacted(self.db, jurisdiction_ids=[rule.jurisdiction_id])
         return rule
     
     def get_rule(self, rule_id: UUID) -> Optional[ComplianceRule]:
@@ -78,19 +89,37 @@ class ComplianceRuleService:
         rule_id: UUID, 
         update_data: ComplianceRuleUpdate
     ) -> Optional[ComplianceRule]:
-        """Update a compliance rule"""
+        """Update a compliance rule (raises ValueError for an invalid rule_definition)"""
         rule = self.get_rule(rule_id)
         
         if not rule:
             return None
         
+        previous_jurisdiction_id = rule.jurisdiction_id
+        
         update_dict = update_data.model_dump(exclude_unset=True)
+
+        # Check the definition as it will be stored before changing anything
+        compile_definition(
+            update_dict.get('rule_name', rule.rule_name),
+            update_dict.get('rule_type', rule.rule_type),
+            update_dict.get('rule_definition', rule.rule_definition),
+            update_dict.get('severity', rule.severity)
+        )
+
         for key, value in update_dict.items():
             if hasattr(rule, key):
                 setattr(rule, key, value)
         
         self.db.commit()
         self.db.refresh(rule)
+        invalidate_compiled_rule(rule.id)
+
+        # A rule moved to another jurisdiction affects bids in both
+        revalidate_impacted(
+            self.db,
+            jurisdiction_ids=[previous_jurisdiction_id, rule.jurisdiction_id]
+        )
         return rule
     
     def delete_rule(self, rule_id: UUID) -> bool:
@@ -100,8 +129,13 @@ class ComplianceRuleService:
         if not rule:
             return False
         
+        jurisdiction_id = rule.jurisdiction_id
+        
         self.db.delete(rule)
         self.db.commit()
+        invalidate_compiled_rule(rule_id)
+
+        revalidate_impacted(self.db, jurisdiction_ids=[jurisdiction_id])
         return True
     
     def get_applicable_rules(
@@ -0,0 +1,284 @@
+"""
+Per-organization network capacity index
+
+Pre-bid assessments ask how many subcontractors in an organization's network
+hold a certification type, optionally for a set of NAICS codes. The index keeps
+each organization's network as compact NetworkMember records plus inverted sets
+by certification type and (certification type, NAICS code), so the question is
+answered with set unions instead of a scan over ORM objects.
+
+Organizations are loaded on first use and cached for NETWORK_INDEX_TTL_SECONDS.
+SubcontractorService and BidService update the cached entry in place when they
+write a subcontractor; the TTL covers certification rows edited outside the API.
+
+The cache is per process, so other workers and edits made outside the API can
+leave an entry stale until it expires. Callers that must not see a stale
+network, like assessment fingerprints, use NetworkCapacityIndex.current, which
+checks the entry against a digest of the organization's rows computed in SQL.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import Text, cast, func, literal
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Certification, Subcontractor
+
+
+@dataclass(frozen=True)
+class NetworkMember:
+    """What one network subcontractor can be counted toward, per certification type"""
+    id: UUID
+    is_mbe: bool
+    cert_types: Tuple[str, ...]                       # upper-case cert_type of each certification
+    cert_naics: Tuple[Optional[FrozenSet[str]], ...]  # per certification; None = no NAICS restriction
+
+    @classmethod
+    def build(cls, subcontractor_id: UUID, is_mbe: bool, certifications: Iterable[Tuple]) -> "NetworkMember":
+        """certifications: (cert_type, naics_codes) pairs as stored"""
+        cert_types = []
+        cert_naics = []
+        for cert_type, naics_codes in certifications:
+            if not cert_type:
+                continue
+            cert_types.append(cert_type.upper())
+            if not naics_codes:
+                cert_naics.append(None)
+            else:
+                # naics_codes is stored as JSONB, could be a list
+                cert_naics.append(frozenset(naics_codes) if isinstance(naics_codes, list) else frozenset())
+        return cls(subcontractor_id, bool(is_mbe), tuple(cert_types), tuple(cert_naics))
+
+    @classmethod
+    def from_subcontractor(cls, sub: Subcontractor) -> "NetworkMember":
+        return cls.build(sub.id, sub.is_mbe, [(c.cert_type, c.naics_codes) for c in sub.certifications])
+
+    def qualifies(self, cert_type: str, naics_codes: Optional[Sequence[str]] = None) -> bool:
+        """
+        Whether the member counts toward cert_type for an opportunity with these NAICS codes
+
+        A certification counts when its type contains cert_type and it either has
+        no NAICS restriction or lists one of the codes; is_mbe alone counts for MBE.
+        """
+        cert_type = cert_type.upper()
+        if cert_type == 'MBE' and self.is_mbe:
+            return True
+        for held, naics in zip(self.cert_types, self.cert_naics):
+            if cert_type not in held:
+                continue
+            if not naics_codes or naics is None:
+                return True
+            if not naics.isdisjoint(naics_codes):
+                return True
+        return False
+
+
+class OrganizationNetwork:
+    """One organization's members with inverted sets, updated in place"""
+
+    def __init__(self, members: Iterable[NetworkMember] = ()):
+        self._members: Dict[UUID, NetworkMember] = {}
+        self._mbe_flag: Set[UUID] = set()
+        self._by_cert: Dict[str, Set[UUID]] = {}             # held cert type -> any certification of it
+        self._unrestricted: Dict[str, Set[UUID]] = {}        # held cert type -> certification without NAICS list
+        self._by_naics: Dict[Tuple[str, str], Set[UUID]] = {}
+        self._lock = threading.Lock()
+        for member in members:
+            self._add(member)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    @property
+    def member_ids(self) -> List[UUID]:
+        with self._lock:
+            return list(self._members)
+
+    def put(self, member: NetworkMember) -> None:
+        with self._lock:
+            self._remove(member.id)
+            self._add(member)
+
+    def discard(self, subcontractor_id: UUID) -> bool:
+        with self._lock:
+            return self._remove(subcontractor_id)
+
+    def matching(self, cert_type: str, naics_codes: Optional[Sequence[str]] = None) -> Set[UUID]:
+        """Members that NetworkMember.qualifies(cert_type, naics_codes) is true for"""
+        cert_type = cert_type.upper()
+        with self._lock:
+            result = set(self._mbe_flag) if cert_type == 'MBE' else set()
+            for held, ids in self._by_cert.items():
+                if cert_type not in held:
+                    continue
+                if not naics_codes:
+                    result |= ids
+                    continue
+                result |= self._unrestricted.get(held, set())
+                for code in naics_codes:
+                    result |= self._by_naics.get((held, code), set())
+            return result
+
+    def count(self, cert_type: str, naics_codes: Optional[Sequence[str]] = None) -> int:
+        return len(self.matching(cert_type, naics_codes))
+
+    def _add(self, member: NetworkMember) -> None:
+        self._members[member.id] = member
+        if member.is_mbe:
+            self._mbe_flag.add(member.id)
+        for held, naics in zip(member.cert_types, member.cert_naics):
+            self._by_cert.setdefault(held, set()).add(member.id)
+            if naics is None:
+                self._unrestricted.setdefault(held, set()).add(member.id)
+                continue
+            for code in naics:
+                self._by_naics.setdefault((held, code), set()).add(member.id)
+
+    def _remove(self, subcontractor_id: UUID) -> bool:
+        member = self._members.pop(subcontractor_id, None)
+        if member is None:
+            return False
+        self._mbe_flag.discard(member.id)
+        for held, naics in zip(member.cert_types, member.cert_naics):
+            self._by_cert.get(held, set()).discard(member.id)
+            if naics is None:
+                self._unrestricted.get(held, set()).discard(member.id)
+                continue
+            for code in naics:
+                self._by_naics.get((held, code), set()).discard(member.id)
+        return True
+
+
+def _load_members(db: Session, *criteria) -> List[NetworkMember]:
+    """NetworkMembers for the subcontractors matching criteria, in two column queries"""
+    subs = db.query(Subcontractor.id, Subcontractor.is_mbe).filter(*criteria).all()
+    if not subs:
+        return []
+
+    certs: Dict[UUID, List[Tuple]] = {}
+    rows = db.query(
+        Certification.subcontractor_id,
+        Certification.cert_type,
+        Certification.naics_codes
+    ).join(
+        Subcontractor, Subcontractor.id == Certification.subcontractor_id
+    ).filter(*criteria).all()
+    for row in rows:
+        certs.setdefault(row.subcontractor_id, []).append((row.cert_type, row.naics_codes))
+
+    return [NetworkMember.build(sub.id, sub.is_mbe, certs.get(sub.id, ())) for sub in subs]
+
+
+def network_digest(db: Session, organization_id: UUID) -> str:
+    """
+    Digest of an organization's subcontractors and certifications, read from the database
+
+    Computed in SQL over the columns the index is built from, so only one value
+    is returned. Changes whenever a member is added, removed or its MBE flag or
+    certifications change, in this process or any other.
+    """
+    row = cast(Subcontractor.id, Text) + literal(':') + func.coalesce(cast(Subcontractor.is_mbe, Text), '') + literal(':') + \
+        func.coalesce(
+            cast(Certification.id, Text) + literal(':') + func.coalesce(Certification.cert_type, '') +
+            literal(':') + func.coalesce(cast(Certification.naics_codes, Text), ''),
+            ''
+        )
+    return db.query(
+        func.md5(func.coalesce(
+            func.string_agg(row, aggregate_order_by(literal(','), Subcontractor.id, Certification.id)),
+            ''
+        ))
+    ).select_from(Subcontractor).outerjoin(
+        Certification, Certification.subcontractor_id == Subcontractor.id
+    ).filter(Subcontractor.organization_id == organization_id).scalar()
+
+
+class NetworkCapacityIndex:
+    """Cached OrganizationNetwork per organization"""
+
+    def __init__(self):
+        self._entries: Dict[UUID, Tuple[float, OrganizationNetwork]] = {}
+        self._digests: Dict[UUID, str] = {}  # network_digest when the entry was loaded
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, organization_id: UUID) -> OrganizationNetwork:
+        now = time.monotonic()
+        cached = self._entries.get(organization_id)
+        if cached and now - cached[0] < settings.NETWORK_INDEX_TTL_SECONDS:
+            return cached[1]
+
+        return self._load(db, organization_id, now)
+
+    def current(self, db: Session, organization_id: UUID) -> Tuple[OrganizationNetwork, str]:
+        """
+        The organization's network as the database has it now, with its network_digest
+
+        The cached entry is reused only if it was loaded at the same digest;
+        otherwise it is reloaded, whatever its age.
+        """
+        digest = network_digest(db, organization_id)
+        cached = self._entries.get(organization_id)
+        if cached and self._digests.get(organization_id) == digest:
+            return cached[1], digest
+
+        return self._load(db, organization_id, time.monotonic(), digest), digest
+
+    def _load(self, db: Session, organization_id: UUID, now: float, digest: Optional[str] = None) -> OrganizationNetwork:
+        network = OrganizationNetwork(
+            _load_members(db, Subcontractor.organization_id == organization_id)
+        )
+
+        with self._lock:
+            self._entries[organization_id] = (now, network)
+            if digest is None:
+                self._digests.pop(organization_id, None)
+            else:
+                self._digests[organization_id] = digest
+        return network
+
+    def refresh_member(self, db: Session, subcontractor_id: UUID) -> None:
+        """
+        Re-read one subcontractor into the cached network of its organization
+
+        Call after the change is committed. Also drops it from any other cached
+        organization, which covers a subcontractor moved between organizations.
+        """
+        row = db.query(Subcontractor.organization_id).filter(
+            Subcontractor.id == subcontractor_id
+        ).first()
+
+        self.remove_member(subcontractor_id)
+        if row is None:
+            return
+
+        cached = self._entries.get(row.organization_id)
+        if cached is None:
+            return  # loaded in full on first use
+
+        members = _load_members(db, Subcontractor.id == subcontractor_id)
+        if members:
+            cached[1].put(members[0])
+
+    def remove_member(self, subcontractor_id: UUID) -> None:
+        with self._lock:
+            networks = [network for _, network in self._entries.values()]
+        for network in networks:
+            network.discard(subcontractor_id)
+
+    def invalidate(self, organization_id: Optional[UUID] = None) -> None:
+        """Drop one organization, or all of them, so the next use reloads"""
+        with self._lock:
+            if organization_id is None:
+                self._entries.clear()
+                self._digests.clear()
+            else:
+                self._entries.pop(organization_id, None)
+                self._digests.pop(organization_id, None)
+
+
+network_index = NetworkCapacityIndex()
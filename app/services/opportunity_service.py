@@ -1,10 +1,20 @@
 from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy import and_, or_
 from datetime import date, datetime, timedelta
 from app.models import Opportunity, Jurisdiction
 from app.schemas.opportunity import OpportunityCreate, OpportunitySearchFilters
+from app.services.alert_service import AlertService
+from app.services.relevance import (
+    NAICS_POINTS,
+    JURISDICTION_POINTS,
+    VALUE_POINTS,
+    TIMELINE_POINTS,
+    relevance_score_expression,
+    score_relevance
+)
 
 class OpportunityService:
     """Service for opportunity operations"""
@@ -16,9 +26,17 @@ class OpportunityService:
         self, 
         opportunity_data: OpportunityCreate
     ) -> Opportunity:
-        """Create a new opportunity"""
+        """Create a new opportunity and deliver it to matching alert profiles"""
         opportunity = Opportunity(**opportunity_data.model_dump())
         self.db.add(opportunity)
+        self.db.flush()
+
+        if opportunity.is_active:
+            jurisdiction_code = self.db.query(Jurisdiction.code).filter(
+                Jurisdiction.id == opportunity.jurisdiction_id
+            ).scalar()
+            AlertService(self.db).match_opportunity(opportunity, jurisdiction_code)
+
         self.db.commit()
         self.db.refresh(opportunity)
         return opportunity
@@ -139,6 +157,74 @@ class OpportunityService:
         self.db.commit()
         return True
     
+    def get_relevant_opportunities(
+        self,
+        organization_naics: List[str],
+        organization_jurisdictions: List[str],
+        min_relevance: int = 50,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[Opportunity]:
+        """
+        Active opportunities scored by relevance, best first, one page at a time
+
+        Scores every active opportunity in a single query using
+        relevance_score_expression and returns the requested page with
+        relevance_score set (not saved). Ties are broken by due date.
+
+        NAICS and jurisdiction are worth more than value and timeline together,
+        so a high min_relevance also requires those matches in the WHERE clause,
+        which lets the indexes on naics_codes and jurisdiction_id narrow the scan.
+        """
+        jurisdiction_ids = [
+            row.id for row in self.db.query(Jurisdiction.id).filter(
+                Jurisdiction.code.in_(organization_jurisdictions)
+            ).all()
+        ] if organization_jurisdictions else []
+
+        score, naics_match, jurisdiction_match = relevance_score_expression(
+            organization_naics, jurisdiction_ids, date.today()
+        )
+
+        # Highest score each combination of matches can still reach
+        reachable = {
+            (naics, jurisdiction): NAICS_POINTS * naics + JURISDICTION_POINTS * jurisdiction
+            + VALUE_POINTS + TIMELINE_POINTS >= min_relevance
+            for naics in (True, False) for jurisdiction in (True, False)
+        }
+
+        query = self.db.query(Opportunity, score.label("score")).outerjoin(
+            Opportunity.jurisdiction
+        ).options(
+            contains_eager(Opportunity.jurisdiction)
+        ).filter(
+            Opportunity.is_active == True,
+            score >= min_relevance
+        )
+
+        if not reachable[(False, False)]:
+            if reachable[(True, False)] and reachable[(False, True)]:
+                query = query.filter(or_(naics_match, jurisdiction_match))
+            elif reachable[(True, False)]:
+                query = query.filter(naics_match)
+            elif reachable[(False, True)]:
+                query = query.filter(jurisdiction_match)
+            else:
+                query = query.filter(and_(naics_match, jurisdiction_match))
+
+        rows = query.order_by(
+            score.desc(),
+            Opportunity.due_date.asc().nullslast(),
+            Opportunity.id
+        ).offset(skip).limit(limit).all()
+
+        opportunities = []
+        for opportunity, relevance in rows:
+            # Returned with the score, but not written back to the row
+            set_committed_value(opportunity, "relevance_score", relevance)
+            opportunities.append(opportunity)
+        return opportunities
+
     def calculate_relevance_score(
         self, 
         opportunity: Opportunity,
@@ -149,34 +235,14 @@ class OpportunityService:
         Calculate relevance score for an opportunity (0-100)
         Based on NAICS match, jurisdiction match, and other factors
         """
-        score = 0
-        
-        # NAICS code match (40 points)
-        if opportunity.naics_codes:
-            matching_naics = set(opportunity.naics_codes) & set(organization_naics)
-            if matching_naics:
-                score += 40
-        
-        # Jurisdiction match (30 points)
         jurisdiction = self.db.query(Jurisdiction).filter(
             Jurisdiction.id == opportunity.jurisdiction_id
         ).first()
-        if jurisdiction and jurisdiction.code in organization_jurisdictions:
-            score += 30
-        
-        # Value range (15 points) - prefer opportunities in sweet spot
-        if opportunity.total_value:
-            if 100000 <= opportunity.total_value <= 5000000:
-                score += 15
-            elif opportunity.total_value < 100000:
-                score += 5
-        
-        # Time until due (15 points) - prefer opportunities with reasonable time
-        if opportunity.due_date:
-            days_until_due = (opportunity.due_date - date.today()).days
-            if 14 <= days_until_due <= 60:
-                score += 15
-            elif 7 <= days_until_due < 14 or 60 < days_until_due <= 90:
-                score += 8
-        
-        return min(score, 100)
\ No newline at end of file
+
+        return score_relevance(
+            opportunity,
+            jurisdiction.code if jurisdiction else None,
+            organization_naics,
+            organization_jurisdictions,
+            date.today()
+        )
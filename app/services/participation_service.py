@@ -0,0 +1,104 @@
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from app.models import Bid, BidParticipation
+from app.validation.participation import (
+    BID_TOTAL,
+    CATEGORIES,
+    CERTIFIED,
+    CLAIMED,
+    SUBCONTRACT_TOTAL,
+    ParticipationLedger
+)
+from app.schemas.participation import BidParticipationSummary, CategoryParticipation
+
+TWO_PLACES = Decimal('0.01')
+
+class ParticipationService:
+    """
+    Participation totals and MBE goal checks from the bid_participation table
+
+    The table is kept current by database triggers, so one grouped query
+    covers one bid or every bid of an organization without loading any
+    bid lines or directory entries.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_bid_participation(self, bid_id: UUID) -> Optional[BidParticipationSummary]:
+        """Participation for one bid, None if it has no bid_participation rows"""
+        summaries = self._summaries(Bid.id == bid_id)
+        return summaries[0] if summaries else None
+
+    def get_participation(
+        self,
+        organization_id: Optional[UUID] = None,
+        below_goal: bool = False
+    ) -> List[BidParticipationSummary]:
+        """Participation for every bid, optionally of one organization or only those below their MBE goal"""
+        filters = [Bid.organization_id == organization_id] if organization_id else []
+        summaries = self._summaries(*filters)
+
+        if below_goal:
+            summaries = [s for s in summaries if s.meets_mbe_goal is False]
+
+        return summaries
+
+    def _summaries(self, *filters) -> List[BidParticipationSummary]:
+        # One row per bid: categories pivoted into claimed/certified columns
+        pivoted = []
+        for category in CATEGORIES:
+            is_category = BidParticipation.category == category
+            pivoted.append(func.sum(case((is_category, BidParticipation.claimed_cents), else_=0)))
+            pivoted.append(func.sum(case((is_category, BidParticipation.certified_cents), else_=0)))
+
+        rows = self.db.query(
+            Bid.id,
+            Bid.solicitation_number,
+            Bid.mbe_goal,
+            func.max(BidParticipation.subcontract_total_cents),
+            func.max(BidParticipation.bid_total_cents),
+            *pivoted
+        ).join(
+            BidParticipation, BidParticipation.bid_id == Bid.id
+        ).filter(*filters).group_by(Bid.id).order_by(Bid.solicitation_number, Bid.id).all()
+
+        return [self._summary(row) for row in rows]
+
+    def _summary(self, row) -> BidParticipationSummary:
+        bid_id, solicitation_number, mbe_goal, subcontract_total_cents, bid_total_cents = row[:5]
+        totals = row[5:]
+
+        # Same arithmetic as the validation rules
+        ledger = ParticipationLedger(
+            claimed_cents={c: int(totals[2 * i] or 0) for i, c in enumerate(CATEGORIES)},
+            certified_cents={c: int(totals[2 * i + 1] or 0) for i, c in enumerate(CATEGORIES)},
+            subcontract_total_cents=int(subcontract_total_cents or 0),
+            bid_total_cents=int(bid_total_cents or 0)
+        )
+
+        mbe_percentage = ledger.percentage('mbe', basis=CERTIFIED, denominator=SUBCONTRACT_TOTAL)
+
+        return BidParticipationSummary(
+            bid_id=bid_id,
+            solicitation_number=solicitation_number,
+            total_amount=Decimal(ledger.bid_total_cents) / 100,
+            subcontract_total=Decimal(ledger.subcontract_total_cents) / 100,
+            mbe_goal=mbe_goal,
+            mbe_percentage=mbe_percentage.quantize(TWO_PLACES),
+            meets_mbe_goal=None if mbe_goal is None else not mbe_percentage < mbe_goal,
+            categories=[
+                CategoryParticipation(
+                    category=category.upper(),
+                    claimed_amount=ledger.amount(category, basis=CLAIMED),
+                    certified_amount=ledger.amount(category, basis=CERTIFIED),
+                    certified_percentage=ledger.percentage(
+                        category, basis=CERTIFIED, denominator=BID_TOTAL
+                    ).quantize(TWO_PLACES)
+                )
+                for category in CATEGORIES
+            ]
+        )
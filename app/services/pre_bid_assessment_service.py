@@ -1,5 +1,9 @@
-from typing import List, Optional, Dict
+from datetime import date
+import hashlib
+import json
+from typing import List, Optional, Dict, Sequence, Tuple
 from uuid import UUID
+from sqlalchemy import Boolean, and_, any_, distinct, func, or_
 from sqlalchemy.orm import Session, joinedload
 from decimal import Decimal
 from app.models import (
@@ -7,11 +11,257 @@ from app.models import (
     Opportunity,
     Jurisdiction,
     SubcontractorDirectory,
-    Subcontractor,
     Certification
 )
-from app.schemas.pre_bid_assessment import PreBidAssessmentCreate, AssessmentRequest
+from app.schemas.pre_bid_assessment import (
+    PreBidAssessmentCreate,
+    AssessmentRequest,
+    PortfolioTriageRequest
+)
 from app.services.subcontractor_directory_service import SubcontractorDirectoryService
+from app.services.network_capacity_index import network_index
+from app.services.summary_rollups import assessment_rollup, record_assessment
+
+# Directory entries below this rating are not counted as available
+DIRECTORY_MIN_RATING = 2.0
+
+# Part of every assessment fingerprint; bump when scoring or the result shape
+# changes so earlier results are no longer returned for the same inputs
+ASSESSMENT_VERSION = "1"
+
+
+def assessment_fingerprint(
+    organization_id: UUID,
+    opportunity: Dict,
+    network_version: str,
+    directory_version: Optional[List],
+    today: date
+) -> str:
+    """
+    Hash of everything perform_assessment reads
+
+    opportunity is the serialized opportunity row, network_version the
+    network_digest of the organization's network and directory_version the matching
+    directory supply (None when the directory is not consulted). today is the
+    day bucket the due-date factors are scored against.
+    """
+    payload = json.dumps(
+        [
+            ASSESSMENT_VERSION,
+            str(organization_id),
+            opportunity,
+            network_version,
+            directory_version,
+            DIRECTORY_MIN_RATING,
+            today.isoformat()
+        ],
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def score_opportunity(
+    mbe_goal: Optional[Decimal],
+    vsbe_goal: Optional[Decimal],
+    total_value: Optional[Decimal],
+    due_date: Optional[date],
+    network_mbe: int,
+    network_vsbe: int,
+    directory_mbe: int,
+    directory_vsbe: int,
+    today: date
+) -> Dict:
+    """
+    Risk score, goal gaps, risk factors and recommendation for one opportunity
+
+    Pure function of the supply counts, shared by perform_assessment and the
+    portfolio triage so both score an opportunity the same way.
+    """
+    risk_score = 0
+    risk_factors = []
+    mbe_gap = Decimal('0.0')
+    vsbe_gap = Decimal('0.0')
+
+    # 1. MBE gap (considering both org network and directory)
+    if mbe_goal and mbe_goal > 0:
+        total_mbe_available = network_mbe + directory_mbe
+
+        if network_mbe == 0 and directory_mbe == 0:
+            # No MBE subs at all - critical
+            mbe_gap = -mbe_goal
+            risk_score += 40
+            risk_factors.append(
+                f"CRITICAL: No MBE subcontractors in your network or directory. "
+                f"Need {mbe_goal}% participation."
+            )
+        elif network_mbe >= 3:
+            # Organization has sufficient MBE network - excellent
+            risk_factors.append(
+                f"EXCELLENT: You have {network_mbe} MBE subcontractors in your network "
+                f"to meet {mbe_goal}% goal."
+            )
+        elif total_mbe_available < 3:
+            # Limited options overall
+            mbe_gap = Decimal('-10.0')
+            risk_score += 25
+            risk_factors.append(
+                f"WARNING: Only {total_mbe_available} MBE subcontractors available "
+                f"({network_mbe} in your network, {directory_mbe} in directory). "
+                f"Limited options to meet {mbe_goal}% goal."
+            )
+        else:
+            # Sufficient combined resources
+            risk_factors.append(
+                f"GOOD: {total_mbe_available} MBE subcontractors available "
+                f"({network_mbe} in your network, {directory_mbe} in directory) "
+                f"to meet {mbe_goal}% goal."
+            )
+
+    # 2. VSBE gap (considering both org network and directory)
+    if vsbe_goal and vsbe_goal > 0:
+        total_vsbe_available = network_vsbe + directory_vsbe
+
+        if network_vsbe == 0 and directory_vsbe == 0:
+            # No VSBE subs at all
+            vsbe_gap = -vsbe_goal
+            risk_score += 20
+            risk_factors.append(
+                f"WARNING: No VSBE subcontractors in your network or directory. "
+                f"Need {vsbe_goal}% participation."
+            )
+        elif network_vsbe >= 2:
+            # Organization has sufficient VSBE network
+            risk_factors.append(
+                f"GOOD: You have {network_vsbe} VSBE subcontractors in your network."
+            )
+        elif total_vsbe_available < 2:
+            # Limited options
+            vsbe_gap = Decimal('-5.0')
+            risk_score += 10
+            risk_factors.append(
+                f"CAUTION: Only {total_vsbe_available} VSBE subcontractors available "
+                f"({network_vsbe} in your network, {directory_vsbe} in directory)."
+            )
+        else:
+            risk_factors.append(
+                f"GOOD: {total_vsbe_available} VSBE subcontractors available."
+            )
+
+    # 3. Check opportunity value
+    if total_value:
+        if total_value > 10000000:  # $10M+
+            risk_score += 15
+            risk_factors.append(
+                "CAUTION: High-value contract ($10M+) requires strong team and capacity."
+            )
+        elif total_value < 100000:  # Under $100k
+            risk_factors.append(
+                "INFO: Small contract value may have lower margins."
+            )
+
+    # 4. Check due date
+    if due_date:
+        days_until_due = (due_date - today).days
+
+        if days_until_due < 7:
+            risk_score += 30
+            risk_factors.append(
+                f"CRITICAL: Only {days_until_due} days until due date. Very tight timeline."
+            )
+        elif days_until_due < 14:
+            risk_score += 15
+            risk_factors.append(
+                f"WARNING: Only {days_until_due} days until due date. Limited prep time."
+            )
+        else:
+            risk_factors.append(
+                f"GOOD: {days_until_due} days until due date. Adequate preparation time."
+            )
+
+    # 5. Generate recommendation
+    if risk_score >= 60:
+        recommendation = "NO_BID"
+        recommendation_reason = (
+            "HIGH RISK: Significant compliance gaps or timing constraints. "
+            "Recommend passing on this opportunity."
+        )
+    elif risk_score >= 30:
+        recommendation = "CAUTION"
+        recommendation_reason = (
+            "MODERATE RISK: Some concerns identified. "
+            "Proceed with careful planning and strong subcontractor commitments."
+        )
+    else:
+        recommendation = "BID"
+        recommendation_reason = (
+            "LOW RISK: Good subcontractor availability and reasonable timeline. "
+            "Strong opportunity to pursue."
+        )
+
+    return {
+        # 0-100, higher = more risk
+        "overall_risk_score": min(risk_score, 100),
+        "mbe_gap_percentage": mbe_gap,
+        "vsbe_gap_percentage": vsbe_gap,
+        "risk_factors": risk_factors,
+        "recommendation": recommendation,
+        "recommendation_reason": recommendation_reason
+    }
+
+
+def serialize_opportunity(opportunity: Opportunity) -> Dict:
+    """Opportunity fields as stored in an assessment result"""
+    # Manually construct opportunity dict to avoid serialization issues
+    return {
+        "id": str(opportunity.id),
+        "solicitation_number": opportunity.solicitation_number,
+        "title": opportunity.title,
+        "jurisdiction_id": str(opportunity.jurisdiction_id),
+        "agency": opportunity.agency,
+        "mbe_goal": float(opportunity.mbe_goal) if opportunity.mbe_goal else None,
+        "vsbe_goal": float(opportunity.vsbe_goal) if opportunity.vsbe_goal else None,
+        "total_value": float(opportunity.total_value) if opportunity.total_value else None,
+        "naics_codes": opportunity.naics_codes,
+        "due_date": opportunity.due_date.isoformat() if opportunity.due_date else None,
+        "posted_date": opportunity.posted_date.isoformat() if opportunity.posted_date else None,
+        "opportunity_url": opportunity.opportunity_url,
+        "is_active": opportunity.is_active,
+        "relevance_score": opportunity.relevance_score
+    }
+
+
+def assessment_result(assessment: PreBidAssessment) -> Dict:
+    """
+    A saved assessment in the shape perform_assessment returns
+
+    Served from result_snapshot without recomputing or joining. Assessments
+    saved without a snapshot only have their scalar columns.
+    """
+    result = {
+        "id": str(assessment.id),
+        "assessed_at": assessment.assessed_at.isoformat() if assessment.assessed_at else None
+    }
+    if assessment.result_snapshot:
+        result.update(assessment.result_snapshot)
+        return result
+
+    result.update({
+        "organization_id": str(assessment.organization_id),
+        "opportunity_id": str(assessment.opportunity_id),
+        "overall_risk_score": assessment.overall_risk_score,
+        "mbe_gap_percentage": float(assessment.mbe_gap_percentage) if assessment.mbe_gap_percentage is not None else None,
+        "vsbe_gap_percentage": float(assessment.vsbe_gap_percentage) if assessment.vsbe_gap_percentage is not None else None,
+        "available_subcontractors_count": assessment.available_subcontractors_count,
+        "recommendation": assessment.recommendation,
+        "recommendation_reason": assessment.recommendation_reason,
+        "risk_factors": [],
+        "matching_subcontractors": [],
+        "opportunity": None,
+        "organization_network": None
+    })
+    return result
+
 
 class PreBidAssessmentService:
     """Service for pre-bid assessment operations"""
@@ -27,6 +277,7 @@ class PreBidAssessmentService:
         """Create a new pre-bid assessment"""
         assessment = PreBidAssessment(**assessment_data.model_dump())
         self.db.add(assessment)
+        record_assessment(self.db, assessment.organization_id, None, None)
         self.db.commit()
         self.db.refresh(assessment)
         return assessment
@@ -34,84 +285,23 @@ class PreBidAssessmentService:
     def get_assessment(
         self, 
         assessment_id: UUID
-    ) -> Optional[PreBidAssessment]:
-        """Get an assessment by ID"""
-        return self.db.query(PreBidAssessment).options(
-            joinedload(PreBidAssessment.opportunity).joinedload(Opportunity.jurisdiction)
-        ).filter(PreBidAssessment.id == assessment_id).first()
+    ) -> Optional[Dict]:
+        """Get an assessment by ID, as the stored result (see assessment_result)"""
+        assessment = self.db.query(PreBidAssessment).filter(
+            PreBidAssessment.id == assessment_id
+        ).first()
+        return assessment_result(assessment) if assessment else None
     
     def get_assessments_by_organization(
         self,
         organization_id: UUID
-    ) -> List[PreBidAssessment]:
-        """Get all assessments for an organization"""
-        return self.db.query(PreBidAssessment).options(
-            joinedload(PreBidAssessment.opportunity).joinedload(Opportunity.jurisdiction)
-        ).filter(
+    ) -> List[Dict]:
+        """Get all assessments for an organization, newest first, as stored results"""
+        assessments = self.db.query(PreBidAssessment).filter(
             PreBidAssessment.organization_id == organization_id
         ).order_by(PreBidAssessment.assessed_at.desc()).all()
+        return [assessment_result(a) for a in assessments]
 
-    def _get_organization_network(self, organization_id: UUID) -> List[Subcontractor]:
-        """
-        Get organization's own network of subcontractors
-        These are the subcontractors that the organization has already worked with
-        or added to their network for bidding purposes.
-        """
-        return self.db.query(Subcontractor).options(
-            joinedload(Subcontractor.certifications)
-        ).filter(
-            Subcontractor.organization_id == organization_id
-        ).all()
-
-    def _calculate_network_capacity(
-        self,
-        network_subs: List[Subcontractor],
-        cert_type: str,
-        naics_codes: List[str] = None
-    ) -> Dict:
-        """
-        Calculate the capacity of organization's network for a specific certification type
-
-        Args:
-            network_subs: List of subcontractors in the organization's network
-            cert_type: Type of certification to check (e.g., 'MBE', 'VSBE')
-            naics_codes: Optional NAICS codes to filter by capability
-
-        Returns:
-            Dict with count and list of matching subcontractors
-        """
-        matching_subs = []
-
-        for sub in network_subs:
-            # Check if subcontractor has the required certification type
-            has_cert = False
-
-            # Check certifications relationship
-            for cert in sub.certifications:
-                if cert.cert_type and cert_type.upper() in cert.cert_type.upper():
-                    # If NAICS codes are specified, check if they match
-                    if naics_codes and cert.naics_codes:
-                        # cert.naics_codes is stored as JSONB, could be a list
-                        cert_naics_list = cert.naics_codes if isinstance(cert.naics_codes, list) else []
-                        if any(naics in cert_naics_list for naics in naics_codes):
-                            has_cert = True
-                            break
-                    else:
-                        has_cert = True
-                        break
-
-            # Fallback: check is_mbe flag for MBE certification
-            if cert_type.upper() == 'MBE' and sub.is_mbe:
-                has_cert = True
-
-            if has_cert:
-                matching_subs.append(sub)
-
-        return {
-            "count": len(matching_subs),
-            "subcontractors": matching_subs
-        }
-    
     def perform_assessment(
         self, 
         request: AssessmentRequest
@@ -119,6 +309,10 @@ class PreBidAssessmentService:
         """
         Perform a comprehensive pre-bid assessment
         Returns assessment data with risk score, gaps, and recommendations
+
+        The inputs are fingerprinted first (see assessment_fingerprint). If an
+        earlier assessment of this opportunity for the organization has the same
+        fingerprint, its stored result is returned and nothing is written.
         """
         # Get the opportunity
         opportunity = self.db.query(Opportunity).options(
@@ -134,6 +328,8 @@ class PreBidAssessmentService:
         if not jurisdiction:
             raise ValueError(f"Opportunity {request.opportunity_id} has no associated jurisdiction")
 
+        opportunity_dict = serialize_opportunity(opportunity)
+
         # Initialize assessment data
         assessment_data = {
             "organization_id": request.organization_id,
@@ -151,54 +347,74 @@ class PreBidAssessmentService:
             "organization_network_vsbe_count": 0
         }
 
-        risk_score = 0
-        risk_factors = []
-
-        # 1. Get organization's own network first
-        org_network = self._get_organization_network(request.organization_id)
+        # 1. Get organization's own network first, from the capacity index checked
+        # against the database so a stale entry never matches an old fingerprint
+        org_network, network_version = network_index.current(self.db, request.organization_id)
         assessment_data["organization_network_count"] = len(org_network)
 
-        # Calculate organization's network capacity for MBE and VSBE
-        org_network_mbe = self._calculate_network_capacity(
-            org_network,
-            cert_type='MBE',
-            naics_codes=opportunity.naics_codes if opportunity.naics_codes else None
-        )
-        org_network_vsbe = self._calculate_network_capacity(
-            org_network,
-            cert_type='VSBE',
-            naics_codes=opportunity.naics_codes if opportunity.naics_codes else None
+        categories = [
+            category for category, goal in (('mbe', opportunity.mbe_goal), ('vsbe', opportunity.vsbe_goal))
+            if goal and goal > 0
+        ]
+        uses_directory = bool(opportunity.naics_codes and jurisdiction and categories)
+
+        # Return the previous result if none of the inputs changed
+        today = date.today()
+        directory_version = self.subcontractor_service.get_matching_version(
+            naics_codes=opportunity.naics_codes,
+            jurisdiction_code=jurisdiction.code,
+            min_rating=DIRECTORY_MIN_RATING
+        ) if uses_directory else None
+
+        fingerprint = assessment_fingerprint(
+            request.organization_id,
+            {**opportunity_dict, "jurisdiction_code": jurisdiction.code},
+            network_version,
+            directory_version,
+            today
         )
 
-        assessment_data["organization_network_mbe_count"] = org_network_mbe["count"]
-        assessment_data["organization_network_vsbe_count"] = org_network_vsbe["count"]
-
-        # 2. Find additional available subcontractors from directory
-        matching_subs_mbe = []
-        matching_subs_vsbe = []
-
-        if opportunity.naics_codes and jurisdiction:
-            # Find MBE subcontractors from directory
-            if opportunity.mbe_goal and opportunity.mbe_goal > 0:
-                matching_subs_mbe = self.subcontractor_service.get_matching_subcontractors(
-                    naics_codes=opportunity.naics_codes,
-                    jurisdiction_code=jurisdiction.code,
-                    is_mbe=True,
-                    min_rating=2.0
-                )
+        previous = self.db.query(PreBidAssessment).filter(
+            PreBidAssessment.organization_id == request.organization_id,
+            PreBidAssessment.opportunity_id == request.opportunity_id,
+            PreBidAssessment.input_fingerprint == fingerprint,
+            PreBidAssessment.result_snapshot.isnot(None)
+        ).order_by(PreBidAssessment.assessed_at.desc()).first()
 
-            # Find VSBE subcontractors from directory
-            if opportunity.vsbe_goal and opportunity.vsbe_goal > 0:
-                matching_subs_vsbe = self.subcontractor_service.get_matching_subcontractors(
-                    naics_codes=opportunity.naics_codes,
-                    jurisdiction_code=jurisdiction.code,
-                    is_vsbe=True,
-                    min_rating=2.0
-                )
+        if previous:
+            return {
+                "id": str(previous.id),
+                "assessed_at": previous.assessed_at.isoformat(),
+                **previous.result_snapshot
+            }
+
+        # Calculate organization's network capacity for MBE and VSBE
+        naics_codes = opportunity.naics_codes if opportunity.naics_codes else None
+        org_network_mbe = org_network.count('MBE', naics_codes)
+        org_network_vsbe = org_network.count('VSBE', naics_codes)
+
+        assessment_data["organization_network_mbe_count"] = org_network_mbe
+        assessment_data["organization_network_vsbe_count"] = org_network_vsbe
+
+        # 2. Find additional available subcontractors from directory:
+        # counts, de-duplicated total and the best-rated MBE rows in one query
+        directory_supply = {"counts": {}, "total": 0, "top": []}
+
+        if uses_directory:
+            directory_supply = self.subcontractor_service.get_matching_summary(
+                naics_codes=opportunity.naics_codes,
+                jurisdiction_code=jurisdiction.code,
+                categories=categories,
+                min_rating=DIRECTORY_MIN_RATING,
+                top_k=10,
+                top_category='mbe'
+            )
+
+        directory_mbe = directory_supply["counts"].get('mbe', 0)
+        directory_vsbe = directory_supply["counts"].get('vsbe', 0)
 
         # Total matching includes both org network and directory
-        total_matching = len(set([s.id for s in matching_subs_mbe + matching_subs_vsbe]))
-        assessment_data["available_subcontractors_count"] = total_matching
+        assessment_data["available_subcontractors_count"] = directory_supply["total"]
 
         # Convert subcontractors to dicts for serialization - manually to avoid relationship issues
         matching_subs_dicts = [
@@ -218,174 +434,25 @@ class PreBidAssessmentService:
                 "is_verified": sub.is_verified,
                 "created_at": sub.created_at.isoformat() if sub.created_at else None
             }
-            for sub in matching_subs_mbe[:10]
+            for sub in directory_supply["top"]
         ]
         assessment_data["matching_subcontractors"] = matching_subs_dicts
         
-        # 2. Calculate MBE gap (considering both org network and directory)
-        if opportunity.mbe_goal and opportunity.mbe_goal > 0:
-            total_mbe_available = org_network_mbe["count"] + len(matching_subs_mbe)
-
-            if org_network_mbe["count"] == 0 and len(matching_subs_mbe) == 0:
-                # No MBE subs at all - critical
-                assessment_data["mbe_gap_percentage"] = -opportunity.mbe_goal
-                risk_score += 40
-                risk_factors.append(
-                    f"CRITICAL: No MBE subcontractors in your network or directory. "
-                    f"Need {opportunity.mbe_goal}% participation."
-                )
-            elif org_network_mbe["count"] >= 3:
-                # Organization has sufficient MBE network - excellent
-                assessment_data["mbe_gap_percentage"] = Decimal('0.0')
-                risk_factors.append(
-                    f"EXCELLENT: You have {org_network_mbe['count']} MBE subcontractors in your network "
-                    f"to meet {opportunity.mbe_goal}% goal."
-                )
-            elif total_mbe_available < 3:
-                # Limited options overall
-                assessment_data["mbe_gap_percentage"] = Decimal('-10.0')
-                risk_score += 25
-                risk_factors.append(
-                    f"WARNING: Only {total_mbe_available} MBE subcontractors available "
-                    f"({org_network_mbe['count']} in your network, {len(matching_subs_mbe)} in directory). "
-                    f"Limited options to meet {opportunity.mbe_goal}% goal."
-                )
-            else:
-                # Sufficient combined resources
-                assessment_data["mbe_gap_percentage"] = Decimal('0.0')
-                risk_factors.append(
-                    f"GOOD: {total_mbe_available} MBE subcontractors available "
-                    f"({org_network_mbe['count']} in your network, {len(matching_subs_mbe)} in directory) "
-                    f"to meet {opportunity.mbe_goal}% goal."
-                )
-
-        # 3. Calculate VSBE gap (considering both org network and directory)
-        if opportunity.vsbe_goal and opportunity.vsbe_goal > 0:
-            total_vsbe_available = org_network_vsbe["count"] + len(matching_subs_vsbe)
-
-            if org_network_vsbe["count"] == 0 and len(matching_subs_vsbe) == 0:
-                # No VSBE subs at all
-                assessment_data["vsbe_gap_percentage"] = -opportunity.vsbe_goal
-                risk_score += 20
-                risk_factors.append(
-                    f"WARNING: No VSBE subcontractors in your network or directory. "
-                    f"Need {opportunity.vsbe_goal}% participation."
-                )
-            elif org_network_vsbe["count"] >= 2:
-                # Organization has sufficient VSBE network
-                assessment_data["vsbe_gap_percentage"] = Decimal('0.0')
-                risk_factors.append(
-                    f"GOOD: You have {org_network_vsbe['count']} VSBE subcontractors in your network."
-                )
-            elif total_vsbe_available < 2:
-                # Limited options
-                assessment_data["vsbe_gap_percentage"] = Decimal('-5.0')
-                risk_score += 10
-                risk_factors.append(
-                    f"CAUTION: Only {total_vsbe_available} VSBE subcontractors available "
-                    f"({org_network_vsbe['count']} in your network, {len(matching_subs_vsbe)} in directory)."
-                )
-            else:
-                assessment_data["vsbe_gap_percentage"] = Decimal('0.0')
-                risk_factors.append(
-                    f"GOOD: {total_vsbe_available} VSBE subcontractors available."
-                )
-        
-        # 4. Check opportunity value
-        if opportunity.total_value:
-            if opportunity.total_value > 10000000:  # $10M+
-                risk_score += 15
-                risk_factors.append(
-                    "CAUTION: High-value contract ($10M+) requires strong team and capacity."
-                )
-            elif opportunity.total_value < 100000:  # Under $100k
-                risk_factors.append(
-                    "INFO: Small contract value may have lower margins."
-                )
-        
-        # 5. Check due date
-        if opportunity.due_date:
-            from datetime import date, timedelta
-            days_until_due = (opportunity.due_date - date.today()).days
-            
-            if days_until_due < 7:
-                risk_score += 30
-                risk_factors.append(
-                    f"CRITICAL: Only {days_until_due} days until due date. Very tight timeline."
-                )
-            elif days_until_due < 14:
-                risk_score += 15
-                risk_factors.append(
-                    f"WARNING: Only {days_until_due} days until due date. Limited prep time."
-                )
-            else:
-                risk_factors.append(
-                    f"GOOD: {days_until_due} days until due date. Adequate preparation time."
-                )
-        
-        # 6. Calculate overall risk score (0-100, higher = more risk)
-        assessment_data["overall_risk_score"] = min(risk_score, 100)
-        assessment_data["risk_factors"] = risk_factors
-        
-        # 7. Generate recommendation
-        if risk_score >= 60:
-            assessment_data["recommendation"] = "NO_BID"
-            assessment_data["recommendation_reason"] = (
-                "HIGH RISK: Significant compliance gaps or timing constraints. "
-                "Recommend passing on this opportunity."
-            )
-        elif risk_score >= 30:
-            assessment_data["recommendation"] = "CAUTION"
-            assessment_data["recommendation_reason"] = (
-                "MODERATE RISK: Some concerns identified. "
-                "Proceed with careful planning and strong subcontractor commitments."
-            )
-        else:
-            assessment_data["recommendation"] = "BID"
-            assessment_data["recommendation_reason"] = (
-                "LOW RISK: Good subcontractor availability and reasonable timeline. "
-                "Strong opportunity to pursue."
-            )
+        # 3. Score gaps, value and timeline
+        assessment_data.update(score_opportunity(
+            mbe_goal=opportunity.mbe_goal,
+            vsbe_goal=opportunity.vsbe_goal,
+            total_value=opportunity.total_value,
+            due_date=opportunity.due_date,
+            network_mbe=org_network_mbe,
+            network_vsbe=org_network_vsbe,
+            directory_mbe=directory_mbe,
+            directory_vsbe=directory_vsbe,
+            today=today
+        ))
         
-        # 8. Save the assessment
-        assessment = PreBidAssessment(
-            organization_id=assessment_data["organization_id"],
-            opportunity_id=assessment_data["opportunity_id"],
-            overall_risk_score=assessment_data["overall_risk_score"],
-            mbe_gap_percentage=assessment_data["mbe_gap_percentage"],
-            vsbe_gap_percentage=assessment_data["vsbe_gap_percentage"],
-            available_subcontractors_count=assessment_data["available_subcontractors_count"],
-            recommendation=assessment_data["recommendation"],
-            recommendation_reason=assessment_data["recommendation_reason"]
-        )
-        
-        self.db.add(assessment)
-        self.db.commit()
-        self.db.refresh(assessment)
-        
-        # Return full assessment data including transient fields
-        # Manually construct opportunity dict to avoid serialization issues
-        opportunity_dict = {
-            "id": str(opportunity.id),
-            "solicitation_number": opportunity.solicitation_number,
-            "title": opportunity.title,
-            "jurisdiction_id": str(opportunity.jurisdiction_id),
-            "agency": opportunity.agency,
-            "mbe_goal": float(opportunity.mbe_goal) if opportunity.mbe_goal else None,
-            "vsbe_goal": float(opportunity.vsbe_goal) if opportunity.vsbe_goal else None,
-            "total_value": float(opportunity.total_value) if opportunity.total_value else None,
-            "naics_codes": opportunity.naics_codes,
-            "due_date": opportunity.due_date.isoformat() if opportunity.due_date else None,
-            "posted_date": opportunity.posted_date.isoformat() if opportunity.posted_date else None,
-            "opportunity_url": opportunity.opportunity_url,
-            "is_active": opportunity.is_active,
-            "relevance_score": opportunity.relevance_score
-        }
-
-        # Return with all JSON-serializable types
-        return {
-            "id": str(assessment.id),
-            "assessed_at": assessment.assessed_at.isoformat(),
+        # Everything but id and assessed_at, with all JSON-serializable types
+        result = {
             "organization_id": str(assessment_data["organization_id"]),
             "opportunity_id": str(assessment_data["opportunity_id"]),
             "overall_risk_score": assessment_data["overall_risk_score"],
@@ -404,25 +471,238 @@ class PreBidAssessmentService:
                 "vsbe_count": assessment_data["organization_network_vsbe_count"]
             }
         }
+
+        # 4. Save the assessment with its fingerprint and result
+        assessment = PreBidAssessment(
+            organization_id=assessment_data["organization_id"],
+            opportunity_id=assessment_data["opportunity_id"],
+            overall_risk_score=assessment_data["overall_risk_score"],
+            mbe_gap_percentage=assessment_data["mbe_gap_percentage"],
+            vsbe_gap_percentage=assessment_data["vsbe_gap_percentage"],
+            available_subcontractors_count=assessment_data["available_subcontractors_count"],
+            recommendation=assessment_data["recommendation"],
+            recommendation_reason=assessment_data["recommendation_reason"],
+            input_fingerprint=fingerprint,
+            result_snapshot=result
+        )
+        
+        self.db.add(assessment)
+        record_assessment(
+            self.db,
+            assessment.organization_id,
+            assessment.recommendation,
+            assessment.overall_risk_score
+        )
+        self.db.commit()
+        self.db.refresh(assessment)
+        
+        return {
+            "id": str(assessment.id),
+            "assessed_at": assessment.assessed_at.isoformat(),
+            **result
+        }
     
+    def _directory_supply(self, opportunity_ids: Sequence[UUID]) -> Dict[UUID, Tuple[int, int, int]]:
+        """
+        (MBE, VSBE, distinct available) directory counts per opportunity, in one grouped query
+
+        Counts the same entries get_matching_subcontractors returns for each
+        opportunity: NAICS overlap, listed in the opportunity's jurisdiction,
+        rated at least DIRECTORY_MIN_RATING, and only for goals above zero.
+        """
+        if not opportunity_ids:
+            return {}
+
+        directory = SubcontractorDirectory
+        counts_mbe = and_(
+            Opportunity.mbe_goal > 0,
+            directory.certifications['mbe'].astext.cast(Boolean) == True
+        )
+        counts_vsbe = and_(
+            Opportunity.vsbe_goal > 0,
+            directory.certifications['vsbe'].astext.cast(Boolean) == True
+        )
+
+        rows = self.db.query(
+            Opportunity.id,
+            func.count(distinct(directory.id)).filter(counts_mbe).label("mbe"),
+            func.count(distinct(directory.id)).filter(counts_vsbe).label("vsbe"),
+            func.count(distinct(directory.id)).filter(or_(counts_mbe, counts_vsbe)).label("available")
+        ).join(
+            Jurisdiction, Jurisdiction.id == Opportunity.jurisdiction_id
+        ).join(
+            directory,
+            and_(
+                directory.naics_codes.overlap(Opportunity.naics_codes),
+                Jurisdiction.code == any_(directory.jurisdiction_codes),
+                directory.rating >= DIRECTORY_MIN_RATING
+            )
+        ).filter(
+            Opportunity.id.in_(opportunity_ids)
+        ).group_by(Opportunity.id).all()
+
+        return {row.id: (row.mbe, row.vsbe, row.available) for row in rows}
+
+    def triage_portfolio(self, request: PortfolioTriageRequest) -> Dict:
+        """
+        Score every active opportunity for an organization and rank them
+
+        Reads the organization's network from the capacity index, counts directory supply for all
+        opportunities with one grouped query and scores each opportunity with
+        score_opportunity in memory. Nothing is written unless request.persist
+        is set, in which case one PreBidAssessment row per opportunity is added.
+        """
+        query = self.db.query(Opportunity).options(
+            joinedload(Opportunity.jurisdiction)
+        ).filter(Opportunity.is_active == True)
+
+        if request.jurisdiction_code:
+            query = query.join(Jurisdiction).filter(Jurisdiction.code == request.jurisdiction_code)
+
+        opportunities = query.all()
+
+        # perform_assessment refuses opportunities without a jurisdiction, so they are left out here too
+        scorable = [o for o in opportunities if o.jurisdiction]
+
+        network = network_index.get(self.db, request.organization_id)
+        supply = self._directory_supply([o.id for o in scorable])
+
+        today = date.today()
+        board = []
+        for opportunity in scorable:
+            naics_codes = opportunity.naics_codes or None
+            network_mbe = network.count('MBE', naics_codes)
+            network_vsbe = network.count('VSBE', naics_codes)
+            directory_mbe, directory_vsbe, available = supply.get(opportunity.id, (0, 0, 0))
+
+            entry = {
+                "opportunity_id": opportunity.id,
+                "solicitation_number": opportunity.solicitation_number,
+                "title": opportunity.title,
+                "jurisdiction_code": opportunity.jurisdiction.code,
+                "due_date": opportunity.due_date,
+                "total_value": opportunity.total_value,
+                "mbe_goal": opportunity.mbe_goal,
+                "vsbe_goal": opportunity.vsbe_goal,
+                "available_subcontractors_count": available,
+                "organization_network_mbe_count": network_mbe,
+                "organization_network_vsbe_count": network_vsbe,
+                "directory_mbe_count": directory_mbe,
+                "directory_vsbe_count": directory_vsbe,
+                "assessment_id": None
+            }
+            entry.update(score_opportunity(
+                mbe_goal=opportunity.mbe_goal,
+                vsbe_goal=opportunity.vsbe_goal,
+                total_value=opportunity.total_value,
+                due_date=opportunity.due_date,
+                network_mbe=network_mbe,
+                network_vsbe=network_vsbe,
+                directory_mbe=directory_mbe,
+                directory_vsbe=directory_vsbe,
+                today=today
+            ))
+            board.append(entry)
+
+        # Lowest risk first; among equals the nearest due date, then the largest contract
+        board.sort(key=lambda e: (
+            e["overall_risk_score"],
+            e["due_date"] or date.max,
+            -(e["total_value"] or 0)
+        ))
+
+        if request.limit:
+            board = board[:request.limit]
+
+        if request.persist and board:
+            by_id = {o.id: o for o in scorable}
+            # Same result shape as perform_assessment; triage does not fetch directory rows,
+            # so there is no fingerprint and perform_assessment will not return these
+            assessments = [
+                PreBidAssessment(
+                    organization_id=request.organization_id,
+                    opportunity_id=entry["opportunity_id"],
+                    overall_risk_score=entry["overall_risk_score"],
+                    mbe_gap_percentage=entry["mbe_gap_percentage"],
+                    vsbe_gap_percentage=entry["vsbe_gap_percentage"],
+                    available_subcontractors_count=entry["available_subcontractors_count"],
+                    recommendation=entry["recommendation"],
+                    recommendation_reason=entry["recommendation_reason"],
+                    result_snapshot={
+                        "organization_id": str(request.organization_id),
+                        "opportunity_id": str(entry["opportunity_id"]),
+                        "overall_risk_score": entry["overall_risk_score"],
+                        "mbe_gap_percentage": float(entry["mbe_gap_percentage"]),
+                        "vsbe_gap_percentage": float(entry["vsbe_gap_percentage"]),
+                        "available_subcontractors_count": entry["available_subcontractors_count"],
+                        "recommendation": entry["recommendation"],
+                        "recommendation_reason": entry["recommendation_reason"],
+                        "risk_factors": entry["risk_factors"],
+                        "matching_subcontractors": [],
+                        "opportunity": serialize_opportunity(by_id[entry["opportunity_id"]]),
+                        "organization_network": {
+                            "total_count": len(network),
+                            "mbe_count": entry["organization_network_mbe_count"],
+                            "vsbe_count": entry["organization_network_vsbe_count"]
+                        }
+                    }
+                )
+                for entry in board
+            ]
+            self.db.add_all(assessments)
+            for assessment in assessments:
+                record_assessment(
+                    self.db,
+                    assessment.organization_id,
+                    assessment.recommendation,
+                    assessment.overall_risk_score
+                )
+            self.db.commit()
+            for entry, assessment in zip(board, assessments):
+                entry["assessment_id"] = assessment.id
+
+        recommendations = [e["recommendation"] for e in board]
+        return {
+            "organization_id": request.organization_id,
+            "opportunities_scored": len(board),
+            "skipped_without_jurisdiction": len(opportunities) - len(scorable),
+            "bid_recommended": recommendations.count("BID"),
+            "caution_recommended": recommendations.count("CAUTION"),
+            "no_bid_recommended": recommendations.count("NO_BID"),
+            "persisted": bool(request.persist and board),
+            "board": board
+        }
+
     def get_assessment_summary_by_organization(
         self, 
         organization_id: UUID
     ) -> Dict:
-        """Get summary statistics of assessments for an organization"""
-        assessments = self.get_assessments_by_organization(organization_id)
-        
-        total = len(assessments)
-        bid_count = sum(1 for a in assessments if a.recommendation == "BID")
-        caution_count = sum(1 for a in assessments if a.recommendation == "CAUTION")
-        no_bid_count = sum(1 for a in assessments if a.recommendation == "NO_BID")
-        
-        avg_risk_score = sum(a.overall_risk_score or 0 for a in assessments) / total if total > 0 else 0
+        """
+        Get summary statistics of assessments for an organization
+
+        Reads the organization's rollup row when SUMMARY_ROLLUPS is on,
+        otherwise aggregates pre_bid_assessments in one query.
+        """
+        rollup = assessment_rollup(self.db, organization_id)
+
+        if rollup is None:
+            rollup = self.db.query(
+                func.count(PreBidAssessment.id).label("total"),
+                func.count(PreBidAssessment.id).filter(PreBidAssessment.recommendation == "BID").label("bid_count"),
+                func.count(PreBidAssessment.id).filter(PreBidAssessment.recommendation == "CAUTION").label("caution_count"),
+                func.count(PreBidAssessment.id).filter(PreBidAssessment.recommendation == "NO_BID").label("no_bid_count"),
+                func.coalesce(func.sum(PreBidAssessment.overall_risk_score), 0).label("risk_score_sum")
+            ).filter(
+                PreBidAssessment.organization_id == organization_id
+            ).one()
+
+        total = rollup.total
+        avg_risk_score = rollup.risk_score_sum / total if total > 0 else 0
         
         return {
             "total_assessments": total,
-            "bid_recommended": bid_count,
-            "caution_recommended": caution_count,
-            "no_bid_recommended": no_bid_count,
+            "bid_recommended": rollup.bid_count,
+            "caution_recommended": rollup.caution_count,
+            "no_bid_recommended": rollup.no_bid_count,
             "average_risk_score": round(avg_risk_score, 2)
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,95 @@
+"""
+Opportunity relevance scoring
+
+An opportunity scores up to 100 for an organization:
+- NAICS_POINTS if it shares a NAICS code with the organization
+- JURISDICTION_POINTS if its jurisdiction is one of the organization's
+- VALUE_POINTS for a value in the $100k-$5M sweet spot (5 below it)
+- TIMELINE_POINTS for 14-60 days until due (8 for 7-13 or 61-90 days)
+
+score_relevance scores one opportunity in Python (used when an opportunity is
+matched against saved alert profiles); relevance_score_expression is the same
+score as a SQL expression for ranking many opportunities at once.
+"""
+from datetime import date
+from typing import Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, case, false, literal, or_
+
+from app.models import Opportunity
+
+NAICS_POINTS = 40
+JURISDICTION_POINTS = 30
+VALUE_POINTS = 15
+TIMELINE_POINTS = 15
+
+
+def score_relevance(
+    opportunity: Opportunity,
+    jurisdiction_code: Optional[str],
+    organization_naics: Sequence[str],
+    organization_jurisdictions: Sequence[str],
+    today: date
+) -> int:
+    """Relevance score (0-100) of one opportunity, given its jurisdiction code"""
+    score = 0
+
+    # NAICS code match
+    if opportunity.naics_codes:
+        if set(opportunity.naics_codes) & set(organization_naics):
+            score += NAICS_POINTS
+
+    # Jurisdiction match
+    if jurisdiction_code and jurisdiction_code in organization_jurisdictions:
+        score += JURISDICTION_POINTS
+
+    # Value range - prefer opportunities in sweet spot
+    if opportunity.total_value:
+        if 100000 <= opportunity.total_value <= 5000000:
+            score += VALUE_POINTS
+        elif opportunity.total_value < 100000:
+            score += 5
+
+    # Time until due - prefer opportunities with reasonable time
+    if opportunity.due_date:
+        days_until_due = (opportunity.due_date - today).days
+        if 14 <= days_until_due <= 60:
+            score += TIMELINE_POINTS
+        elif 7 <= days_until_due < 14 or 60 < days_until_due <= 90:
+            score += 8
+
+    return min(score, 100)
+
+
+def relevance_score_expression(
+    organization_naics: Sequence[str],
+    jurisdiction_ids: Sequence[UUID],
+    today: date
+):
+    """
+    score_relevance as a SQL expression over the opportunities table
+
+    jurisdiction_ids are the ids of the organization's jurisdiction codes, so
+    the jurisdiction match is a comparison on opportunities.jurisdiction_id.
+    Returns (score, naics_match, jurisdiction_match).
+    """
+    naics_match = Opportunity.naics_codes.overlap(list(organization_naics)) if organization_naics else false()
+    jurisdiction_match = Opportunity.jurisdiction_id.in_(list(jurisdiction_ids)) if jurisdiction_ids else false()
+    days_until_due = Opportunity.due_date - literal(today)
+
+    score = (
+        case((naics_match, NAICS_POINTS), else_=0)
+        + case((jurisdiction_match, JURISDICTION_POINTS), else_=0)
+        + case(
+            (Opportunity.total_value.between(100000, 5000000), VALUE_POINTS),
+            (and_(Opportunity.total_value < 100000, Opportunity.total_value != 0), 5),
+            else_=0
+        )
+        + case(
+            (days_until_due.between(14, 60), TIMELINE_POINTS),
+            (or_(days_until_due.between(7, 13), days_until_due.between(61, 90)), 8),
+            else_=0
+        )
+    )
+    return score, naics_match, jurisdiction_match
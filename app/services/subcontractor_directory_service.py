@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_, func, Boolean
@@ -8,6 +8,11 @@ from app.schemas.subcontractor_directory import (
     SubcontractorDirectoryUpdate,
     SubcontractorSearchFilters
 )
+from app.validation.impact import revalidate_impacted
+from app.services.team_builder_service import candidate_index
+
+# Directory fields the validation rules read
+VALIDATED_FIELDS = {'legal_name', 'certifications', 'jurisdiction_codes', 'naics_codes'}
 
 class SubcontractorDirectoryService:
     """Service for subcontractor directory operations"""
@@ -24,6 +29,10 @@ class SubcontractorDirectoryService:
         self.db.add(subcontractor)
         self.db.commit()
         self.db.refresh(subcontractor)
+        candidate_index.invalidate()
+
+        # Bids already naming this subcontractor now resolve to a directory entry
+        revalidate_impacted(self.db, legal_names=[subcontractor.legal_name])
         return subcontractor
     
     def get_subcontractor(
@@ -127,6 +136,8 @@ class SubcontractorDirectoryService:
         if not subcontractor:
             return None
         
+        previous_name = subcontractor.legal_name
+        
         update_dict = update_data.model_dump(exclude_unset=True)
         for key, value in update_dict.items():
             if hasattr(subcontractor, key):
@@ -134,6 +145,13 @@ class SubcontractorDirectoryService:
         
         self.db.commit()
         self.db.refresh(subcontractor)
+        candidate_index.invalidate()
+
+        if VALIDATED_FIELDS & update_dict.keys():
+            revalidate_impacted(
+                self.db,
+                legal_names=[previous_name, subcontractor.legal_name]
+            )
         return subcontractor
     
     def delete_subcontractor(self, subcontractor_id: UUID) -> bool:
@@ -143,8 +161,13 @@ class SubcontractorDirectoryService:
         if not subcontractor:
             return False
         
+        legal_name = subcontractor.legal_name
+        
         self.db.delete(subcontractor)
         self.db.commit()
+        candidate_index.invalidate()
+
+        revalidate_impacted(self.db, legal_names=[legal_name])
         return True
     
     def get_matching_subcontractors(
@@ -188,6 +211,104 @@ class SubcontractorDirectoryService:
 
         return query.all()
 
+    def get_matching_summary(
+        self,
+        naics_codes: List[str],
+        jurisdiction_code: str,
+        categories: Sequence[str] = ('mbe', 'vsbe'),
+        min_rating: float = 0.0,
+        top_k: int = 10,
+        top_category: Optional[str] = 'mbe'
+    ) -> Dict:
+        """
+        Per-category counts, the de-duplicated total and the best-rated rows in one query
+
+        Matches the same entries as get_matching_subcontractors for each category.
+        Counts come from window aggregates over every match, so only the top_k
+        rows (best rated in top_category, or in any category when it is None)
+        are transferred. Returns {"counts": {category: n}, "total": n, "top": [...]}.
+        """
+        categories = [c.lower() for c in categories]
+        summary = {"counts": {c: 0 for c in categories}, "total": 0, "top": []}
+
+        if not categories:
+            return summary
+
+        certified = {
+            c: SubcontractorDirectory.certifications[c].astext.cast(Boolean) == True
+            for c in categories
+        }
+
+        if top_category is not None:
+            top_category = top_category.lower()
+            if top_category not in certified:
+                top_category = None
+        # Entries without the key compare as NULL, which would sort first
+        in_top = func.coalesce(certified[top_category], False) if top_category else None
+
+        columns = [
+            func.count().over().label("total"),
+            *[func.count().filter(certified[c]).over().label(f"count_{c}") for c in categories]
+        ]
+        if in_top is not None:
+            columns.append(in_top.label("in_top"))
+
+        query = self.db.query(SubcontractorDirectory, *columns)
+
+        if naics_codes:
+            query = query.filter(SubcontractorDirectory.naics_codes.overlap(naics_codes))
+
+        query = query.filter(
+            SubcontractorDirectory.jurisdiction_codes.contains([jurisdiction_code]),
+            SubcontractorDirectory.rating >= min_rating,
+            or_(*certified.values())
+        )
+
+        order = [SubcontractorDirectory.rating.desc(), SubcontractorDirectory.id]
+        if in_top is not None:
+            order.insert(0, in_top.desc())
+
+        # At least one row is needed to read the window counts
+        rows = query.order_by(*order).limit(max(top_k, 1)).all()
+
+        if not rows:
+            return summary
+
+        first = rows[0]
+        summary["total"] = first.total
+        summary["counts"] = {c: getattr(first, f"count_{c}") for c in categories}
+        summary["top"] = [
+            row[0] for row in rows[:top_k]
+            if in_top is None or row.in_top
+        ]
+        return summary
+
+    def get_matching_version(
+        self,
+        naics_codes: List[str],
+        jurisdiction_code: str,
+        min_rating: float = 0.0
+    ) -> List:
+        """
+        [match count, latest updated_at] of the entries a matching query can return
+
+        Any insert, update or delete among the matching rows changes the result,
+        so it versions the directory supply of an opportunity.
+        """
+        query = self.db.query(
+            func.count(SubcontractorDirectory.id),
+            func.max(SubcontractorDirectory.updated_at)
+        )
+
+        if naics_codes:
+            query = query.filter(SubcontractorDirectory.naics_codes.overlap(naics_codes))
+
+        count, updated_at = query.filter(
+            SubcontractorDirectory.jurisdiction_codes.contains([jurisdiction_code]),
+            SubcontractorDirectory.rating >= min_rating
+        ).one()
+        return [count, updated_at.isoformat() if updated_at else None]
+
     def calculate_contractor_usage_count(self, subcontractor_id: UUID) -> int:
         """Calculate how many unique contractors have used this subcontractor"""
         from app.models import SubcontractorOutreach
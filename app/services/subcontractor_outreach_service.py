@@ -1,11 +1,18 @@
 from typing import List, Optional
 from uuid import UUID
+from sqlalchemy import func
 from sqlalchemy.orm import Session, joinedload
 from app.models import SubcontractorOutreach, SubcontractorDirectory, Opportunity
 from app.schemas.subcontractor_outreach import (
     SubcontractorOutreachCreate,
     SubcontractorOutreachUpdate
 )
+from app.services.summary_rollups import (
+    ORGANIZATION_SCOPE,
+    OPPORTUNITY_SCOPE,
+    outreach_rollup,
+    record_outreach
+)
 
 class SubcontractorOutreachService:
     """Service for subcontractor outreach tracking"""
@@ -20,6 +27,7 @@ class SubcontractorOutreachService:
         """Create a new outreach record"""
         outreach = SubcontractorOutreach(**outreach_data.model_dump())
         self.db.add(outreach)
+        record_outreach(self.db, outreach.organization_id, outreach.opportunity_id, outreach.status)
         self.db.commit()
         self.db.refresh(outreach)
 
@@ -30,8 +38,6 @@ class SubcontractorOutreachService:
 
     def _update_subcontractor_usage_count(self, subcontractor_id: UUID) -> None:
         """Update the contractor usage count for a subcontractor after outreach changes"""
-        from sqlalchemy import func
-
         # Calculate unique contractor count
         count = self.db.query(func.count(func.distinct(SubcontractorOutreach.organization_id)))\
             .filter(SubcontractorOutreach.subcontractor_id == subcontractor_id)\
@@ -99,10 +105,16 @@ class SubcontractorOutreachService:
         if not outreach:
             return None
         
+        previous_status = outreach.status
+
         update_dict = update_data.model_dump(exclude_unset=True)
         for key, value in update_dict.items():
             if hasattr(outreach, key):
                 setattr(outreach, key, value)
+
+        if outreach.status != previous_status:
+            record_outreach(self.db, outreach.organization_id, outreach.opportunity_id, previous_status, sign=-1)
+            record_outreach(self.db, outreach.organization_id, outreach.opportunity_id, outreach.status)
         
         self.db.commit()
         self.db.refresh(outreach)
@@ -118,6 +130,7 @@ class SubcontractorOutreachService:
         subcontractor_id = outreach.subcontractor_id
 
         self.db.delete(outreach)
+        record_outreach(self.db, outreach.organization_id, outreach.opportunity_id, outreach.status, sign=-1)
         self.db.commit()
 
         # Update contractor usage count after deletion
@@ -130,26 +143,44 @@ class SubcontractorOutreachService:
         organization_id: Optional[UUID] = None,
         opportunity_id: Optional[UUID] = None
     ) -> dict:
-        """Get statistics about outreach efforts"""
-        query = self.db.query(SubcontractorOutreach)
+        """
+        Get statistics about outreach efforts
 
-        if organization_id:
-            query = query.filter(SubcontractorOutreach.organization_id == organization_id)
+        For one organization or one opportunity the rollup row is read when
+        SUMMARY_ROLLUPS is on; otherwise statuses are counted in one aggregate query.
+        """
+        counts = None
+        if organization_id and not opportunity_id:
+            counts = outreach_rollup(self.db, ORGANIZATION_SCOPE, organization_id)
+        elif opportunity_id and not organization_id:
+            counts = outreach_rollup(self.db, OPPORTUNITY_SCOPE, opportunity_id)
+
+        if counts is None:
+            status = SubcontractorOutreach.status
+            query = self.db.query(
+                func.count(SubcontractorOutreach.id).label("total"),
+                func.count(SubcontractorOutreach.id).filter(status == 'CONTACTED').label("contacted"),
+                func.count(SubcontractorOutreach.id).filter(status == 'RESPONDED').label("responded"),
+                func.count(SubcontractorOutreach.id).filter(status == 'COMMITTED').label("committed"),
+                func.count(SubcontractorOutreach.id).filter(status == 'DECLINED').label("declined")
+            )
 
-        if opportunity_id:
-            query = query.filter(SubcontractorOutreach.opportunity_id == opportunity_id)
+            if organization_id:
+                query = query.filter(SubcontractorOutreach.organization_id == organization_id)
+
+            if opportunity_id:
+                query = query.filter(SubcontractorOutreach.opportunity_id == opportunity_id)
 
-        all_outreach = query.all()
+            counts = query.one()
 
-        total = len(all_outreach)
-        contacted = sum(1 for o in all_outreach if o.status == 'CONTACTED')
-        responded = sum(1 for o in all_outreach if o.status == 'RESPONDED')
-        committed = sum(1 for o in all_outreach if o.status == 'COMMITTED')
-        declined = sum(1 for o in all_outreach if o.status == 'DECLINED')
+        total = counts.total
+        responded = counts.responded
+        committed = counts.committed
+        declined = counts.declined
 
         return {
             "total_outreach": total,
-            "contacted": contacted,
+            "contacted": counts.contacted,
             "responded": responded,
             "committed": committed,
             "declined": declined,
@@ -207,6 +238,7 @@ class SubcontractorOutreachService:
             )
 
             self.db.add(outreach)
+            record_outreach(self.db, organization_id, opportunity_id, initial_status)
             outreach_records.append(outreach)
 
         self.db.commit()
@@ -1,9 +1,12 @@
-from typing import List, Optional
+from decimal import Decimal
+from typing import Dict, List, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import or_
-from app.models import Subcontractor, Certification
+from app.config import settings
+from app.models import Subcontractor, Certification, SubcontractorCommitment
 from app.schemas.subcontractor import SubcontractorCreate
+from app.services.network_capacity_index import network_index
 
 class SubcontractorService:
     """Service for subcontractor operations"""
@@ -17,6 +20,7 @@ class SubcontractorService:
         self.db.add(subcontractor)
         self.db.commit()
         self.db.refresh(subcontractor)
+        network_index.refresh_member(self.db, subcontractor.id)
         return subcontractor
     
     def get_subcontractor(self, subcontractor_id: UUID) -> Optional[Subcontractor]:
@@ -53,6 +57,61 @@ class SubcontractorService:
         
         return db_query.all()
     
+    def get_overcommitted(
+        self,
+        organization_id: Optional[UUID] = None,
+        max_bids: Optional[int] = None,
+        max_value: Optional[Decimal] = None
+    ) -> List[Dict]:
+        """
+        Subcontractors over the cross-bid commitment limits, most bids first
+
+        Reads the subcontractor_commitments counters kept by BidService; limits
+        default to OVERCOMMIT_MAX_BIDS and OVERCOMMIT_MAX_VALUE (0 = no limit).
+        """
+        if max_bids is None:
+            max_bids = settings.OVERCOMMIT_MAX_BIDS
+        if max_value is None:
+            max_value = Decimal(str(settings.OVERCOMMIT_MAX_VALUE))
+
+        conditions = []
+        if max_bids:
+            conditions.append(SubcontractorCommitment.bid_count > max_bids)
+        if max_value:
+            conditions.append(SubcontractorCommitment.committed_value > max_value)
+        if not conditions:
+            return []
+
+        query = self.db.query(
+            SubcontractorCommitment,
+            Subcontractor.legal_name,
+            Subcontractor.organization_id
+        ).join(
+            Subcontractor, Subcontractor.id == SubcontractorCommitment.subcontractor_id
+        ).filter(or_(*conditions))
+
+        if organization_id:
+            query = query.filter(Subcontractor.organization_id == organization_id)
+
+        rows = query.order_by(
+            SubcontractorCommitment.bid_count.desc(),
+            SubcontractorCommitment.committed_value.desc()
+        ).all()
+
+        return [
+            {
+                "subcontractor_id": commitment.subcontractor_id,
+                "legal_name": legal_name,
+                "organization_id": org_id,
+                "bid_count": commitment.bid_count,
+                "line_count": commitment.line_count,
+                "committed_value": commitment.committed_value,
+                "over_bid_limit": bool(max_bids) and commitment.bid_count > max_bids,
+                "over_value_limit": bool(max_value) and commitment.committed_value > max_value
+            }
+            for commitment, legal_name, org_id in rows
+        ]
+
     def get_all_subcontractors(self, organization_id: Optional[UUID] = None) -> List[Subcontractor]:
         """Get all subcontractors"""
         query = self.db.query(Subcontractor).options(
@@ -83,6 +142,7 @@ class SubcontractorService:
         
         self.db.commit()
         self.db.refresh(subcontractor)
+        network_index.refresh_member(self.db, subcontractor.id)
         return subcontractor
     
     def delete_subcontractor(self, subcontractor_id: UUID) -> bool:
@@ -96,4 +156,5 @@ class SubcontractorService:
         
         self.db.delete(subcontractor)
         self.db.commit()
+        network_index.remove_member(subcontractor_id)
         return True
\ No newline at end of file
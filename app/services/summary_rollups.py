@@ -0,0 +1,95 @@
+"""
+Incremental rollups behind the assessment and outreach summaries
+
+With SUMMARY_ROLLUPS on, every path that creates, changes or deletes an
+assessment or outreach record also applies its delta to assessment_rollups or
+outreach_rollups in the same transaction, and the summary endpoints read one
+row. With it off nothing is written here and the summaries are aggregated in
+SQL on each call.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import AssessmentRollup, OutreachRollup
+
+ORGANIZATION_SCOPE = "organization"
+OPPORTUNITY_SCOPE = "opportunity"
+
+RECOMMENDATION_COLUMNS = {"BID": "bid_count", "CAUTION": "caution_count", "NO_BID": "no_bid_count"}
+STATUS_COLUMNS = {"CONTACTED": "contacted", "RESPONDED": "responded", "COMMITTED": "committed", "DECLINED": "declined"}
+
+
+def _increment(db: Session, model, keys: Dict, deltas: Dict[str, int]) -> None:
+    """Add deltas to the row with these keys, creating it if needed; applied in SQL"""
+    table = model.__table__
+    now = datetime.utcnow()
+    statement = pg_insert(table).values(
+        **keys,
+        **{column: max(delta, 0) for column, delta in deltas.items()},
+        updated_at=now
+    )
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c[key] for key in keys],
+        set_={
+            **{column: table.c[column] + delta for column, delta in deltas.items()},
+            "updated_at": statement.excluded.updated_at
+        }
+    )
+    db.execute(statement)
+
+
+def record_assessment(
+    db: Session,
+    organization_id: Optional[UUID],
+    recommendation: Optional[str],
+    risk_score: Optional[int],
+    sign: int = 1
+) -> None:
+    """Count one added (sign=1) or removed (sign=-1) assessment; call before commit"""
+    if not settings.SUMMARY_ROLLUPS or organization_id is None:
+        return
+
+    deltas = {"total": sign, "risk_score_sum": sign * (risk_score or 0)}
+    if recommendation in RECOMMENDATION_COLUMNS:
+        deltas[RECOMMENDATION_COLUMNS[recommendation]] = sign
+
+    _increment(db, AssessmentRollup, {"organization_id": organization_id}, deltas)
+
+
+def record_outreach(
+    db: Session,
+    organization_id: Optional[UUID],
+    opportunity_id: Optional[UUID],
+    status: Optional[str],
+    sign: int = 1
+) -> None:
+    """Count one added (sign=1) or removed (sign=-1) outreach record; call before commit"""
+    if not settings.SUMMARY_ROLLUPS:
+        return
+
+    deltas = {"total": sign}
+    if status in STATUS_COLUMNS:
+        deltas[STATUS_COLUMNS[status]] = sign
+
+    for scope, scope_id in ((ORGANIZATION_SCOPE, organization_id), (OPPORTUNITY_SCOPE, opportunity_id)):
+        if scope_id is not None:
+            _increment(db, OutreachRollup, {"scope": scope, "scope_id": scope_id}, deltas)
+
+
+def assessment_rollup(db: Session, organization_id: UUID) -> Optional[AssessmentRollup]:
+    """The organization's rollup row, None if rollups are off or it has no assessments"""
+    if not settings.SUMMARY_ROLLUPS:
+        return None
+    return db.get(AssessmentRollup, organization_id)
+
+
+def outreach_rollup(db: Session, scope: str, scope_id: UUID) -> Optional[OutreachRollup]:
+    """The rollup row for an organization or opportunity, None if rollups are off or it has no outreach"""
+    if not settings.SUMMARY_ROLLUPS:
+        return None
+    return db.get(OutreachRollup, (scope, scope_id))
@@ -0,0 +1,446 @@
+"""
+Team builder for opportunities
+
+Selects a small set of directory subcontractors that together cover every NAICS
+code an opportunity lists and every certification it sets a goal for. The
+directory is read through DirectoryCandidateIndex, an in-process index of
+compact candidate records per jurisdiction with inverted lists by NAICS code
+and certification, so building teams never hydrates ORM objects.
+
+Teams are found with a greedy set cover (most uncovered requirements first,
+then rating) followed by a pass that drops members the rest of the team
+already covers. Alternative teams come from re-running the cover with members
+of the better teams excluded.
+
+Each team's goal amounts are then allocated to its certified members, spread
+evenly but capped by what each member can still take on: OVERCOMMIT_MAX_VALUE,
+the limit the overcommitment validation rule applies, less the value its firm
+is already committed to on other bids. A member certified for several
+categories counts toward each of them. While a goal is short and the team has
+room, certified candidates with capacity left are added. Teams that still
+cannot absorb the goal amounts are reported with reaches_goals false and
+ranked after those that can.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_CEILING
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import settings
+from app.models import Opportunity, Subcontractor, SubcontractorCommitment, SubcontractorDirectory
+
+# Certifications an opportunity can set a goal for
+GOAL_CATEGORIES = ('mbe', 'vsbe')
+
+CANDIDATES_PER_REQUIREMENT = 25  # best-rated candidates considered for each requirement
+
+
+@dataclass(frozen=True)
+class TeamCandidate:
+    id: UUID
+    legal_name: str
+    naics_codes: FrozenSet[str]
+    certifications: FrozenSet[str]  # lower-case keys flagged true
+    rating: float
+    projects_completed: int
+
+
+@dataclass(frozen=True)
+class JurisdictionCandidates:
+    """Directory entries of one jurisdiction, best rated first, with inverted lists"""
+    candidates: Tuple[TeamCandidate, ...]
+    by_naics: Dict[str, Tuple[int, ...]]
+    by_certification: Dict[str, Tuple[int, ...]]
+
+    @classmethod
+    def build(cls, candidates: Sequence[TeamCandidate]) -> "JurisdictionCandidates":
+        ordered = tuple(sorted(candidates, key=lambda c: (-c.rating, -c.projects_completed, str(c.id))))
+        by_naics: Dict[str, List[int]] = {}
+        by_certification: Dict[str, List[int]] = {}
+        for index, candidate in enumerate(ordered):
+            for code in candidate.naics_codes:
+                by_naics.setdefault(code, []).append(index)
+            for category in candidate.certifications:
+                by_certification.setdefault(category, []).append(index)
+        return cls(
+            candidates=ordered,
+            by_naics={k: tuple(v) for k, v in by_naics.items()},
+            by_certification={k: tuple(v) for k, v in by_certification.items()}
+        )
+
+
+class DirectoryCandidateIndex:
+    """
+    Per-jurisdiction candidate index, built on first use and cached
+
+    Entries expire after TEAM_INDEX_TTL_SECONDS; SubcontractorDirectoryService
+    invalidates the index on every directory write in this process.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, JurisdictionCandidates]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, jurisdiction_code: str) -> JurisdictionCandidates:
+        now = time.monotonic()
+        cached = self._entries.get(jurisdiction_code)
+        if cached and now - cached[0] < settings.TEAM_INDEX_TTL_SECONDS:
+            return cached[1]
+
+        rows = db.query(
+            SubcontractorDirectory.id,
+            SubcontractorDirectory.legal_name,
+            SubcontractorDirectory.certifications,
+            SubcontractorDirectory.naics_codes,
+            SubcontractorDirectory.rating,
+            SubcontractorDirectory.projects_completed
+        ).filter(
+            SubcontractorDirectory.jurisdiction_codes.contains([jurisdiction_code])
+        ).all()
+
+        index = JurisdictionCandidates.build([
+            TeamCandidate(
+                id=row.id,
+                legal_name=row.legal_name,
+                naics_codes=frozenset(row.naics_codes or ()),
+                certifications=frozenset(
+                    str(key).lower() for key, value in (row.certifications or {}).items() if value
+                ),
+                rating=float(row.rating or 0),
+                projects_completed=row.projects_completed or 0
+            )
+            for row in rows
+        ])
+
+        with self._lock:
+            self._entries[jurisdiction_code] = (now, index)
+        return index
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+candidate_index = DirectoryCandidateIndex()
+
+
+Requirement = Tuple[str, str]  # ("naics", code) or ("certification", category)
+
+
+def _covers(candidate: TeamCandidate, requirement: Requirement) -> bool:
+    kind, value = requirement
+    if kind == 'naics':
+        return value in candidate.naics_codes
+    return value in candidate.certifications
+
+
+def _cover(
+    pool: Sequence[TeamCandidate],
+    requirements: FrozenSet[Requirement],
+    max_size: int,
+    excluded: FrozenSet[UUID]
+) -> List[TeamCandidate]:
+    """Greedy set cover, then drop members whose requirements the others cover"""
+    team: List[TeamCandidate] = []
+    uncovered = set(requirements)
+
+    while uncovered and len(team) < max_size:
+        best = None
+        best_key = None
+        for candidate in pool:
+            if candidate.id in excluded or candidate in team:
+                continue
+            gained = sum(1 for r in uncovered if _covers(candidate, r))
+            if not gained:
+                continue
+            key = (gained, candidate.rating, candidate.projects_completed)
+            if best_key is None or key > best_key:
+                best, best_key = candidate, key
+        if best is None:
+            break
+        team.append(best)
+        uncovered = {r for r in uncovered if not _covers(best, r)}
+
+    # Redundancy pass, weakest members first
+    for member in sorted(team, key=lambda c: (c.rating, c.projects_completed)):
+        others = [c for c in team if c is not member]
+        covered = {r for r in requirements if any(_covers(c, r) for c in others)}
+        if all(r in covered for r in requirements if _covers(member, r)):
+            team = others
+
+    return team
+
+
+def _allocate(
+    team: Sequence[TeamCandidate],
+    goal_amounts: Dict[str, Decimal],
+    capacity: Dict[UUID, Decimal],
+    budget: Decimal
+) -> Dict[UUID, int]:
+    """
+    Whole-dollar value per member that meets the goal amounts within capacity
+
+    Goals are filled in order, each starting from what the members certified
+    for it already hold. The rest is spread evenly over those with capacity left,
+    repeatedly, until the goal is met or nobody can take more. The team as a
+    whole never gets more than budget. Members missing from capacity are unlimited.
+    """
+    allocation: Dict[UUID, int] = {c.id: 0 for c in team}
+    budget_left = int(budget)
+
+    for category, amount in goal_amounts.items():
+        holders = [c for c in team if category in c.certifications]
+        remaining = int(amount.to_integral_value(rounding=ROUND_CEILING)) - sum(allocation[c.id] for c in holders)
+
+        while remaining > 0 and budget_left > 0:
+            open_holders = [
+                c for c in holders
+                if c.id not in capacity or allocation[c.id] < int(capacity[c.id])
+            ]
+            if not open_holders:
+                break
+            share = -(-remaining // len(open_holders))
+            for holder in open_holders:
+                give = min(share, remaining, budget_left)
+                if holder.id in capacity:
+                    give = min(give, int(capacity[holder.id]) - allocation[holder.id])
+                allocation[holder.id] += give
+                remaining -= give
+                budget_left -= give
+
+    return allocation
+
+
+def _allocated(team: Sequence[TeamCandidate], allocation: Dict[UUID, int], category: str) -> int:
+    return sum(allocation[c.id] for c in team if category in c.certifications)
+
+
+def _short(team: Sequence[TeamCandidate], allocation: Dict[UUID, int], goal_amounts: Dict[str, Decimal]) -> Set[str]:
+    """Goal categories the allocation does not reach"""
+    return {c for c, amount in goal_amounts.items() if _allocated(team, allocation, c) < amount}
+
+
+def _fill(
+    team: List[TeamCandidate],
+    pool: Sequence[TeamCandidate],
+    goal_amounts: Dict[str, Decimal],
+    capacity: Dict[UUID, Decimal],
+    budget: Decimal,
+    max_size: int,
+    excluded: FrozenSet[UUID]
+) -> Tuple[List[TeamCandidate], Dict[UUID, int]]:
+    """
+    Allocate the goal amounts, adding members while a goal is short and the team has room
+
+    Each addition is the candidate certified for the most short categories, then
+    with the most capacity left, then best rated.
+    """
+    allocation = _allocate(team, goal_amounts, capacity, budget)
+    short = _short(team, allocation, goal_amounts)
+
+    while short and len(team) < max_size:
+        best = None
+        best_key = None
+        for candidate in pool:
+            if candidate.id in excluded or candidate in team:
+                continue
+            gained = len(short & candidate.certifications)
+            room = capacity.get(candidate.id)
+            if not gained or room == 0:
+                continue
+            key = (gained, room is None, room or 0, candidate.rating, candidate.projects_completed)
+            if best_key is None or key > best_key:
+                best, best_key = candidate, key
+        if best is None:
+            break
+        team = team + [best]
+        allocation = _allocate(team, goal_amounts, capacity, budget)
+        short = _short(team, allocation, goal_amounts)
+
+    return team, allocation
+
+
+class TeamBuilderService:
+    """Assemble small subcontractor teams that meet an opportunity's requirements"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def build_teams(
+        self,
+        opportunity_id: UUID,
+        max_team_size: int = 5,
+        alternatives: int = 3,
+        min_rating: float = 0.0
+    ) -> Optional[Dict]:
+        """Ranked alternative teams for an opportunity, None if it does not exist"""
+        opportunity = self.db.query(Opportunity).options(
+            joinedload(Opportunity.jurisdiction)
+        ).filter(Opportunity.id == opportunity_id).first()
+
+        if not opportunity:
+            return None
+
+        jurisdiction_code = opportunity.jurisdiction.code if opportunity.jurisdiction else None
+        total_value = opportunity.total_value or Decimal('0')
+        goals = {
+            'mbe': opportunity.mbe_goal or Decimal('0'),
+            'vsbe': opportunity.vsbe_goal or Decimal('0'),
+        }
+
+        requirements = frozenset(
+            [('naics', code) for code in (opportunity.naics_codes or [])] +
+            [('certification', category) for category in GOAL_CATEGORIES if goals[category] > 0]
+        )
+
+        goal_amounts = {c: (total_value * goals[c] / 100) for c in GOAL_CATEGORIES if goals[c] > 0}
+
+        pool: List[TeamCandidate] = []
+        if jurisdiction_code and requirements:
+            index = candidate_index.get(self.db, jurisdiction_code)
+            pool = self._pool(index, requirements, min_rating)
+        capacity = self._capacity(pool)
+
+        # End the read transaction - the rest runs on the in-memory index
+        self.db.rollback()
+
+        teams = self._alternatives(
+            pool, requirements, max_team_size, alternatives, goal_amounts, capacity, total_value
+        )
+
+        return {
+            "opportunity_id": opportunity.id,
+            "jurisdiction_code": jurisdiction_code,
+            "requirements": sorted(f"{kind}:{value}" for kind, value in requirements),
+            "candidates_considered": len(pool),
+            "teams": [
+                self._describe(team, allocation, requirements, goal_amounts, capacity)
+                for team, allocation in teams
+            ]
+        }
+
+    def _capacity(self, pool: Sequence[TeamCandidate]) -> Dict[UUID, Decimal]:
+        """
+        Value each candidate can still take on under OVERCOMMIT_MAX_VALUE
+
+        Commitments are kept per organization subcontractor, which is linked to a
+        directory entry by legal name, so a firm's commitment is the sum over
+        every organization that has it. Empty when no value limit is configured.
+        """
+        limit = Decimal(str(settings.OVERCOMMIT_MAX_VALUE))
+        if not limit or not pool:
+            return {}
+
+        rows = self.db.query(
+            Subcontractor.legal_name,
+            func.sum(SubcontractorCommitment.committed_value)
+        ).join(
+            SubcontractorCommitment, SubcontractorCommitment.subcontractor_id == Subcontractor.id
+        ).filter(
+            Subcontractor.legal_name.in_(sorted({c.legal_name for c in pool}))
+        ).group_by(Subcontractor.legal_name).all()
+        committed = {name: value or Decimal('0') for name, value in rows}
+
+        return {
+            c.id: max(Decimal('0'), limit - committed.get(c.legal_name, Decimal('0')))
+            for c in pool
+        }
+
+    def _pool(
+        self,
+        index: JurisdictionCandidates,
+        requirements: FrozenSet[Requirement],
+        min_rating: float
+    ) -> List[TeamCandidate]:
+        """Best-rated candidates for each requirement, from the inverted lists"""
+        positions: Set[int] = set()
+        for kind, value in requirements:
+            postings = index.by_naics.get(value, ()) if kind == 'naics' else index.by_certification.get(value, ())
+            taken = 0
+            for position in postings:
+                if index.candidates[position].rating < min_rating:
+                    continue
+                positions.add(position)
+                taken += 1
+                if taken >= CANDIDATES_PER_REQUIREMENT:
+                    break
+        return [index.candidates[p] for p in sorted(positions)]
+
+    def _alternatives(
+        self,
+        pool: Sequence[TeamCandidate],
+        requirements: FrozenSet[Requirement],
+        max_size: int,
+        count: int,
+        goal_amounts: Dict[str, Decimal],
+        capacity: Dict[UUID, Decimal],
+        budget: Decimal
+    ) -> List[Tuple[List[TeamCandidate], Dict[UUID, int]]]:
+        """(team, allocation) pairs, best first"""
+        if not pool:
+            return []
+
+        def rank(entry: Tuple[List[TeamCandidate], Dict[UUID, int]]):
+            team, allocation = entry
+            uncovered = sum(1 for r in requirements if not any(_covers(c, r) for c in team))
+            short = bool(_short(team, allocation, goal_amounts))
+            mean_rating = sum(c.rating for c in team) / len(team)
+            return (uncovered, short, len(team), -mean_rating)
+
+        seen: Set[FrozenSet[UUID]] = set()
+        teams: List[Tuple[List[TeamCandidate], Dict[UUID, int]]] = []
+        queue: List[FrozenSet[UUID]] = [frozenset()]
+
+        # Each team spawns variants that exclude one of its members
+        while queue and len(teams) < count * 3:
+            excluded = queue.pop(0)
+            team = _cover(pool, requirements, max_size, excluded)
+            if not team:
+                continue
+            team, allocation = _fill(team, pool, goal_amounts, capacity, budget, max_size, excluded)
+            key = frozenset(c.id for c in team)
+            if key in seen:
+                continue
+            seen.add(key)
+            teams.append((team, allocation))
+            queue.extend(excluded | {member.id} for member in team)
+
+        teams.sort(key=rank)
+        return teams[:count]
+
+    def _describe(
+        self,
+        team: List[TeamCandidate],
+        allocation: Dict[UUID, int],
+        requirements: FrozenSet[Requirement],
+        goal_amounts: Dict[str, Decimal],
+        capacity: Dict[UUID, Decimal]
+    ) -> Dict:
+        covered = {r for r in requirements if any(_covers(c, r) for c in team)}
+        allocated = {c: _allocated(team, allocation, c) for c in goal_amounts}
+
+        return {
+            "members": [
+                {
+                    "directory_id": c.id,
+                    "legal_name": c.legal_name,
+                    "rating": c.rating,
+                    "certifications": sorted(x.upper() for x in c.certifications),
+                    "covers": sorted(f"{kind}:{value}" for kind, value in requirements if _covers(c, (kind, value))),
+                    "suggested_value": Decimal(allocation[c.id]) if allocation[c.id] else None,
+                    "capacity": capacity.get(c.id)
+                }
+                for c in team
+            ],
+            "covers_all": covered == requirements,
+            "missing": sorted(f"{kind}:{value}" for kind, value in requirements - covered),
+            "mean_rating": round(sum(c.rating for c in team) / len(team), 2),
+            "goal_amounts": {c.upper(): amount.quantize(Decimal('0.01')) for c, amount in goal_amounts.items()},
+            "allocated": {c.upper(): Decimal(value) for c, value in allocated.items()},
+            "reaches_goals": all(allocated[c] >= amount for c, amount in goal_amounts.items())
+        }
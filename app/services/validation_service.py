@@ -1,9 +1,21 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from sqlalchemy.orm import Session
-from app.models import ValidationResult
+from sqlalchemy.orm import Session, selectinload
+from app.models import ValidationResult, ValidationRun
 from app.validation import ValidationEngine
-from app.schemas.validation import ValidationResponse
+from app.validation.engine import MODE_FULL, overall_status
+from app.validation.bulk import BulkRevalidator
+from app.validation.optimizer import load_addition_candidates, optimize_goals, unmet_categories
+from app.validation.trace import TraceCollector
+from app.config import settings
+from app.schemas.validation import (
+    ValidationResponse,
+    WhatIfValidationRequest,
+    BulkRevalidationRequest,
+    BulkRevalidationResponse,
+    GoalOptimizationRequest,
+    GoalOptimizationResponse
+)
 
 class ValidationService:
     """Service for validation operations"""
@@ -12,38 +24,141 @@ class ValidationService:
         self.db = db
         self.engine = ValidationEngine(db)
     
-    def validate_bid(self, bid_id: UUID) -> ValidationResponse:
-        """Validate a bid and return results"""
+    def validate_bid(
+        self,
+        bid_id: UUID,
+        use_cache: bool = True,
+        mode: str = MODE_FULL,
+        trace: bool = False
+    ) -> ValidationResponse:
+        """Validate a bid and return results (served from the cache when inputs are unchanged)"""
         
         # Run validation
-        results = self.engine.validate_bid(bid_id)
-        
-        # Calculate statistics
-        total = len(results)
-        passed = sum(1 for r in results if r.status == "PASS")
-        failed = sum(1 for r in results if r.status == "FAIL")
-        warnings = sum(1 for r in results if r.status == "WARNING")
-        
-        # Determine overall status
-        if failed > 0:
-            overall_status = "FAIL"
-        elif warnings > 0:
-            overall_status = "WARNING"
-        else:
-            overall_status = "PASS"
+        if trace:
+            collector = TraceCollector()
+            run = self.engine.validate_bid(bid_id, use_cache=use_cache, mode=mode, trace=collector)
+            response = self._build_response(run)
+            response.trace = collector.rules
+            return response
+
+        run = self.engine.validate_bid(bid_id, use_cache=use_cache, mode=mode)
         
+        return self._build_response(run)
+
+    def validate_what_if(self, request: WhatIfValidationRequest) -> ValidationResponse:
+        """Validate a proposed bid composition without writing anything"""
+        results = self.engine.validate_draft(request.bid, request.subcontractors)
+        statuses = [r.status for r in results]
+
         return ValidationResponse(
-            bid_id=bid_id,
-            overall_status=overall_status,
-            total_validations=total,
-            passed=passed,
-            failed=failed,
-            warnings=warnings,
+            bid_id=None,
+            overall_status=overall_status(statuses),
+            total_validations=len(results),
+            passed=statuses.count("PASS"),
+            failed=statuses.count("FAIL"),
+            warnings=statuses.count("WARNING"),
             validations=results
         )
+
+    def revalidate_bids(self, request: BulkRevalidationRequest) -> BulkRevalidationResponse:
+        """Revalidate many bids at once, in parallel worker processes"""
+        revalidator = BulkRevalidator(self.db, workers=settings.VALIDATION_WORKERS)
+        report = revalidator.revalidate(
+            bid_ids=request.bid_ids,
+            organization_id=request.organization_id,
+            force=request.force
+        )
+
+        return BulkRevalidationResponse(
+            total=report.total,
+            revalidated=report.revalidated,
+            unchanged=report.unchanged,
+            results_written=report.results_written,
+            elapsed_seconds=round(report.elapsed_seconds, 3),
+            bids_per_second=round(report.bids_per_second, 1)
+        )
+
+    def optimize_goals(self, bid_id: UUID, request: GoalOptimizationRequest) -> GoalOptimizationResponse:
+        """Suggest the fewest changes that bring a bid up to its participation goals"""
+        context = self.engine.load_context(bid_id)
+
+        candidates = []
+        if request.allow_additions:
+            candidates = load_addition_candidates(
+                self.db, context, unmet_categories(context, request.categories)
+            )
+
+        # The context is plain data, so end the read transaction before solving
+        self.db.rollback()
+
+        plan = optimize_goals(
+            context,
+            candidates,
+            categories=request.categories,
+            allow_additions=request.allow_additions
+        )
+
+        return GoalOptimizationResponse(
+            bid_id=bid_id,
+            satisfied=plan.satisfied,
+            proven_minimal=plan.proven_minimal,
+            goals=plan.goals,
+            changes=plan.changes
+        )
+
+    def _build_response(self, run: ValidationRun) -> ValidationResponse:
+        """Build the API response from a run and its results"""
+        return ValidationResponse(
+            bid_id=run.bid_id,
+            run_id=run.id,
+            overall_status=run.overall_status,
+            total_validations=run.total_validations,
+            passed=run.passed,
+            failed=run.failed,
+            warnings=run.warnings,
+            cached=run.cache_hit,
+            mode=run.mode,
+            validations=run.results
+        )
+
+    def get_validation_runs(self, bid_id: UUID, skip: int = 0, limit: int = 20) -> List[ValidationRun]:
+        """Get run history for a bid, newest first"""
+        return self.db.query(ValidationRun).filter(
+            ValidationRun.bid_id == bid_id
+        ).order_by(ValidationRun.created_at.desc()).offset(skip).limit(limit).all()
+
+    def _get_run(self, bid_id: UUID, run_id: Optional[UUID] = None) -> Optional[ValidationRun]:
+        """Load one run with its results - the latest run when run_id is not given"""
+        query = self.db.query(ValidationRun).options(
+            selectinload(ValidationRun.results)
+        ).filter(ValidationRun.bid_id == bid_id)
+
+        if run_id:
+            return query.filter(ValidationRun.id == run_id).first()
+
+        return query.order_by(ValidationRun.created_at.desc()).first()
+
+    def get_validation_run(self, bid_id: UUID, run_id: Optional[UUID] = None) -> Optional[ValidationResponse]:
+        """Get a run with its results as an API response"""
+        run = self._get_run(bid_id, run_id)
+
+        if not run:
+            return None
+
+        return self._build_response(run)
     
-    def get_validation_results(self, bid_id: UUID) -> List[ValidationResult]:
-        """Get validation results for a bid"""
+    def get_validation_results(self, bid_id: UUID, run_id: Optional[UUID] = None) -> List[ValidationResult]:
+        """Get validation results for a bid from the given run, or the latest run"""
+        run = self._get_run(bid_id, run_id)
+
+        if run:
+            return run.results
+
+        if run_id:
+            return []
+
+        # Results written before run history existed
         return self.db.query(ValidationResult).filter(
-            ValidationResult.bid_id == bid_id
-        ).order_by(ValidationResult.created_at.desc()).all()
\ No newline at end of file
+            ValidationResult.bid_id == bid_id,
+            ValidationResult.run_id.is_(None)
+        ).order_by(ValidationResult.created_at.desc()).all()
@@ -1,4 +1,5 @@
 from app.validation.engine import ValidationEngine
 from app.validation.rules import ALL_RULES
+from app.validation.registry import RuleRegistry, registry
 
-__all__ = ["ValidationEngine", "ALL_RULES"]
\ No newline at end of file
+__all__ = ["ValidationEngine", "ALL_RULES", "RuleRegistry", "registry"]
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Bulk revalidation of many bids
+
+Contexts are loaded in batches with the same five set-based queries used for a
+single bid, then evaluated in a process pool. Contexts are frozen dataclasses of
+plain values, so they pickle cheaply and workers never touch the database.
+Results are written back with one executemany INSERT per table per batch.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import Bid, ValidationResult, ValidationRun
+from app.validation.context import BidValidationContext, load_bid_contexts
+from app.validation.engine import evaluate_context, plan_run
+from app.validation.registry import RuleRegistry, registry
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500       # bids loaded, evaluated and written per batch
+POOL_MIN_BIDS = 200    # below this, starting worker processes costs more than it saves
+
+
+@dataclass
+class BulkRevalidationReport:
+    total: int = 0
+    revalidated: int = 0
+    unchanged: int = 0          # skipped: input fingerprint matches the latest run
+    results_written: int = 0    # result rows inserted (unchanged outcomes reuse earlier rows)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def bids_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0.0
+        return self.total / self.elapsed_seconds
+
+
+def _evaluate_batch(
+    contexts: List[BidValidationContext],
+    rule_registry: RuleRegistry
+) -> List[Tuple[UUID, List[Dict]]]:
+    """Worker entry point: run the applicable rules for each context"""
+    return [(context.bid_id, evaluate_context(context, rule_registry)) for context in contexts]
+
+
+def _split(items: List, parts: int) -> List[List]:
+    size = max(1, -(-len(items) // parts))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class BulkRevalidator:
+    """Revalidate a set of bids in batches, in parallel across processes"""
+
+    def __init__(
+        self,
+        db: Session,
+        workers: Optional[int] = None,
+        rule_registry: Optional[RuleRegistry] = None
+    ):
+        self.db = db
+        self.registry = rule_registry or registry
+        self.workers = workers or os.cpu_count() or 1
+
+    def select_bid_ids(self, organization_id: Optional[UUID] = None) -> List[UUID]:
+        query = self.db.query(Bid.id)
+
+        if organization_id:
+            query = query.filter(Bid.organization_id == organization_id)
+
+        return [bid_id for (bid_id,) in query.order_by(Bid.id).all()]
+
+    def revalidate(
+        self,
+        bid_ids: Optional[Iterable[UUID]] = None,
+        organization_id: Optional[UUID] = None,
+        force: bool = False
+    ) -> BulkRevalidationReport:
+        """
+        Revalidate bids and record a run for each one whose inputs changed
+
+        With force=True every bid gets a new run even if its fingerprint
+        matches the latest run.
+        """
+        started = time.perf_counter()
+
+        if bid_ids is None:
+            bid_ids = self.select_bid_ids(organization_id)
+        bid_ids = list(dict.fromkeys(bid_ids))
+
+        report = BulkRevalidationReport()
+        use_pool = self.workers > 1 and len(bid_ids) >= POOL_MIN_BIDS
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if use_pool else None
+        try:
+            for offset in range(0, len(bid_ids), BATCH_SIZE):
+                batch = bid_ids[offset:offset + BATCH_SIZE]
+                self._revalidate_batch(batch, force, executor, report)
+
+                report.elapsed_seconds = time.perf_counter() - started
+                logger.info(
+                    "Revalidated %d/%d bids (%d unchanged) - %.0f bids/s",
+                    min(offset + BATCH_SIZE, len(bid_ids)),
+                    len(bid_ids),
+                    report.unchanged,
+                    report.bids_per_second
+                )
+        finally:
+            if executor:
+                executor.shutdown()
+
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def _revalidate_batch(
+        self,
+        batch: List[UUID],
+        force: bool,
+        executor: Optional[ProcessPoolExecutor],
+        report: BulkRevalidationReport
+    ) -> None:
+        contexts = load_bid_contexts(self.db, batch)
+        previous = self._latest_runs(list(contexts))
+
+        # Everything below works on plain data
+        self.db.commit()
+
+        fingerprints = {}
+        pending = []
+        for bid_id, context in contexts.items():
+            fingerprint = context.fingerprint(self.registry.signature)
+            last = previous.get(bid_id)
+
+            if not force and last and last[0] == fingerprint:
+                report.unchanged += 1
+                continue
+
+            fingerprints[bid_id] = fingerprint
+            pending.append(context)
+
+        report.total += len(contexts)
+
+        if not pending:
+            return
+
+        if executor:
+            evaluated = [
+                item
+                for chunk in executor.map(
+                    _evaluate_batch, _split(pending, self.workers), repeat(self.registry)
+                )
+                for item in chunk
+            ]
+        else:
+            evaluated = _evaluate_batch(pending, self.registry)
+
+        run_rows = []
+        result_rows = []
+        for bid_id, rows in evaluated:
+            last = previous.get(bid_id)
+            run_row, new_results = plan_run(
+                bid_id,
+                rows,
+                fingerprints[bid_id],
+                previous_digest=last[1] if last else None,
+                previous_results_run_id=last[2] if last else None
+            )
+            run_rows.append(run_row)
+            result_rows.extend(new_results)
+
+        # Runs first - results reference them
+        self.db.execute(insert(ValidationRun), run_rows)
+        if result_rows:
+            self.db.execute(insert(ValidationResult), result_rows)
+        self.db.commit()
+
+        report.revalidated += len(run_rows)
+        report.results_written += len(result_rows)
+
+    def _latest_runs(self, bid_ids: List[UUID]) -> Dict[UUID, Tuple[str, str, UUID]]:
+        """(input_fingerprint, results_digest, results_run_id) of each bid's latest run"""
+        if not bid_ids:
+            return {}
+
+        rows = self.db.query(
+            ValidationRun.bid_id,
+            ValidationRun.input_fingerprint,
+            ValidationRun.results_digest,
+            ValidationRun.results_run_id
+        ).filter(
+            ValidationRun.bid_id.in_(bid_ids)
+        ).distinct(ValidationRun.bid_id).order_by(
+            ValidationRun.bid_id,
+            ValidationRun.created_at.desc()
+        ).all()
+
+        return {row[0]: tuple(row[1:]) for row in rows}
@@ -0,0 +1,393 @@
+from dataclasses import dataclass, fields, is_dataclass
+from functools import cached_property
+import hashlib
+import json
+from decimal import Decimal
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+from app.models import (
+    Bid,
+    BidSubcontractor,
+    Subcontractor,
+    Jurisdiction,
+    ComplianceRule,
+    SubcontractorCommitment,
+    SubcontractorDirectory
+)
+from app.validation.participation import ParticipationLedger
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """Read-only snapshot of a subcontractor_directory row"""
+    id: UUID
+    legal_name: str
+    has_certifications: bool
+    certified_categories: FrozenSet[str]  # lower-case keys flagged true, e.g. {'mbe', 'vsbe'}
+    jurisdiction_codes: Tuple[str, ...]
+    naics_codes: Tuple[str, ...]
+
+    def is_certified(self, category: str) -> bool:
+        return category.lower() in self.certified_categories
+
+
+@dataclass(frozen=True)
+class Commitment:
+    """A subcontractor's commitments across all bids, this bid included"""
+    bid_count: int
+    committed_value: Decimal
+
+
+@dataclass(frozen=True)
+class BidLine:
+    """Read-only snapshot of a bid_subcontractors row with its resolved subcontractor"""
+    id: Optional[UUID]
+    subcontractor_id: UUID
+    legal_name: Optional[str]  # None when the subcontractor row does not exist
+    naics_code: Optional[str]
+    subcontract_value: Decimal
+    counts_toward_mbe: bool
+    category_breakdown: Tuple[Tuple[str, Decimal], ...]  # (lower-case category, percentage)
+    directory: Optional[DirectoryEntry]
+    commitment: Optional[Commitment] = None  # None when subcontractor_commitments has no row
+
+
+@dataclass(frozen=True)
+class JurisdictionSnapshot:
+    id: UUID
+    code: str
+    name: str
+    mbe_goal_typical: Optional[Decimal]
+    vsbe_goal_typical: Optional[Decimal]
+
+
+@dataclass(frozen=True)
+class RuleSnapshot:
+    id: UUID
+    jurisdiction_id: UUID
+    rule_name: str
+    rule_type: str
+    rule_definition: Dict
+    severity: str
+
+
+@dataclass(frozen=True)
+class BidValidationContext:
+    """
+    Everything the validation rules need for one bid, loaded up front
+
+    Built with a constant number of set-based queries so rules never touch
+    the database. All fields are plain data and safe to share between rules.
+    """
+    bid_id: Optional[UUID]
+    organization_id: Optional[UUID]
+    solicitation_number: Optional[str]
+    total_amount: Optional[Decimal]
+    mbe_goal: Optional[Decimal]
+    lines: Tuple[BidLine, ...]
+    jurisdictions: Tuple[JurisdictionSnapshot, ...]
+    compliance_rules: Tuple[RuleSnapshot, ...]
+
+    @property
+    def jurisdiction_codes(self) -> FrozenSet[str]:
+        """Jurisdiction codes of every directory entry resolved for this bid"""
+        codes = set()
+        for line in self.lines:
+            if line.directory:
+                codes.update(line.directory.jurisdiction_codes)
+        return frozenset(codes)
+
+    @cached_property
+    def participation(self) -> ParticipationLedger:
+        """Category totals computed once and shared by every goal rule"""
+        return ParticipationLedger.from_context(self)
+
+    def rules_for(self, jurisdiction: JurisdictionSnapshot) -> List[RuleSnapshot]:
+        return [r for r in self.compliance_rules if r.jurisdiction_id == jurisdiction.id]
+
+    def fingerprint(self, ruleset_version: str) -> str:
+        """
+        Content hash of everything the rules read
+
+        Covers the bid, its lines, the directory rows they resolve to, the
+        jurisdictions and the compliance rule definitions. Two contexts with the
+        same fingerprint produce the same results under the same rule set.
+        """
+        payload = json.dumps(
+            [ruleset_version, _canonical(self)],
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _canonical(value):
+    """Convert snapshot data into a JSON-ready structure with a stable order"""
+    if is_dataclass(value):
+        return [_canonical(getattr(value, f.name)) for f in fields(value)]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical(v) for v in value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+def _snapshot_directory(entry: SubcontractorDirectory) -> DirectoryEntry:
+    certifications = entry.certifications or {}
+    return DirectoryEntry(
+        id=entry.id,
+        legal_name=entry.legal_name,
+        has_certifications=bool(certifications),
+        certified_categories=frozenset(
+            str(key).lower() for key, value in certifications.items() if value
+        ),
+        jurisdiction_codes=tuple(entry.jurisdiction_codes or ()),
+        naics_codes=tuple(entry.naics_codes or ())
+    )
+
+
+def _snapshot_breakdown(breakdown) -> Tuple[Tuple[str, Decimal], ...]:
+    if not breakdown:
+        return ()
+    return tuple(
+        (entry.get('category', '').lower(), Decimal(str(entry.get('percentage', 0))))
+        for entry in breakdown
+    )
+
+
+def _snapshot_commitment(bid_count, committed_value) -> Optional[Commitment]:
+    if bid_count is None:
+        return None
+    return Commitment(bid_count=bid_count, committed_value=committed_value or Decimal('0'))
+
+
+def _load_reference_data(
+    db: Session,
+    legal_names: Iterable[str]
+) -> Tuple[Dict[str, DirectoryEntry], Tuple[JurisdictionSnapshot, ...], Tuple[RuleSnapshot, ...]]:
+    """Load directory entries, jurisdictions and compliance rules in three queries"""
+    names = {name for name in legal_names if name is not None}
+
+    directory_by_name: Dict[str, DirectoryEntry] = {}
+    if names:
+        rows = db.query(SubcontractorDirectory).filter(
+            SubcontractorDirectory.legal_name.in_(names)
+        ).order_by(SubcontractorDirectory.created_at, SubcontractorDirectory.id).all()
+        for row in rows:
+            # Keep the first entry per legal name, matching the old .first() lookup
+            directory_by_name.setdefault(row.legal_name, _snapshot_directory(row))
+
+    codes = set()
+    for entry in directory_by_name.values():
+        codes.update(entry.jurisdiction_codes)
+
+    jurisdictions: Tuple[JurisdictionSnapshot, ...] = ()
+    compliance_rules: Tuple[RuleSnapshot, ...] = ()
+    if codes:
+        jurisdictions = tuple(
+            JurisdictionSnapshot(
+                id=j.id,
+                code=j.code,
+                name=j.name,
+                mbe_goal_typical=j.mbe_goal_typical,
+                vsbe_goal_typical=j.vsbe_goal_typical
+            )
+            for j in db.query(Jurisdiction).filter(
+                Jurisdiction.code.in_(codes)
+            ).order_by(Jurisdiction.code).all()
+        )
+
+    if jurisdictions:
+        compliance_rules = tuple(
+            RuleSnapshot(
+                id=r.id,
+                jurisdiction_id=r.jurisdiction_id,
+                rule_name=r.rule_name,
+                rule_type=r.rule_type,
+                rule_definition=dict(r.rule_definition or {}),
+                severity=r.severity
+            )
+            for r in db.query(ComplianceRule).filter(
+                ComplianceRule.jurisdiction_id.in_([j.id for j in jurisdictions])
+            ).order_by(ComplianceRule.rule_name, ComplianceRule.id).all()
+        )
+
+    return directory_by_name, jurisdictions, compliance_rules
+
+
+def load_bid_context(db: Session, bid_id: UUID) -> Optional[BidValidationContext]:
+    """
+    Load a bid and everything its validation depends on
+
+    Runs at most five queries regardless of how many subcontractors the bid has:
+    bid, bid_subcontractors (joined to subcontractors and subcontractor_commitments),
+    directory, jurisdictions, rules.
+    Returns None if the bid does not exist.
+    """
+    return load_bid_contexts(db, [bid_id]).get(bid_id)
+
+
+def load_bid_contexts(db: Session, bid_ids: Iterable[UUID]) -> Dict[UUID, BidValidationContext]:
+    """
+    Load validation contexts for many bids with the same five queries
+
+    Reference data is loaded once for the whole set; each context only keeps
+    the jurisdictions and rules its own directory entries point to. Bids that
+    do not exist are left out of the result.
+    """
+    ids = set(bid_ids)
+    if not ids:
+        return {}
+
+    bids = db.query(Bid).filter(Bid.id.in_(ids)).all()
+
+    if not bids:
+        return {}
+
+    rows = db.query(
+        BidSubcontractor,
+        Subcontractor.legal_name,
+        SubcontractorCommitment.bid_count,
+        SubcontractorCommitment.committed_value
+    ).outerjoin(
+        Subcontractor, Subcontractor.id == BidSubcontractor.subcontractor_id
+    ).outerjoin(
+        SubcontractorCommitment,
+        SubcontractorCommitment.subcontractor_id == BidSubcontractor.subcontractor_id
+    ).filter(
+        BidSubcontractor.bid_id.in_([bid.id for bid in bids])
+    ).order_by(BidSubcontractor.id).all()
+
+    directory_by_name, jurisdictions, compliance_rules = _load_reference_data(
+        db, [row.legal_name for row in rows]
+    )
+
+    lines_by_bid: Dict[UUID, List[BidLine]] = {}
+    for bid_sub, legal_name, bid_count, committed_value in rows:
+        lines_by_bid.setdefault(bid_sub.bid_id, []).append(BidLine(
+            id=bid_sub.id,
+            subcontractor_id=bid_sub.subcontractor_id,
+            legal_name=legal_name,
+            naics_code=bid_sub.naics_code,
+            subcontract_value=bid_sub.subcontract_value or Decimal('0'),
+            counts_toward_mbe=bool(bid_sub.counts_toward_mbe),
+            category_breakdown=_snapshot_breakdown(bid_sub.category_breakdown),
+            directory=directory_by_name.get(legal_name),
+            commitment=_snapshot_commitment(bid_count, committed_value)
+        ))
+
+    contexts = {}
+    for bid in bids:
+        lines = tuple(lines_by_bid.get(bid.id, ()))
+
+        codes = set()
+        for line in lines:
+            if line.directory:
+                codes.update(line.directory.jurisdiction_codes)
+
+        bid_jurisdictions = tuple(j for j in jurisdictions if j.code in codes)
+        jurisdiction_ids = {j.id for j in bid_jurisdictions}
+
+        contexts[bid.id] = BidValidationContext(
+            bid_id=bid.id,
+            organization_id=bid.organization_id,
+            solicitation_number=bid.solicitation_number,
+            total_amount=bid.total_amount,
+            mbe_goal=bid.mbe_goal,
+            lines=lines,
+            jurisdictions=bid_jurisdictions,
+            compliance_rules=tuple(
+                r for r in compliance_rules if r.jurisdiction_id in jurisdiction_ids
+            )
+        )
+
+    return contexts
+
+
+def build_draft_context(
+    db: Session,
+    bid_data,
+    subcontractors: Sequence
+) -> BidValidationContext:
+    """
+    Build a context for a bid that is not (or not yet in this form) in the database
+
+    bid_data needs total_amount and mbe_goal; subcontractors are BidSubcontractorCreate
+    entries. Subcontractor names are resolved from the organization's subcontractors
+    and, for directory entries not yet copied there, from the directory itself.
+    Commitments count the draft as one more bid on top of the stored ones.
+    Read-only: at most five queries, nothing is written.
+    """
+    ids = {sub.subcontractor_id for sub in subcontractors}
+
+    names: Dict[UUID, str] = {}
+    stored: Dict[UUID, Tuple[int, Decimal]] = {}
+    if ids:
+        rows = db.query(
+            Subcontractor.id,
+            Subcontractor.legal_name,
+            SubcontractorCommitment.bid_count,
+            SubcontractorCommitment.committed_value
+        ).outerjoin(
+            SubcontractorCommitment,
+            SubcontractorCommitment.subcontractor_id == Subcontractor.id
+        ).filter(Subcontractor.id.in_(ids)).all()
+        for row in rows:
+            names[row.id] = row.legal_name
+            stored[row.id] = (row.bid_count or 0, row.committed_value or Decimal('0'))
+
+        missing = ids - names.keys()
+        if missing:
+            # add_subcontractor_to_bid copies these from the directory under the same id
+            names.update(db.query(
+                SubcontractorDirectory.id, SubcontractorDirectory.legal_name
+            ).filter(SubcontractorDirectory.id.in_(missing)).all())
+
+    directory_by_name, jurisdictions, compliance_rules = _load_reference_data(
+        db, names.values()
+    )
+
+    draft_value: Dict[UUID, Decimal] = {}
+    for sub in subcontractors:
+        draft_value[sub.subcontractor_id] = (
+            draft_value.get(sub.subcontractor_id, Decimal('0')) + (sub.subcontract_value or Decimal('0'))
+        )
+
+    lines = []
+    for sub in subcontractors:
+        legal_name = names.get(sub.subcontractor_id)
+        bid_count, committed_value = stored.get(sub.subcontractor_id, (0, Decimal('0')))
+        breakdown = [
+            {"category": entry.category, "percentage": entry.percentage}
+            for entry in (sub.category_breakdown or [])
+        ]
+        lines.append(BidLine(
+            id=None,
+            subcontractor_id=sub.subcontractor_id,
+            legal_name=legal_name,
+            naics_code=sub.naics_code,
+            subcontract_value=sub.subcontract_value or Decimal('0'),
+            counts_toward_mbe=bool(sub.counts_toward_mbe),
+            category_breakdown=_snapshot_breakdown(breakdown),
+            directory=directory_by_name.get(legal_name),
+            commitment=Commitment(
+                bid_count=bid_count + 1,
+                committed_value=committed_value + draft_value[sub.subcontractor_id]
+            )
+        ))
+
+    return BidValidationContext(
+        bid_id=None,
+        organization_id=getattr(bid_data, 'organization_id', None),
+        solicitation_number=bid_data.solicitation_number,
+        total_amount=bid_data.total_amount,
+        mbe_goal=bid_data.mbe_goal,
+        lines=tuple(lines),
+        jurisdictions=jurisdictions,
+        compliance_rules=compliance_rules
+    )
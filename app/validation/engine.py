@@ -1,9 +1,24 @@
-from typing import List
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
+import hashlib
+import json
+import uuid
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from app.models import Bid, ValidationResult
-from app.validation.rules import ALL_RULES
+from sqlalchemy.orm.attributes import set_committed_value
+from app.config import settings
+from app.models import ValidationResult, ValidationRun
+from app.validation.context import BidValidationContext, build_draft_context, load_bid_context
+from app.validation.profiling import CONTEXT_LOAD, RuleProfiler, rule_profiler
+from app.validation.registry import RuleRegistry, registry
+from app.validation.trace import NULL_TRACE, NullTrace
 from uuid import UUID
 
+# Validation modes
+MODE_FULL = "full"    # run every applicable rule and record the run
+MODE_QUICK = "quick"  # cheapest rules first, stop at the first failure, record nothing
+
 class ValidationEngine:
     """
     Engine to run all validation rules on a bid
@@ -16,12 +31,35 @@ class ValidationEngine:
     NOTE: NAICS code validation is disabled
     """
 
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        rule_registry: Optional[RuleRegistry] = None,
+        profiler: Optional[RuleProfiler] = None
+    ):
         self.db = db
+        self.registry = rule_registry or registry
+        # Per-rule timing and SQL counts for /diagnostics/validation-rules
+        self.profiler = profiler or (rule_profiler if settings.VALIDATION_PROFILING else None)
+
+    def load_context(self, bid_id: UUID) -> BidValidationContext:
+        """Load the immutable validation context for a bid"""
+        context = load_bid_context(self.db, bid_id)
+
+        if not context:
+            raise ValueError(f"Bid {bid_id} not found")
 
-    def validate_bid(self, bid_id: UUID) -> List[ValidationResult]:
+        return context
+
+    def validate_bid(
+        self,
+        bid_id: UUID,
+        use_cache: bool = True,
+        mode: str = MODE_FULL,
+        trace: NullTrace = NULL_TRACE
+    ) -> ValidationRun:
         """
-        Run all validation rules on a bid
+        Run all validation rules on a bid and record the run
 
         The validation checks (all from directory DB):
         - Directory DB jurisdiction match (first)
@@ -29,40 +67,260 @@ class ValidationEngine:
         - Compliance rules from jurisdiction (verified with directory DB)
         - Amount counting for percentage calculations (verified from directory DB)
 
+        The loaded context is fingerprinted together with the rule registry. When
+        the latest run has the same fingerprint its stored results are returned
+        as-is and nothing is written (run.cache_hit is True).
+
+        Otherwise a validation_runs row is added. Result rows are only written
+        when they differ from the previous run; if not, the new run points at
+        the rows of the run that last wrote them.
+
+        In quick mode the rules run cheapest tier first and stop at the first
+        FAIL (an ERROR-severity failure). The partial run is returned without
+        being stored and has no id. Quick mode never reads the cache, so it
+        does not return a stored full run.
+
+        Pass a TraceCollector as trace to record what each rule checked. A traced
+        call always evaluates the rules, since a cached run has no trace.
+
+        With profiling on, the context load and every rule are timed and their
+        SQL statements counted (see app.validation.profiling).
+
         NOTE: NAICS code validation is disabled
         """
-        
-        # Get the bid with all relationships
-        bid = self.db.query(Bid).filter(Bid.id == bid_id).first()
-        
-        if not bid:
-            raise ValueError(f"Bid {bid_id} not found")
-        
-        # Clear previous validation results
-        self.db.query(ValidationResult).filter(
-            ValidationResult.bid_id == bid_id
-        ).delete()
-        
-        results = []
-        
-        # Run each validation rule
-        for rule in ALL_RULES:
-            result_data = rule.validate(bid, self.db)
-            
-            validation_result = ValidationResult(
-                bid_id=bid_id,
-                rule_name=rule.name,
-                status=result_data["status"],
-                error_message=result_data["error_message"]
+
+        # Load the bid and all reference data in a constant number of queries
+        with self._measure(CONTEXT_LOAD, "load_bid_context"):
+            context = self.load_context(bid_id)
+
+        if mode == MODE_QUICK:
+            # The context is plain data, so end the read transaction before running rules
+            self.db.commit()
+            return self._quick_run(context, trace)
+
+        fingerprint = context.fingerprint(self.registry.signature)
+
+        previous = self.db.query(ValidationRun).filter(
+            ValidationRun.bid_id == bid_id
+        ).order_by(ValidationRun.created_at.desc()).first()
+
+        if use_cache and not trace.enabled and previous and previous.input_fingerprint == fingerprint:
+            return self._cached_run(previous)
+
+        # The context is plain data, so end the read transaction before running rules
+        self.db.commit()
+
+        # Run each validation rule against the preloaded context
+        rows = evaluate_context(context, self.registry, trace=trace, profiler=self.profiler)
+
+        return self._record_run(bid_id, rows, fingerprint, previous)
+
+    def validate_draft(self, bid_data, subcontractors: Sequence) -> List[ValidationResult]:
+        """
+        Dry-run all validation rules on a proposed bid composition
+
+        Reads the directory and compliance data the proposal refers to, runs every
+        rule in memory and returns transient ValidationResult objects. Nothing is
+        added to the session, so no rows are inserted or deleted.
+        """
+        context = build_draft_context(self.db, bid_data, subcontractors)
+
+        # End the read transaction - nothing below touches the database
+        self.db.rollback()
+
+        created_at = datetime.utcnow()
+        return [
+            ValidationResult(created_at=created_at, **row)
+            for row in evaluate_context(context, self.registry)
+        ]
+
+    def _quick_run(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> ValidationRun:
+        """Fail-fast evaluation returned as a transient, unsaved run"""
+        created_at = datetime.utcnow()
+        results = [
+            ValidationResult(created_at=created_at, **row)
+            for row in evaluate_context(
+                context, self.registry, fail_fast=True, trace=trace, profiler=self.profiler
             )
-            
-            self.db.add(validation_result)
-            results.append(validation_result)
-        
+        ]
+        statuses = [r.status for r in results]
+
+        run = ValidationRun(
+            bid_id=context.bid_id,
+            overall_status=overall_status(statuses),
+            total_validations=len(results),
+            passed=statuses.count("PASS"),
+            failed=statuses.count("FAIL"),
+            warnings=statuses.count("WARNING"),
+            created_at=created_at
+        )
+        set_committed_value(run, "results", results)
+        run.mode = MODE_QUICK
+
+        return run
+
+    def _measure(self, code: str, name: str):
+        return self.profiler.measure(code, name) if self.profiler else nullcontext()
+
+    def _cached_run(self, run: ValidationRun) -> ValidationRun:
+        """Return a stored run with its results loaded"""
+        results = self.db.query(ValidationResult).filter(
+            ValidationResult.run_id == run.results_run_id
+        ).order_by(ValidationResult.position).all()
+
+        set_committed_value(run, "results", results)
+        run.cache_hit = True
+
+        self._detach(run, results)
         self.db.commit()
-        
-        # Refresh to get created_at timestamps
+
+        return run
+
+    def _detach(self, run: ValidationRun, results: List[ValidationResult]) -> None:
+        # Detached objects keep their loaded values when the session commits,
+        # instead of being expired and re-read one by one
         for result in results:
-            self.db.refresh(result)
-        
-        return results
\ No newline at end of file
+            self.db.expunge(result)
+        self.db.expunge(run)
+
+    def _record_run(
+        self,
+        bid_id: UUID,
+        rows: List[Dict],
+        fingerprint: str,
+        previous: Optional[ValidationRun]
+    ) -> ValidationRun:
+        """Insert the run row and, if anything changed, its results in one statement"""
+        run_row, result_rows = plan_run(
+            bid_id,
+            rows,
+            fingerprint,
+            previous_digest=previous.results_digest if previous else None,
+            previous_results_run_id=previous.results_run_id if previous else None
+        )
+
+        run = ValidationRun(**run_row)
+        self.db.add(run)
+        self.db.flush()
+
+        if result_rows:
+            # Single INSERT ... RETURNING instead of add + refresh per result
+            results = list(self.db.scalars(
+                insert(ValidationResult).returning(ValidationResult),
+                result_rows
+            ))
+        else:
+            # Same outcome as last time - the run points at the stored rows
+            results = self.db.query(ValidationResult).filter(
+                ValidationResult.run_id == run.results_run_id
+            ).order_by(ValidationResult.position).all()
+
+        set_committed_value(run, "results", results)
+
+        self._detach(run, results)
+        self.db.commit()
+
+        return run
+
+
+def evaluate_context(
+    context: BidValidationContext,
+    rule_registry: RuleRegistry,
+    fail_fast: bool = False,
+    trace: NullTrace = NULL_TRACE,
+    profiler: Optional[RuleProfiler] = None
+) -> List[Dict]:
+    """
+    Run the applicable rules against a context and return validation_results rows (without run_id)
+
+    Rules run in registry order, cheapest cost tier first. Rules the bid lacks
+    the data for are not evaluated; their skipped result is recorded instead.
+    With fail_fast the evaluation stops after the first FAIL. Each rule reports
+    its steps to trace, and is timed by profiler when one is given.
+    """
+    rows = []
+    for position, rule, skipped in rule_registry.applicable(context):
+        trace.begin_rule(rule.code, rule.name)
+        if skipped is not None:
+            trace.step("skipped", requires=sorted(rule.depends_on.requires))
+            result_data = skipped
+        elif profiler is None:
+            result_data = rule.validate(context, trace)
+        else:
+            with profiler.measure(rule.code, rule.name):
+                result_data = rule.validate(context, trace)
+        trace.end_rule(result_data["status"])
+
+        rows.append({
+            "bid_id": context.bid_id,
+            "position": position,
+            "rule_code": rule.code,
+            "status": result_data["status"],
+            "message_params": [list(f) for f in result_data["findings"]]
+        })
+
+        if fail_fast and result_data["status"] == "FAIL":
+            break
+    return rows
+
+
+def plan_run(
+    bid_id: UUID,
+    rows: List[Dict],
+    fingerprint: str,
+    previous_digest: Optional[str] = None,
+    previous_results_run_id: Optional[UUID] = None
+) -> Tuple[Dict, List[Dict]]:
+    """
+    Build the validation_runs row for a set of results and the result rows to insert
+
+    When the results match the previous run (same digest) no result rows are
+    returned and the run points at the previous run's rows instead.
+    """
+    digest = _results_digest(rows)
+    statuses = [row["status"] for row in rows]
+    run_id = uuid.uuid4()
+    created_at = datetime.utcnow()
+
+    unchanged = previous_digest == digest and previous_results_run_id is not None
+
+    run_row = {
+        "id": run_id,
+        "bid_id": bid_id,
+        "results_run_id": previous_results_run_id if unchanged else run_id,
+        "input_fingerprint": fingerprint,
+        "results_digest": digest,
+        "overall_status": overall_status(statuses),
+        "total_validations": len(rows),
+        "passed": statuses.count("PASS"),
+        "failed": statuses.count("FAIL"),
+        "warnings": statuses.count("WARNING"),
+        "created_at": created_at
+    }
+
+    if unchanged:
+        return run_row, []
+
+    result_rows = [
+        dict(row, run_id=run_id, created_at=created_at)
+        for row in rows
+    ]
+    return run_row, result_rows
+
+
+def overall_status(statuses: List[str]) -> str:
+    if "FAIL" in statuses:
+        return "FAIL"
+    if "WARNING" in statuses:
+        return "WARNING"
+    return "PASS"
+
+
+def _results_digest(rows: List[Dict]) -> str:
+    payload = [
+        [row["rule_code"], row["status"], row["message_params"]]
+        for row in rows
+    ]
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
@@ -0,0 +1,176 @@
+"""
+Change impact tracking for stored validation results
+
+When a compliance rule or a directory entry changes, ChangeImpactResolver finds
+the bids whose validation context reads it and RevalidationQueue revalidates
+just those bids in the background, in de-duplicated batches.
+"""
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import any_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import BidSubcontractor, Jurisdiction, Subcontractor, SubcontractorDirectory
+from app.validation.bulk import BulkRevalidator
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeImpactResolver:
+    """Work out which bids a reference data change can affect"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bids_for_jurisdictions(self, jurisdiction_ids: Iterable[UUID]) -> Set[UUID]:
+        """
+        Bids with a subcontractor whose directory entry lists one of the jurisdictions
+
+        Mirrors how the validation context picks jurisdictions, so these are
+        exactly the bids that read the jurisdiction's compliance rules.
+        """
+        ids = {j for j in jurisdiction_ids if j}
+        if not ids:
+            return set()
+
+        rows = self.db.query(BidSubcontractor.bid_id).join(
+            Subcontractor, Subcontractor.id == BidSubcontractor.subcontractor_id
+        ).join(
+            SubcontractorDirectory,
+            SubcontractorDirectory.legal_name == Subcontractor.legal_name
+        ).join(
+            Jurisdiction,
+            Jurisdiction.code == any_(SubcontractorDirectory.jurisdiction_codes)
+        ).filter(Jurisdiction.id.in_(ids)).distinct().all()
+
+        return {bid_id for (bid_id,) in rows}
+
+    def bids_for_directory_names(self, legal_names: Iterable[str]) -> Set[UUID]:
+        """Bids with a subcontractor that resolves to a directory entry by legal name"""
+        names = {name for name in legal_names if name}
+        if not names:
+            return set()
+
+        rows = self.db.query(BidSubcontractor.bid_id).join(
+            Subcontractor, Subcontractor.id == BidSubcontractor.subcontractor_id
+        ).filter(Subcontractor.legal_name.in_(names)).distinct().all()
+
+        return {bid_id for (bid_id,) in rows}
+
+
+class RevalidationQueue:
+    """
+    Background revalidation with de-duplication and batching
+
+    Bids enqueued while a batch is waiting or running are merged, so a burst of
+    edits touching the same bids revalidates each bid once. A single daemon
+    thread drains the queue with BulkRevalidator in its own session.
+    """
+
+    def __init__(self, batch_size: int = 500, settle_seconds: float = 1.0):
+        self.batch_size = batch_size
+        self.settle_seconds = settle_seconds
+        self._pending: Dict[UUID, None] = {}  # insertion-ordered set
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def enqueue(self, bid_ids: Iterable[UUID]) -> int:
+        """Queue bids for revalidation; returns how many were not already queued"""
+        with self._condition:
+            before = len(self._pending)
+            for bid_id in bid_ids:
+                self._pending[bid_id] = None
+            added = len(self._pending) - before
+
+            if added:
+                self._ensure_worker()
+                self._condition.notify()
+
+        return added
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._run, name="revalidation-queue", daemon=True
+            )
+            self._thread.start()
+
+    def _next_batch(self) -> Optional[List[UUID]]:
+        with self._condition:
+            while not self._pending and not self._stopping:
+                self._condition.wait()
+
+            if self._stopping:
+                return None
+
+        # Let a burst of related edits settle into one batch
+        time.sleep(self.settle_seconds)
+
+        with self._condition:
+            batch = list(self._pending)[:self.batch_size]
+            for bid_id in batch:
+                del self._pending[bid_id]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            db = SessionLocal()
+            try:
+                report = BulkRevalidator(db, workers=settings.VALIDATION_WORKERS).revalidate(batch)
+                logger.info(
+                    "Background revalidation: %d bids, %d revalidated, %d unchanged in %.2fs",
+                    report.total, report.revalidated, report.unchanged, report.elapsed_seconds
+                )
+            except Exception:
+                logger.exception("Background revalidation of %d bids failed", len(batch))
+                db.rollback()
+            finally:
+                db.close()
+
+
+revalidation_queue = RevalidationQueue()
+
+
+def revalidate_impacted(
+    db: Session,
+    jurisdiction_ids: Iterable[UUID] = (),
+    legal_names: Iterable[str] = ()
+) -> int:
+    """
+    Enqueue background revalidation for bids affected by a reference data change
+
+    Call after the change is committed. Returns the number of bids queued.
+    """
+    if not settings.AUTO_REVALIDATE:
+        return 0
+
+    resolver = ChangeImpactResolver(db)
+    bid_ids = resolver.bids_for_jurisdictions(jurisdiction_ids)
+    bid_ids |= resolver.bids_for_directory_names(legal_names)
+
+    if not bid_ids:
+        return 0
+
+    return revalidation_queue.enqueue(sorted(bid_ids))
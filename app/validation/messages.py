@@ -0,0 +1,92 @@
+"""
+Compact codes for validation rules and their messages
+
+Validation results are stored as a short rule code plus a list of
+[message_code, params] pairs. The human readable text is rendered from
+the templates below when a result is read, so stored rows stay small and
+wording can change without rewriting history.
+"""
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Rule code -> rule name
+RULE_NAMES = {
+    "DJM": "directory_jurisdiction_match",
+    "CRT": "certification_exists",
+    "NCV": "naics_code_valid",
+    "JCR": "jurisdiction_compliance",
+    "MBP": "mbe_percentage",
+    "NMC": "naics_match_certification",
+    "JSG": "jurisdiction_specific_goals",
+    "OVC": "subcontractor_overcommitment",
+}
+
+MESSAGE_TEMPLATES = {
+    # Shared subcontractor / directory lookups
+    "SUB_NOT_FOUND": "Subcontractor not found: {subcontractor_id}",
+    "DIR_NOT_FOUND": "{name} not found in directory DB",
+    "DIR_NOT_FOUND_FAIL": "{name} not found in directory DB - FAIL",
+    "DIR_NO_JURISDICTIONS": "{name} has no jurisdiction codes in directory DB - FAIL",
+    "DIR_OK": "All subcontractors exist in directory DB with valid jurisdiction codes",
+
+    # Certifications
+    "CERT_NO_MBE": "{name} is marked as MBE but has no MBE certification in directory DB",
+    "CERT_NONE": "{name} is marked as MBE but has no certifications in directory DB",
+    "CERT_OK": "All subcontractors have valid certifications in directory DB",
+
+    # NAICS
+    "NAICS_MISSING": "{name} has no NAICS code assigned in bid",
+    "NAICS_NOT_LISTED": "NAICS code '{naics_code}' not listed in directory DB for {name}. Directory has: {directory_codes}",
+    "NAICS_DIR_EMPTY": "{name} has no NAICS codes in directory DB",
+    "NAICS_OK": "All NAICS codes match directory DB",
+    "NAICS_MATCH_DIR_NOT_FOUND": "{name}: Not found in directory DB",
+    "NAICS_MATCH_DIR_EMPTY": "{name}: No NAICS codes in directory DB",
+    "NAICS_MATCH_NOT_LISTED": "{name}: NAICS code '{naics_code}' not listed in directory DB. Valid codes: {directory_codes}",
+
+    # Jurisdiction compliance rules
+    "JCR_NO_CODES": "Cannot verify jurisdiction-specific compliance: no jurisdiction codes found in directory",
+    "JCR_NO_JURISDICTIONS": "No jurisdiction records found for codes: {codes}",
+    "JCR_NO_RULES": "No compliance rules found for jurisdictions: {codes}",
+    "JCR_BELOW": "{rule_name}: {category} participation {actual}% is below required {required}%",
+    "JCR_INVALID_DEFINITION": "{rule_name}: invalid rule definition ({error})",
+    "JCR_OK": "All jurisdiction-specific compliance rules satisfied",
+
+    # MBE percentage
+    "MBE_NO_TOTAL": "Cannot calculate MBE percentage: total amount is 0",
+    "MBE_BELOW": "MBE percentage {actual}% is below goal of {goal}% (verified from directory DB)",
+    "MBE_MEETS": "MBE percentage {actual}% meets goal of {goal}% (verified from directory DB)",
+
+    # Jurisdiction goals
+    "JSG_NO_TOTAL": "Cannot verify jurisdiction-specific goals: total amount is 0",
+    "JSG_NO_CODES": "Cannot verify jurisdiction-specific goals: jurisdiction not identified",
+    "JSG_NO_JURISDICTIONS": "Cannot verify jurisdiction-specific goals: no jurisdiction records found for {codes}",
+    "JSG_BELOW": "{jurisdiction}: {category} {actual}% is below required {required}%",
+    "JSG_OK": "All jurisdiction-specific goals met from directory DB",
+
+    # Cross-bid commitments
+    "OVC_TOO_MANY_BIDS": "{name} is committed to {bid_count} bids across all organizations (limit {limit})",
+    "OVC_TOO_MUCH_VALUE": "{name} has ${committed_value} committed across all bids (limit ${limit})",
+    "OVC_OK": "No subcontractor is overcommitted across concurrent bids",
+}
+
+Finding = Tuple[str, Dict[str, str]]
+
+
+def finding(message_code: str, **params) -> Finding:
+    """Build a (message_code, params) pair with JSON-safe string parameters"""
+    return (message_code, {key: str(value) for key, value in params.items()})
+
+
+def rule_name_for(rule_code: Optional[str]) -> Optional[str]:
+    return RULE_NAMES.get(rule_code) if rule_code else None
+
+
+def render_message(findings: Iterable[Sequence]) -> str:
+    """Render stored [message_code, params] pairs into the joined message text"""
+    parts = []
+    for message_code, params in findings:
+        template = MESSAGE_TEMPLATES.get(message_code)
+        if template is None:
+            parts.append(message_code)
+            continue
+        parts.append(template.format(**(params or {})))
+    return "; ".join(parts)
@@ -0,0 +1,535 @@
+"""
+Goal-gap optimizer
+
+Finds a small set of changes that brings a bid up to every certified
+participation goal the validation rules check:
+
+- the bid's own MBE goal (MBEPercentageRule, share of the subcontract total)
+- each jurisdiction's typical MBE and VSBE goals (JurisdictionSpecificGoalRule,
+  share of the bid total)
+
+Three kinds of change are considered:
+
+- count_toward_mbe: an MBE-certified line without a breakdown that does not
+  count toward MBE yet
+- reallocate: move the part of a line's category_breakdown that counts toward
+  no certified category onto a category its directory entry certifies, taking
+  it from those entries so the breakdown still sums to 100
+- add_subcontractor: add a certified directory entry with just enough value
+
+A greedy pass picks the change that closes the most goal gap at each step,
+preferring changes to existing lines over additions. A bounded exhaustive pass
+then looks for a plan with fewer changes among the best candidates. Everything
+runs on the preloaded validation context in integer cents; the only database
+access is the indexed directory candidate query.
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_CEILING
+from itertools import combinations
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.models import SubcontractorDirectory
+from app.validation.context import (
+    BidValidationContext,
+    DirectoryEntry,
+    _snapshot_directory
+)
+from app.validation.participation import (
+    BID_TOTAL,
+    CATEGORIES,
+    SUBCONTRACT_TOTAL,
+    allocate_cents,
+    to_cents
+)
+
+COUNT_TOWARD_MBE = 'count_toward_mbe'
+REALLOCATE = 'reallocate'
+ADD_SUBCONTRACTOR = 'add_subcontractor'
+
+MAX_MOVES = 50             # greedy plan length limit
+GREEDY_WIDTH = 16          # line changes per category evaluated at each greedy step
+EXACT_POOL_SIZE = 12       # best single moves considered by the exhaustive pass
+EXACT_MAX_MOVES = 3        # largest plan size the exhaustive pass tries
+CANDIDATE_LIMIT = 50       # directory entries loaded as addition candidates
+CANDIDATES_PER_COVERAGE = 3  # additions kept per set of goal categories covered
+
+HUNDRED = Decimal('100')
+ONE_BASIS_POINT = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class Goal:
+    category: str
+    denominator: str
+    required: Decimal
+    sources: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Move:
+    kind: str
+    category: Optional[str] = None           # for reallocate
+    line_index: Optional[int] = None         # for count_toward_mbe / reallocate
+    directory: Optional[DirectoryEntry] = None  # for add_subcontractor
+
+    @property
+    def is_addition(self) -> bool:
+        return self.kind == ADD_SUBCONTRACTOR
+
+
+@dataclass
+class _State:
+    """Certified totals in cents while a plan is applied"""
+    certified: Dict[str, int]
+    subcontract_total: int
+    bid_total: int
+    donors: Dict[int, Dict[str, Decimal]] = field(default_factory=dict)  # uncounted breakdown share per line and category
+    applied: List[Tuple[Move, Dict]] = field(default_factory=list)
+
+    def copy(self) -> "_State":
+        return _State(
+            dict(self.certified),
+            self.subcontract_total,
+            self.bid_total,
+            {index: dict(shares) for index, shares in self.donors.items()},
+            list(self.applied)
+        )
+
+    def free_percentage(self, line_index: int) -> Decimal:
+        """Breakdown share of a line that can still be moved onto a certified category"""
+        return sum(self.donors.get(line_index, {}).values(), Decimal('0'))
+
+    def denominator(self, goal: Goal) -> int:
+        if goal.denominator == SUBCONTRACT_TOTAL:
+            return self.subcontract_total or self.bid_total
+        return self.bid_total
+
+    def percentage(self, goal: Goal) -> Decimal:
+        denominator = self.denominator(goal)
+        if not denominator:
+            return Decimal('0')
+        return Decimal(self.certified[goal.category]) * 100 / Decimal(denominator)
+
+    def met(self, goal: Goal) -> bool:
+        return not self.percentage(goal) < goal.required
+
+    def gap(self, goals: Sequence[Goal]) -> Decimal:
+        """Total percentage points still missing across all goals"""
+        return sum((max(Decimal('0'), g.required - self.percentage(g)) for g in goals), Decimal('0'))
+
+    def shortfall_cents(self, goal: Goal) -> int:
+        """Certified cents still needed for a goal with the denominator unchanged"""
+        needed = goal.required * self.denominator(goal) / HUNDRED
+        return max(0, int(needed.to_integral_value(rounding=ROUND_CEILING)) - self.certified[goal.category])
+
+
+def goals_for(context: BidValidationContext) -> List[Goal]:
+    """Certified participation goals the goal rules check for this bid"""
+    if not context.total_amount:
+        return []
+
+    required: Dict[Tuple[str, str], Tuple[Decimal, List[str]]] = {}
+
+    def add(category: str, denominator: str, value: Optional[Decimal], source: str) -> None:
+        if not value:
+            return
+        key = (category, denominator)
+        current, sources = required.get(key, (Decimal('0'), []))
+        required[key] = (max(current, Decimal(value)), sources + [source])
+
+    add('mbe', SUBCONTRACT_TOTAL, context.mbe_goal, 'bid')
+    for jurisdiction in context.jurisdictions:
+        add('mbe', BID_TOTAL, jurisdiction.mbe_goal_typical, jurisdiction.code)
+        add('vsbe', BID_TOTAL, jurisdiction.vsbe_goal_typical, jurisdiction.code)
+
+    return [
+        Goal(category, denominator, value, tuple(sources))
+        for (category, denominator), (value, sources) in sorted(required.items())
+    ]
+
+
+def _select_goals(context: BidValidationContext, categories: Optional[Sequence[str]]) -> List[Goal]:
+    goals = goals_for(context)
+    if categories:
+        wanted = {c.lower() for c in categories}
+        goals = [g for g in goals if g.category in wanted]
+    return goals
+
+
+def unmet_categories(context: BidValidationContext, categories: Optional[Sequence[str]] = None) -> List[str]:
+    """Categories with at least one goal the bid does not meet yet"""
+    state = _initial_state(context)
+    return sorted({g.category for g in _select_goals(context, categories) if not state.met(g)})
+
+
+def _initial_state(context: BidValidationContext) -> _State:
+    ledger = context.participation
+    state = _State(
+        certified=dict(ledger.certified_cents),
+        subcontract_total=ledger.subcontract_total_cents,
+        bid_total=ledger.bid_total_cents
+    )
+
+    for index, line in enumerate(context.lines):
+        if line.legal_name is None or not line.directory or not line.category_breakdown:
+            continue
+        shares: Dict[str, Decimal] = {}
+        for category, percentage in line.category_breakdown:
+            if percentage > 0 and not (category in CATEGORIES and line.directory.is_certified(category)):
+                shares[category] = shares.get(category, Decimal('0')) + percentage
+        if shares:
+            state.donors[index] = shares
+
+    return state
+
+
+def _line_moves(context: BidValidationContext, state: _State, categories: FrozenSet[str]) -> List[Move]:
+    """Changes to existing lines, largest possible gain first"""
+    moves = []
+    for index, line in enumerate(context.lines):
+        directory = line.directory
+        if line.legal_name is None or not directory or not line.subcontract_value:
+            continue
+
+        if line.category_breakdown:
+            if index not in state.donors:
+                continue
+            potential = allocate_cents(to_cents(line.subcontract_value), state.free_percentage(index))
+            for category in sorted(categories):
+                if directory.is_certified(category):
+                    moves.append((potential, Move(REALLOCATE, category=category, line_index=index)))
+        elif 'mbe' in categories and directory.is_certified('mbe') and not line.counts_toward_mbe:
+            potential = to_cents(line.subcontract_value)
+            moves.append((potential, Move(COUNT_TOWARD_MBE, category='mbe', line_index=index)))
+
+    moves.sort(key=lambda pair: -pair[0])
+    return [move for _, move in moves]
+
+
+def _addition_moves(candidates: Sequence[DirectoryEntry], categories: FrozenSet[str]) -> List[Move]:
+    """Best few candidates for each combination of goal categories they cover"""
+    kept: Dict[FrozenSet[str], int] = {}
+    moves = []
+    for entry in candidates:
+        coverage = frozenset(c for c in categories if entry.is_certified(c))
+        if not coverage or kept.get(coverage, 0) >= CANDIDATES_PER_COVERAGE:
+            continue
+        kept[coverage] = kept.get(coverage, 0) + 1
+        moves.append(Move(ADD_SUBCONTRACTOR, directory=entry))
+    return moves
+
+
+def _apply(
+    context: BidValidationContext,
+    state: _State,
+    goals: Sequence[Goal],
+    move: Move
+) -> Optional[_State]:
+    """State after a move sized to the remaining gap, or None if the move cannot help"""
+    unmet = [g for g in goals if not state.met(g)]
+    if not unmet:
+        return None
+
+    if move.kind == COUNT_TOWARD_MBE:
+        if any(a[0].line_index == move.line_index and a[0].kind == COUNT_TOWARD_MBE for a in state.applied):
+            return None
+        if not any(g.category == 'mbe' for g in unmet):
+            return None
+        line = context.lines[move.line_index]
+        gain = to_cents(line.subcontract_value)
+        new_state = state.copy()
+        new_state.certified['mbe'] += gain
+        new_state.applied.append((move, {'gain_cents': {'mbe': gain}}))
+        return new_state
+
+    if move.kind == REALLOCATE:
+        if any(a[0] == move for a in state.applied):
+            return None
+        needed = max((state.shortfall_cents(g) for g in unmet if g.category == move.category), default=0)
+        free = state.free_percentage(move.line_index)
+        if not needed or free <= 0:
+            return None
+        line = context.lines[move.line_index]
+        value_cents = to_cents(line.subcontract_value)
+        percentage = (Decimal(needed) * 100 / Decimal(value_cents)).quantize(ONE_BASIS_POINT, rounding=ROUND_CEILING)
+        percentage = min(percentage, free)
+        gain = allocate_cents(value_cents, percentage)
+        if not gain:
+            return None
+        new_state = state.copy()
+        new_state.certified[move.category] += gain
+
+        # Take the share from the uncounted entries in breakdown order
+        shares = new_state.donors[move.line_index]
+        reduced = {}
+        remaining = percentage
+        for category in list(shares):
+            if not remaining:
+                break
+            if not shares[category]:
+                continue
+            taken = min(shares[category], remaining)
+            shares[category] -= taken
+            remaining -= taken
+            reduced[category] = shares[category]
+
+        new_state.applied.append((move, {
+            'percentage': percentage,
+            'reduced': reduced,
+            'gain_cents': {move.category: gain}
+        }))
+        return new_state
+
+    # add_subcontractor
+    entry = move.directory
+    if any(a[0].directory is not None and a[0].directory.id == entry.id for a in state.applied):
+        return None
+    certified = [c for c in CATEGORIES if entry.is_certified(c)]
+    amount = 0
+    for goal in unmet:
+        if goal.category not in certified:
+            continue
+        if goal.denominator == SUBCONTRACT_TOTAL and state.subcontract_total and goal.required < HUNDRED:
+            # (m + x) / (s + x) >= r  =>  x >= (r*s - m) / (1 - r)
+            numerator = goal.required * state.subcontract_total - HUNDRED * state.certified[goal.category]
+            needed = numerator / (HUNDRED - goal.required)
+        else:
+            needed = Decimal(state.shortfall_cents(goal))
+        amount = max(amount, int(needed.to_integral_value(rounding=ROUND_CEILING)))
+    if amount <= 0:
+        return None
+
+    # Whole dollars, and never more subcontracted value than the bid itself
+    amount = -(-amount // 100) * 100
+    if state.bid_total:
+        amount = min(amount, state.bid_total - state.subcontract_total)
+    if amount <= 0:
+        return None
+
+    new_state = state.copy()
+    for category in certified:
+        new_state.certified[category] += amount
+    new_state.subcontract_total += amount
+    new_state.applied.append((move, {
+        'subcontract_value_cents': amount,
+        'gain_cents': {c: amount for c in certified}
+    }))
+    return new_state
+
+
+def _rank_key(state: _State, goals: Sequence[Goal], move: Move):
+    """Lower is better: remaining gap, then changes to existing lines before additions, then dollars added"""
+    added = sum(a[1].get('subcontract_value_cents', 0) for a in state.applied)
+    return (state.gap(goals), move.is_addition, added)
+
+
+def _greedy_candidates(moves: Sequence[Move], used: set) -> List[Move]:
+    """Unused additions plus the largest unused line changes of each category"""
+    candidates = []
+    taken: Dict[str, int] = {}
+    for move in moves:
+        if move in used:
+            continue
+        if not move.is_addition:
+            if taken.get(move.category, 0) >= GREEDY_WIDTH:
+                continue
+            taken[move.category] = taken.get(move.category, 0) + 1
+        candidates.append(move)
+    return candidates
+
+
+def _greedy(context, state, goals, moves) -> _State:
+    used = set()
+    for _ in range(MAX_MOVES):
+        if all(state.met(g) for g in goals):
+            break
+        best = None
+        best_key = None
+        best_move = None
+        for move in _greedy_candidates(moves, used):
+            candidate = _apply(context, state, goals, move)
+            if candidate is None:
+                continue
+            key = _rank_key(candidate, goals, move)
+            if best_key is None or key < best_key:
+                best, best_key, best_move = candidate, key, move
+        if best is None or not best.gap(goals) < state.gap(goals):
+            break
+        used.add(best_move)
+        state = best
+    return state
+
+
+def _plan(context, initial, goals, moves: Sequence[Move]) -> Optional[_State]:
+    # Changes to existing lines first, so additions are sized to what is still missing
+    state = initial
+    for move in sorted(moves, key=lambda m: m.is_addition):
+        next_state = _apply(context, state, goals, move)
+        if next_state is None:
+            return None
+        state = next_state
+    return state
+
+
+def _exact(context, initial, goals, moves, best: _State) -> Tuple[_State, bool]:
+    """Search every smaller plan among the best single moves; True if the search was complete"""
+    singles = []
+    for move in moves:
+        after = _apply(context, initial, goals, move)
+        if after is not None:
+            singles.append((_rank_key(after, goals, move), move))
+    singles.sort(key=lambda pair: pair[0])
+
+    pool = [move for _, move in singles[:EXACT_POOL_SIZE]]
+    for move, _ in best.applied:
+        if move not in pool:
+            pool.append(move)
+
+    complete = len(singles) <= EXACT_POOL_SIZE
+
+    for size in range(1, len(best.applied)):
+        found = None
+        found_key = None
+        for combination in combinations(pool, size):
+            state = _plan(context, initial, goals, combination)
+            if state is None or not all(state.met(g) for g in goals):
+                continue
+            key = (sum(m.is_addition for m in combination), _rank_key(state, goals, combination[-1])[2])
+            if found_key is None or key < found_key:
+                found, found_key = state, key
+        if found is not None:
+            return found, complete
+
+    return best, complete
+
+
+def load_addition_candidates(
+    db: Session,
+    context: BidValidationContext,
+    categories: Sequence[str],
+    limit: int = CANDIDATE_LIMIT
+) -> List[DirectoryEntry]:
+    """
+    Directory entries certified for any of the categories that could join the bid
+
+    Entries must share a jurisdiction with the bid (or have one at all when the bid
+    has none) and not already be on it. Entries listing one of the bid's NAICS codes
+    come first, then by rating. Served by the GIN indexes from
+    add_directory_certification_index.sql.
+    """
+    if not categories:
+        return []
+
+    query = db.query(SubcontractorDirectory).filter(
+        or_(*[SubcontractorDirectory.certifications.contains({c: True}) for c in categories])
+    )
+
+    codes = sorted(context.jurisdiction_codes)
+    if codes:
+        query = query.filter(SubcontractorDirectory.jurisdiction_codes.overlap(codes))
+    else:
+        query = query.filter(SubcontractorDirectory.jurisdiction_codes != [])
+
+    names = {line.legal_name for line in context.lines if line.legal_name}
+    if names:
+        query = query.filter(SubcontractorDirectory.legal_name.notin_(names))
+
+    naics = sorted({line.naics_code for line in context.lines if line.naics_code})
+    order = [SubcontractorDirectory.rating.desc().nullslast(), SubcontractorDirectory.id]
+    if naics:
+        order.insert(0, SubcontractorDirectory.naics_codes.overlap(naics).desc().nullslast())
+
+    return [_snapshot_directory(row) for row in query.order_by(*order).limit(limit).all()]
+
+
+@dataclass(frozen=True)
+class GoalPlan:
+    goals: List[Dict]
+    changes: List[Dict]
+    satisfied: bool
+    proven_minimal: bool
+
+
+def optimize_goals(
+    context: BidValidationContext,
+    candidates: Sequence[DirectoryEntry] = (),
+    categories: Optional[Sequence[str]] = None,
+    allow_additions: bool = True
+) -> GoalPlan:
+    """
+    Smallest set of changes found that meets every goal at once
+
+    categories limits the goals considered (default: all). proven_minimal is True
+    when the exhaustive pass covered every candidate move, so no plan with fewer
+    changes exists among them.
+    """
+    goals = _select_goals(context, categories)
+
+    initial = _initial_state(context)
+    unmet = frozenset(g.category for g in goals if not initial.met(g))
+
+    moves = _line_moves(context, initial, unmet)
+    if allow_additions:
+        moves += _addition_moves(candidates, unmet)
+
+    best = initial
+    complete = True
+    if unmet:
+        best = _greedy(context, initial, goals, moves)
+        if not all(best.met(g) for g in goals) or len(best.applied) > EXACT_MAX_MOVES + 1:
+            complete = False
+        elif len(best.applied) > 1:
+            best, complete = _exact(context, initial, goals, moves, best)
+
+    return GoalPlan(
+        goals=[_describe_goal(g, initial, best) for g in goals],
+        changes=[_describe_change(context, move, detail) for move, detail in best.applied],
+        satisfied=all(best.met(g) for g in goals),
+        proven_minimal=complete
+    )
+
+
+def _describe_goal(goal: Goal, before: _State, after: _State) -> Dict:
+    return {
+        'category': goal.category.upper(),
+        'denominator': goal.denominator,
+        'required': goal.required,
+        'sources': list(goal.sources),
+        'current_percentage': before.percentage(goal).quantize(ONE_BASIS_POINT),
+        'projected_percentage': after.percentage(goal).quantize(ONE_BASIS_POINT),
+        'met': after.met(goal)
+    }
+
+
+def _describe_change(context: BidValidationContext, move: Move, detail: Dict) -> Dict:
+    gains = {c.upper(): Decimal(cents) / 100 for c, cents in detail['gain_cents'].items()}
+
+    if move.kind == ADD_SUBCONTRACTOR:
+        entry = move.directory
+        naics = sorted({line.naics_code for line in context.lines if line.naics_code} & set(entry.naics_codes))
+        return {
+            'action': move.kind,
+            'directory_id': entry.id,
+            'legal_name': entry.legal_name,
+            'subcontract_value': Decimal(detail['subcontract_value_cents']) / 100,
+            'naics_code': naics[0] if naics else (entry.naics_codes[0] if entry.naics_codes else None),
+            'counts_toward_mbe': entry.is_certified('mbe'),
+            'gains': gains
+        }
+
+    line = context.lines[move.line_index]
+    change = {
+        'action': move.kind,
+        'bid_subcontractor_id': line.id,
+        'legal_name': line.legal_name,
+        'gains': gains
+    }
+    if move.kind == REALLOCATE:
+        current = sum((p for c, p in line.category_breakdown if c == move.category), Decimal('0'))
+        change['category'] = move.category.upper()
+        change['percentage'] = current + detail['percentage']
+        change['reduced'] = {c.upper(): p for c, p in detail['reduced'].items()}
+    return change
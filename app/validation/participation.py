@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict
+
+# Certification categories tracked for goal calculations
+CATEGORIES = ('mbe', 'vsbe', 'wbe', 'sbe', 'dbe', 'cbe')
+
+# Amount bases
+CLAIMED = 'claimed'        # what the bid allocates to a category, certified or not
+CERTIFIED = 'certified'    # the part of the claim backed by a directory certification
+
+# Percentage denominators
+BID_TOTAL = 'bid_total'
+SUBCONTRACT_TOTAL = 'subcontract_total'  # falls back to the bid total when no subcontract value
+
+
+def to_cents(amount) -> int:
+    """Convert a money amount to integer cents"""
+    if not amount:
+        return 0
+    return int((Decimal(str(amount)) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def allocate_cents(value_cents: int, percentage: Decimal) -> int:
+    """Share of value_cents for a percentage, computed in basis points"""
+    basis_points = int((percentage * 100).to_integral_value(rounding=ROUND_HALF_UP))
+    return (value_cents * basis_points + 5000) // 10000
+
+
+@dataclass(frozen=True)
+class ParticipationLedger:
+    """
+    Per-category participation totals for a bid, in integer cents
+
+    Built in a single pass over the bid lines and shared by every goal rule.
+    For lines with a category breakdown, each entry is claimed for its category
+    and also certified when the directory entry holds that certification.
+    Lines without a breakdown count their full value toward every category the
+    directory certifies (MBE additionally requires counts_toward_mbe).
+    """
+    claimed_cents: Dict[str, int]
+    certified_cents: Dict[str, int]
+    subcontract_total_cents: int
+    bid_total_cents: int
+
+    @classmethod
+    def from_context(cls, context) -> "ParticipationLedger":
+        claimed = dict.fromkeys(CATEGORIES, 0)
+        certified = dict.fromkeys(CATEGORIES, 0)
+        subcontract_total = 0
+
+        for line in context.lines:
+            value_cents = to_cents(line.subcontract_value)
+            subcontract_total += value_cents
+
+            if line.legal_name is None:
+                continue
+
+            directory = line.directory
+
+            if line.category_breakdown:
+                for category, percentage in line.category_breakdown:
+                    if category not in claimed:
+                        continue
+                    allocated = allocate_cents(value_cents, percentage)
+                    claimed[category] += allocated
+                    if directory and directory.is_certified(category):
+                        certified[category] += allocated
+            elif directory:
+                for category in directory.certified_categories:
+                    if category not in claimed:
+                        continue
+                    if category == 'mbe' and not line.counts_toward_mbe:
+                        continue
+                    claimed[category] += value_cents
+                    certified[category] += value_cents
+
+        return cls(
+            claimed_cents=claimed,
+            certified_cents=certified,
+            subcontract_total_cents=subcontract_total,
+            bid_total_cents=to_cents(context.total_amount)
+        )
+
+    def cents(self, category: str, basis: str = CERTIFIED) -> int:
+        totals = self.certified_cents if basis == CERTIFIED else self.claimed_cents
+        return totals.get(category.lower(), 0)
+
+    def amount(self, category: str, basis: str = CERTIFIED) -> Decimal:
+        """Category total in dollars"""
+        return Decimal(self.cents(category, basis)) / 100
+
+    def denominator_cents(self, denominator: str = BID_TOTAL) -> int:
+        if denominator == SUBCONTRACT_TOTAL:
+            return self.subcontract_total_cents or self.bid_total_cents
+        return self.bid_total_cents
+
+    def percentage(
+        self,
+        category: str,
+        basis: str = CERTIFIED,
+        denominator: str = BID_TOTAL
+    ) -> Decimal:
+        """Category participation as a percentage of the chosen denominator"""
+        denominator_cents = self.denominator_cents(denominator)
+        if not denominator_cents:
+            return Decimal('0')
+        return Decimal(self.cents(category, basis)) * 100 / Decimal(denominator_cents)
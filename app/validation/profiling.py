@@ -0,0 +1,137 @@
+"""
+Per-rule timing and SQL profiling for validation runs
+
+ValidationEngine measures every rule it runs: wall time, SQL statements
+executed and rows those statements returned. Samples are kept in a rolling
+window per rule and summarised as percentiles by
+GET /diagnostics/validation-rules.
+
+SQL is counted with SQLAlchemy cursor events. The listeners only do work
+while a measurement is active on the current thread.
+"""
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Samples kept per rule
+WINDOW_SIZE = 1000
+
+# Pseudo rule code for loading the validation context
+CONTEXT_LOAD = "context_load"
+
+
+class Sample(NamedTuple):
+    wall_ms: float
+    statements: int
+    rows: int
+
+
+class _Counter:
+    __slots__ = ("statements", "rows")
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+
+
+_active = threading.local()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    counter = getattr(_active, "counter", None)
+    if counter is not None:
+        counter.statements += 1
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _count_rows(conn, cursor, statement, parameters, context, executemany):
+    counter = getattr(_active, "counter", None)
+    if counter is not None and cursor.description is not None:
+        counter.rows += max(cursor.rowcount, 0)
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class RuleProfiler:
+    """Rolling per-rule samples of wall time, SQL statements and rows fetched"""
+
+    def __init__(self, window: int = WINDOW_SIZE):
+        self.window = window
+        self._samples: Dict[str, Deque[Sample]] = {}
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, code: str, name: Optional[str] = None):
+        """Record one sample for code around the with block"""
+        counter = _Counter()
+        outer = getattr(_active, "counter", None)
+        _active.counter = counter
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            _active.counter = outer
+            if outer is not None:
+                # Nested measurement - the enclosing one sees these statements too
+                outer.statements += counter.statements
+                outer.rows += counter.rows
+            self.record(code, elapsed, counter.statements, counter.rows, name)
+
+    def record(self, code: str, wall_ms: float, statements: int, rows: int, name: Optional[str] = None) -> None:
+        with self._lock:
+            samples = self._samples.get(code)
+            if samples is None:
+                samples = self._samples[code] = deque(maxlen=self.window)
+            samples.append(Sample(wall_ms, statements, rows))
+            if name:
+                self._names[code] = name
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self) -> List[Dict]:
+        """Percentile summary per rule, slowest p95 first"""
+        with self._lock:
+            copies = {code: list(samples) for code, samples in self._samples.items()}
+            names = dict(self._names)
+
+        summary = []
+        for code, samples in copies.items():
+            if not samples:
+                continue
+            wall = sorted(s.wall_ms for s in samples)
+            statements = [s.statements for s in samples]
+            rows = [s.rows for s in samples]
+            summary.append({
+                "rule_code": code,
+                "rule_name": names.get(code),
+                "samples": len(samples),
+                "wall_ms_p50": round(_percentile(wall, 50), 3),
+                "wall_ms_p95": round(_percentile(wall, 95), 3),
+                "wall_ms_p99": round(_percentile(wall, 99), 3),
+                "wall_ms_max": round(wall[-1], 3),
+                "sql_statements_mean": round(sum(statements) / len(statements), 2),
+                "sql_statements_max": max(statements),
+                "rows_fetched_mean": round(sum(rows) / len(rows), 2),
+                "rows_fetched_max": max(rows),
+            })
+
+        summary.sort(key=lambda entry: entry["wall_ms_p95"], reverse=True)
+        return summary
+
+
+rule_profiler = RuleProfiler()
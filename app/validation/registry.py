@@ -0,0 +1,121 @@
+"""
+Registry of the validation rules the engine runs
+
+Rules are ordered by cost tier, cheapest first, and by registration order
+within a tier; that is also the order of the stored results. Each rule declares
+what it depends on (see RuleDependencies), and the engine only evaluates the
+rules that apply to a given bid; the others record their skipped_result, if
+they have one. Rules can be registered
+or unregistered at runtime; the registry signature is part of the validation
+cache key, so cached results are recomputed after any change.
+"""
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.validation.context import BidValidationContext
+from app.validation.messages import RULE_NAMES
+from app.validation.rules import ALL_RULES, RULESET_VERSION, ValidationRule
+
+
+class RuleRegistry:
+    """Ordered, thread-safe set of validation rules keyed by rule code"""
+
+    def __init__(self, rules: Iterable[ValidationRule] = ()):
+        self._lock = threading.Lock()
+        self._rules: Tuple[ValidationRule, ...] = ()
+        self._names: Dict[str, str] = {}
+        self._signature = ""
+        for rule in rules:
+            self.register(rule)
+
+    def __getstate__(self):
+        # Sent to bulk revalidation workers - locks do not pickle
+        return {"_rules": self._rules, "_names": self._names, "_signature": self._signature}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self) -> Tuple[ValidationRule, ...]:
+        return self._rules
+
+    @property
+    def signature(self) -> str:
+        """Identifies the registered rule set, including RULESET_VERSION"""
+        return self._signature
+
+    def get(self, code: str) -> Optional[ValidationRule]:
+        for rule in self._rules:
+            if rule.code == code:
+                return rule
+        return None
+
+    def rule_name(self, code: Optional[str]) -> Optional[str]:
+        """
+        Name of a rule code seen by this registry, falling back to RULE_NAMES
+
+        Names are kept after a rule is unregistered, since stored results still refer to it.
+        """
+        if not code:
+            return None
+        return self._names.get(code) or RULE_NAMES.get(code)
+
+    def register(self, rule: ValidationRule, before: Optional[str] = None) -> None:
+        """
+        Add a rule, or replace the registered rule with the same code
+
+        before: code of an existing rule to insert in front of (default: append).
+        Rules are still ordered by cost tier, so this only orders rules within a tier.
+        """
+        with self._lock:
+            rules = [r for r in self._rules if r.code != rule.code]
+
+            index = len(rules)
+            if before:
+                codes = [r.code for r in rules]
+                if before not in codes:
+                    raise ValueError(f"Rule {before} is not registered")
+                index = codes.index(before)
+
+            rules.insert(index, rule)
+            self._names[rule.code] = rule.name
+            self._set_rules(rules)
+
+    def unregister(self, code: str) -> bool:
+        with self._lock:
+            rules = [r for r in self._rules if r.code != code]
+            if len(rules) == len(self._rules):
+                return False
+            self._set_rules(rules)
+            return True
+
+    def applicable(self, context: BidValidationContext) -> List[Tuple[int, ValidationRule, Optional[Dict]]]:
+        """
+        (position, rule, skipped) for each registered rule with a result for the bid
+
+        skipped is None for a rule that applies and must be evaluated. For a rule
+        that does not apply it is the rule's skipped_result; rules without one
+        are left out.
+        """
+        selected = []
+        for position, rule in enumerate(self._rules):
+            if rule.applies_to(context):
+                selected.append((position, rule, None))
+                continue
+            skipped = rule.skipped_result(context)
+            if skipped is not None:
+                selected.append((position, rule, skipped))
+        return selected
+
+    def _set_rules(self, rules: List[ValidationRule]) -> None:
+        # Readers take the tuple reference without locking, so swap it in whole.
+        # sorted() is stable, so registration order is kept within a tier.
+        self._rules = tuple(sorted(rules, key=lambda r: r.cost_tier))
+        key = RULESET_VERSION + "|" + ",".join(f"{r.code}:{r.version}" for r in self._rules)
+        self._signature = hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+# The rules the engine runs - starts with ALL_RULES
+registry = RuleRegistry(ALL_RULES)
@@ -0,0 +1,267 @@
+"""
+Compiled compliance rule definitions
+
+ComplianceRule.rule_definition is a small declarative language:
+
+    {
+        "threshold": 29.0,                       # minimum participation percentage
+        "categories": ["MBE"],                   # categories summed toward the threshold
+        "denominator": "subcontract_total",      # or "bid_total"
+        "basis": "claimed",                      # or "certified" (backed by directory certifications)
+        "severity": "ERROR",                     # overrides the rule's severity column
+        "when": {                                # the rule only applies if every condition holds
+            "contract_value": {"gte": 1000000},  # bid total_amount; gt, gte, lt, lte
+            "naics": ["2382", "236"]             # any bid line's NAICS code starts with one of these
+        },
+        "description": "..."                     # free text, ignored
+    }
+
+Every key is optional. Defaults reproduce the original behaviour: MBE, VSBE
+and DBE rules check their own category on the claimed basis (MBE against the
+subcontract total, the others against the bid total), and other rule types
+such as LOCAL_PREF never produce a finding unless they name categories.
+
+Definitions are compiled once into plain callables and cached per rule id and
+definition content. ComplianceRuleService invalidates the cache on writes.
+"""
+import json
+import threading
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.validation.context import BidValidationContext, RuleSnapshot
+from app.validation.messages import Finding, finding
+from app.validation.participation import (
+    BID_TOTAL,
+    CATEGORIES,
+    CERTIFIED,
+    CLAIMED,
+    SUBCONTRACT_TOTAL
+)
+
+DEFINITION_KEYS = {'threshold', 'categories', 'denominator', 'basis', 'severity', 'when', 'description'}
+CONDITION_KEYS = {'contract_value', 'naics'}
+COMPARISONS = {
+    'gt': lambda value, bound: value > bound,
+    'gte': lambda value, bound: value >= bound,
+    'lt': lambda value, bound: value < bound,
+    'lte': lambda value, bound: value <= bound,
+}
+SEVERITIES = {'ERROR', 'WARNING'}
+
+# Rule types that check their own category when the definition names none
+DEFAULT_CATEGORIES = {'MBE': ('mbe',), 'VSBE': ('vsbe',), 'DBE': ('dbe',)}
+DEFAULT_DENOMINATORS = {'MBE': SUBCONTRACT_TOTAL}
+
+Condition = Callable[[BidValidationContext], bool]
+Check = Callable[[BidValidationContext], Optional[Finding]]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_name: str
+    severity: str
+    condition: Optional[Condition]
+    check: Optional[Check]
+
+    def evaluate(self, context: BidValidationContext) -> Optional[Finding]:
+        """Finding if the rule applies and is not met, otherwise None"""
+        if self.check is None:
+            return None
+        if self.condition is not None and not self.condition(context):
+            return None
+        return self.check(context)
+
+
+def _decimal(value, field: str) -> Decimal:
+    if isinstance(value, bool):
+        raise ValueError(f"{field} must be a number")
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+
+
+def _compile_contract_value(spec) -> Condition:
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError("when.contract_value must be an object such as {\"gte\": 1000000}")
+
+    bounds = []
+    for op, bound in spec.items():
+        if op not in COMPARISONS:
+            raise ValueError(f"when.contract_value: unknown comparison '{op}', use one of {sorted(COMPARISONS)}")
+        bounds.append((COMPARISONS[op], _decimal(bound, f"when.contract_value.{op}")))
+
+    def condition(context: BidValidationContext) -> bool:
+        value = context.total_amount or Decimal('0')
+        return all(compare(value, bound) for compare, bound in bounds)
+
+    return condition
+
+
+def _compile_naics(spec) -> Condition:
+    if isinstance(spec, str):
+        spec = [spec]
+    if not isinstance(spec, list) or not spec or not all(isinstance(p, str) and p for p in spec):
+        raise ValueError("when.naics must be a NAICS code prefix or a list of them")
+
+    prefixes = tuple(spec)
+
+    def condition(context: BidValidationContext) -> bool:
+        return any(
+            line.naics_code and line.naics_code.startswith(prefixes)
+            for line in context.lines
+        )
+
+    return condition
+
+
+def _compile_when(spec) -> Optional[Condition]:
+    if spec is None:
+        return None
+    if not isinstance(spec, dict):
+        raise ValueError("when must be an object")
+
+    unknown = set(spec) - CONDITION_KEYS
+    if unknown:
+        raise ValueError(f"when: unknown condition(s) {sorted(unknown)}, use {sorted(CONDITION_KEYS)}")
+
+    conditions = []
+    if 'contract_value' in spec:
+        conditions.append(_compile_contract_value(spec['contract_value']))
+    if 'naics' in spec:
+        conditions.append(_compile_naics(spec['naics']))
+
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+
+    def condition(context: BidValidationContext) -> bool:
+        return all(c(context) for c in conditions)
+
+    return condition
+
+
+def _compile_categories(rule_type: str, spec) -> Tuple[str, ...]:
+    if spec is None:
+        return DEFAULT_CATEGORIES.get((rule_type or '').upper(), ())
+
+    if isinstance(spec, str):
+        spec = [spec]
+    if not isinstance(spec, list) or not spec:
+        raise ValueError("categories must be a category or a non-empty list of categories")
+
+    categories = []
+    for category in spec:
+        key = str(category).lower()
+        if key not in CATEGORIES:
+            raise ValueError(f"Unknown category '{category}', use one of {[c.upper() for c in CATEGORIES]}")
+        if key not in categories:
+            categories.append(key)
+    return tuple(categories)
+
+
+def compile_definition(
+    rule_name: str,
+    rule_type: str,
+    definition: Optional[Dict],
+    severity: Optional[str] = 'ERROR'
+) -> CompiledRule:
+    """
+    Compile a rule definition into a CompiledRule
+
+    Raises ValueError describing the first problem found.
+    """
+    definition = definition or {}
+    if not isinstance(definition, dict):
+        raise ValueError("rule_definition must be an object")
+
+    unknown = set(definition) - DEFINITION_KEYS
+    if unknown:
+        raise ValueError(f"rule_definition: unknown key(s) {sorted(unknown)}, use {sorted(DEFINITION_KEYS)}")
+
+    severity = str(definition.get('severity') or severity or 'ERROR').upper()
+    if severity not in SEVERITIES:
+        raise ValueError(f"severity must be one of {sorted(SEVERITIES)}")
+
+    threshold = _decimal(definition.get('threshold', 0), 'threshold')
+
+    denominator = definition.get('denominator') or DEFAULT_DENOMINATORS.get((rule_type or '').upper(), BID_TOTAL)
+    if denominator not in (BID_TOTAL, SUBCONTRACT_TOTAL):
+        raise ValueError(f"denominator must be '{BID_TOTAL}' or '{SUBCONTRACT_TOTAL}'")
+
+    basis = definition.get('basis') or CLAIMED
+    if basis not in (CLAIMED, CERTIFIED):
+        raise ValueError(f"basis must be '{CLAIMED}' or '{CERTIFIED}'")
+
+    categories = _compile_categories(rule_type, definition.get('categories'))
+    condition = _compile_when(definition.get('when'))
+
+    if not categories:
+        return CompiledRule(rule_name, severity, condition, None)
+
+    label = "+".join(c.upper() for c in categories)
+
+    def check(context: BidValidationContext) -> Optional[Finding]:
+        if not context.total_amount:
+            return None
+
+        ledger = context.participation
+        denominator_cents = ledger.denominator_cents(denominator)
+        if not denominator_cents:
+            percentage = Decimal('0')
+        else:
+            cents = sum(ledger.cents(c, basis) for c in categories)
+            percentage = Decimal(cents) * 100 / Decimal(denominator_cents)
+
+        if percentage < threshold:
+            return finding(
+                "JCR_BELOW",
+                rule_name=rule_name,
+                category=label,
+                actual=f"{percentage:.2f}",
+                required=threshold
+            )
+        return None
+
+    return CompiledRule(rule_name, severity, condition, check)
+
+
+_cache: Dict[UUID, Tuple[str, CompiledRule]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_key(rule: RuleSnapshot) -> str:
+    return json.dumps(
+        [rule.rule_name, rule.rule_type, rule.severity, rule.rule_definition],
+        sort_keys=True,
+        default=str
+    )
+
+
+def get_compiled_rule(rule: RuleSnapshot) -> CompiledRule:
+    """Compiled form of a rule snapshot, compiled on first use (may raise ValueError)"""
+    key = _cache_key(rule)
+
+    cached = _cache.get(rule.id)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    compiled = compile_definition(rule.rule_name, rule.rule_type, rule.rule_definition, rule.severity)
+
+    with _cache_lock:
+        _cache[rule.id] = (key, compiled)
+
+    return compiled
+
+
+def invalidate_compiled_rule(rule_id: Optional[UUID] = None) -> None:
+    """Drop one compiled rule, or all of them when rule_id is None"""
+    with _cache_lock:
+        if rule_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(rule_id, None)
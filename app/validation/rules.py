@@ -1,863 +1,620 @@
-from typing import List, Dict
-from sqlalchemy.orm import Session
-from app.models import (
-    Bid,
-    BidSubcontractor,
-    Subcontractor,
-    Certification,
-    NAICSCode,
-    Jurisdiction,
-    ComplianceRule,
-    SubcontractorDirectory
-)
+from dataclasses import dataclass
 from decimal import Decimal
-import json
+from typing import Dict, FrozenSet, Optional
+from app.config import settings
+from app.validation.context import BidValidationContext
+from app.validation.participation import (
+    CATEGORIES,
+    CERTIFIED,
+    BID_TOTAL,
+    SUBCONTRACT_TOTAL
+)
+from app.validation.messages import Finding, finding
+from app.validation.rule_definitions import get_compiled_rule
+from app.validation.trace import NULL_TRACE, NullTrace
+
+# Context data a rule can require before it is worth running
+REQUIRES_LINES = 'lines'                        # at least one bid subcontractor
+REQUIRES_TOTAL_AMOUNT = 'total_amount'          # non-zero bid total
+REQUIRES_JURISDICTIONS = 'jurisdictions'        # at least one resolved jurisdiction
+REQUIRES_COMPLIANCE_RULES = 'compliance_rules'  # at least one compliance rule
+
+
+# Cost tiers - rules run cheapest first, and quick mode stops at the first failure
+COST_DIRECTORY = 0   # directory existence lookups
+COST_FLAGS = 1       # certification flags and code lists per subcontractor
+COST_GOALS = 2       # participation totals and percentage goals
+
+
+@dataclass(frozen=True)
+class RuleDependencies:
+    """
+    What a validation rule depends on
+
+    requires: context data that must be present, see REQUIRES_* above
+    """
+    requires: FrozenSet[str] = frozenset()
+
+    def satisfied_by(self, context: BidValidationContext) -> bool:
+        for requirement in self.requires:
+            if requirement == REQUIRES_LINES and not context.lines:
+                return False
+            if requirement == REQUIRES_TOTAL_AMOUNT and not context.total_amount:
+                return False
+            if requirement == REQUIRES_JURISDICTIONS and not context.jurisdictions:
+                return False
+            if requirement == REQUIRES_COMPLIANCE_RULES and not context.compliance_rules:
+                return False
+
+        return True
+
 
 class ValidationRule:
-    """Base class for validation rules"""
+    """
+    Base class for validation rules
+
+    validate() returns {"status": ..., "findings": [(message_code, params), ...]}.
+    Messages are rendered from app.validation.messages templates when read.
+
+    Rules report what they checked to the trace passed by the engine instead of
+    printing; the default NULL_TRACE discards it.
+
+    depends_on tells the rule registry when the rule can apply; bids that do not
+    satisfy it skip validate() and record skipped_result() instead, or nothing
+    when that is None. cost_tier orders rules cheapest first.
+    Bump version when a rule's logic changes so cached validation results are
+    recomputed.
+    """
+
+    depends_on = RuleDependencies()
+    cost_tier = COST_GOALS
+    version = 1
 
-    def __init__(self, name: str, description: str):
+    def __init__(self, name: str, code: str, description: str):
         self.name = name
+        self.code = code
         self.description = description
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
+    def applies_to(self, context: BidValidationContext) -> bool:
+        return self.depends_on.satisfied_by(context)
+
+    def skipped_result(self, context: BidValidationContext) -> Optional[Dict]:
+        """Result recorded for a bid that does not satisfy depends_on; None leaves the rule out"""
+        return None
+
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
         """Override this method in subclasses"""
         raise NotImplementedError
 
+    @staticmethod
+    def _result(status: str, *findings: Finding) -> Dict:
+        return {"status": status, "findings": list(findings)}
+
 
 class DirectoryJurisdictionMatchRule(ValidationRule):
     """Check if subcontractor exists in directory DB and has jurisdiction codes"""
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_LINES}))
+    cost_tier = COST_DIRECTORY
+
     def __init__(self):
         super().__init__(
             "directory_jurisdiction_match",
+            "DJM",
             "Verify subcontractor exists in directory DB with valid jurisdiction codes"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        print(f"\n=== DEBUG: DirectoryJurisdictionMatchRule ===")
-        print(f"Bid ID: {bid.id}")
-
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
         errors = []
 
         # Check each bid subcontractor against the directory DB
-        print(f"\nNumber of bid subcontractors: {len(bid.bid_subcontractors)}")
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
-                errors.append(f"Subcontractor not found: {bid_sub.subcontractor_id}")
+        for line in context.lines:
+            if line.legal_name is None:
+                trace.step("subcontractor_missing", subcontractor_id=line.subcontractor_id)
+                errors.append(finding("SUB_NOT_FOUND", subcontractor_id=line.subcontractor_id))
                 continue
 
-            print(f"\nChecking subcontractor: {subcontractor.legal_name}")
-
             # PRIMARY CHECK: Look up in directory DB
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            print(f"  Directory entry found: {directory_entry is not None}")
-            if directory_entry:
-                print(f"  Directory jurisdiction_codes: {directory_entry.jurisdiction_codes}")
-            else:
-                print(f"  NOT FOUND in subcontractor_directory table")
+            directory_entry = line.directory
 
             # FAIL if subcontractor not found in directory DB
             if not directory_entry:
-                errors.append(
-                    f"{subcontractor.legal_name} not found in directory DB - FAIL"
-                )
-                print(f"  FAIL: Not in directory")
+                trace.step("directory_lookup", name=line.legal_name, found=False, passed=False)
+                errors.append(finding("DIR_NOT_FOUND_FAIL", name=line.legal_name))
                 continue
 
+            trace.step(
+                "directory_lookup",
+                name=line.legal_name,
+                found=True,
+                jurisdiction_codes=directory_entry.jurisdiction_codes,
+                passed=bool(directory_entry.jurisdiction_codes)
+            )
+
             # Check if jurisdiction codes exist in directory DB
-            if not directory_entry.jurisdiction_codes or len(directory_entry.jurisdiction_codes) == 0:
+            if not directory_entry.jurisdiction_codes:
                 # FAIL if no jurisdiction codes in directory DB
-                errors.append(
-                    f"{subcontractor.legal_name} has no jurisdiction codes in directory DB - FAIL"
-                )
-                print(f"  FAIL: No jurisdiction codes in directory")
-            else:
-                # PASS - subcontractor exists and has jurisdiction codes
-                print(f"  PASS: Has jurisdiction codes: {', '.join(directory_entry.jurisdiction_codes)}")
+                errors.append(finding("DIR_NO_JURISDICTIONS", name=line.legal_name))
 
         if errors:
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
 
-        return {
-            "status": "PASS",
-            "error_message": "All subcontractors exist in directory DB with valid jurisdiction codes"
-        }
+        return self._result("PASS", finding("DIR_OK"))
 
 
 class CertificationExistsRule(ValidationRule):
     """Check if subcontractor certification exists in directory DB"""
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_LINES}))
+    cost_tier = COST_FLAGS
+
     def __init__(self):
         super().__init__(
             "certification_exists",
+            "CRT",
             "Verify subcontractor has valid certification in directory DB"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
         errors = []
 
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
-                errors.append(f"Subcontractor not found: {bid_sub.subcontractor_id}")
+        for line in context.lines:
+            if line.legal_name is None:
+                trace.step("subcontractor_missing", subcontractor_id=line.subcontractor_id)
+                errors.append(finding("SUB_NOT_FOUND", subcontractor_id=line.subcontractor_id))
                 continue
 
             # PRIMARY CHECK: Look up certifications in directory DB
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
+            directory_entry = line.directory
 
             if not directory_entry:
-                errors.append(
-                    f"{subcontractor.legal_name} not found in directory DB"
-                )
+                trace.step("directory_lookup", name=line.legal_name, found=False, passed=False)
+                errors.append(finding("DIR_NOT_FOUND", name=line.legal_name))
                 continue
 
+            trace.step(
+                "certification_check",
+                name=line.legal_name,
+                counts_toward_mbe=line.counts_toward_mbe,
+                certified_categories=directory_entry.certified_categories
+            )
+
             # Check certifications from directory DB
-            if bid_sub.counts_toward_mbe:
-                if directory_entry.certifications:
+            if line.counts_toward_mbe:
+                if directory_entry.has_certifications:
                     # Check if MBE certification exists in directory
-                    if not directory_entry.certifications.get('mbe', False):
-                        errors.append(
-                            f"{subcontractor.legal_name} is marked as MBE but has no MBE certification in directory DB"
-                        )
+                    if not directory_entry.is_certified('mbe'):
+                        errors.append(finding("CERT_NO_MBE", name=line.legal_name))
                 else:
-                    errors.append(
-                        f"{subcontractor.legal_name} is marked as MBE but has no certifications in directory DB"
-                    )
+                    errors.append(finding("CERT_NONE", name=line.legal_name))
 
         if errors:
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
 
-        return {
-            "status": "PASS",
-            "error_message": "All subcontractors have valid certifications in directory DB"
-        }
+        return self._result("PASS", finding("CERT_OK"))
 
 
 class NAICSCodeValidRule(ValidationRule):
     """Check NAICS codes from directory DB"""
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_LINES}))
+    cost_tier = COST_FLAGS
+
     def __init__(self):
         super().__init__(
             "naics_code_valid",
+            "NCV",
             "Verify NAICS codes from directory DB"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        print(f"\n=== DEBUG: NAICSCodeValidRule ===")
-        print(f"Bid ID: {bid.id}")
-
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
         errors = []
 
-        print(f"Number of bid subcontractors to check: {len(bid.bid_subcontractors)}")
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
-                errors.append(f"Subcontractor not found: {bid_sub.subcontractor_id}")
+        for line in context.lines:
+            if line.legal_name is None:
+                trace.step("subcontractor_missing", subcontractor_id=line.subcontractor_id)
+                errors.append(finding("SUB_NOT_FOUND", subcontractor_id=line.subcontractor_id))
                 continue
 
-            print(f"\nChecking NAICS for: {subcontractor.legal_name}")
-            print(f"  NAICS code in bid_subcontractor: '{bid_sub.naics_code}'")
-
             # Check if NAICS code is provided in bid_subcontractor
-            if not bid_sub.naics_code or bid_sub.naics_code.strip() == '':
-                print(f"  FAIL: No NAICS code assigned in bid")
-                errors.append(
-                    f"{subcontractor.legal_name} has no NAICS code assigned in bid"
-                )
+            if not line.naics_code or line.naics_code.strip() == '':
+                trace.step("naics_check", name=line.legal_name, naics_code=line.naics_code, passed=False)
+                errors.append(finding("NAICS_MISSING", name=line.legal_name))
                 continue
 
             # PRIMARY CHECK: Look up NAICS in directory DB
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            print(f"  Directory entry found: {directory_entry is not None}")
-            if directory_entry:
-                print(f"  Directory NAICS codes: {directory_entry.naics_codes}")
-                print(f"  Type of directory naics_codes: {type(directory_entry.naics_codes)}")
-            else:
-                print(f"  NOT FOUND in subcontractor_directory table")
+            directory_entry = line.directory
 
             if not directory_entry:
-                errors.append(
-                    f"{subcontractor.legal_name} not found in directory DB"
-                )
+                trace.step("directory_lookup", name=line.legal_name, found=False, passed=False)
+                errors.append(finding("DIR_NOT_FOUND", name=line.legal_name))
                 continue
 
+            listed = line.naics_code in directory_entry.naics_codes
+            trace.step(
+                "naics_check",
+                name=line.legal_name,
+                naics_code=line.naics_code,
+                directory_codes=directory_entry.naics_codes,
+                passed=listed
+            )
+
             # Check NAICS code from directory DB
             if directory_entry.naics_codes:
-                print(f"  Checking if '{bid_sub.naics_code}' in {directory_entry.naics_codes}")
-                if bid_sub.naics_code not in directory_entry.naics_codes:
-                    print(f"  FAIL: NAICS code not in directory list")
-                    errors.append(
-                        f"NAICS code '{bid_sub.naics_code}' not listed in directory DB for {subcontractor.legal_name}. Directory has: {directory_entry.naics_codes}"
-                    )
-                else:
-                    print(f"  PASS: NAICS code found in directory")
+                if not listed:
+                    errors.append(finding(
+                        "NAICS_NOT_LISTED",
+                        naics_code=line.naics_code,
+                        name=line.legal_name,
+                        directory_codes=list(directory_entry.naics_codes)
+                    ))
             else:
-                print(f"  FAIL: No NAICS codes in directory")
-                errors.append(
-                    f"{subcontractor.legal_name} has no NAICS codes in directory DB"
-                )
+                errors.append(finding("NAICS_DIR_EMPTY", name=line.legal_name))
 
         if errors:
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
 
-        return {
-            "status": "PASS",
-            "error_message": "All NAICS codes match directory DB"
-        }
+        return self._result("PASS", finding("NAICS_OK"))
 
 
 class JurisdictionComplianceRule(ValidationRule):
     """
     Check compliance with jurisdiction-specific rules from compliance_rules table
     Gets jurisdiction codes from subcontractor_directory and validates against those rules
+
+    Bids without jurisdictions or compliance rules get a "cannot verify" WARNING
+    without being evaluated.
     """
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_JURISDICTIONS, REQUIRES_COMPLIANCE_RULES}))
+
     def __init__(self):
         super().__init__(
             "jurisdiction_compliance",
+            "JCR",
             "Verify compliance with jurisdiction-specific requirements from directory DB"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        print(f"\n=== DEBUG: JurisdictionComplianceRule ===")
-        print(f"Bid ID: {bid.id}")
-        print(f"Bid total_amount: {bid.total_amount}")
-
-        # Collect all unique jurisdiction codes from subcontractors in directory
-        jurisdiction_codes = set()
-
-        print(f"\nNumber of bid subcontractors: {len(bid.bid_subcontractors)}")
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
-                print(f"  WARNING: Subcontractor {bid_sub.subcontractor_id} not found")
-                continue
-
-            print(f"\nChecking subcontractor: {subcontractor.legal_name}")
-
-            # Get jurisdiction codes from directory
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            if directory_entry and directory_entry.jurisdiction_codes:
-                print(f"  Directory jurisdiction_codes: {directory_entry.jurisdiction_codes}")
-                jurisdiction_codes.update(directory_entry.jurisdiction_codes)
-            else:
-                print(f"  WARNING: No directory entry or jurisdiction codes for {subcontractor.legal_name}")
+    def skipped_result(self, context: BidValidationContext) -> Optional[Dict]:
+        jurisdiction_codes = context.jurisdiction_codes
 
         if not jurisdiction_codes:
-            print("\nRESULT: No jurisdiction codes found in directory - returning WARNING")
-            return {
-                "status": "WARNING",
-                "error_message": "Cannot verify jurisdiction-specific compliance: no jurisdiction codes found in directory"
-            }
+            return self._result("WARNING", finding("JCR_NO_CODES"))
 
-        print(f"\nUnique jurisdiction codes found: {list(jurisdiction_codes)}")
+        if not context.jurisdictions:
+            return self._result(
+                "WARNING",
+                finding("JCR_NO_JURISDICTIONS", codes=', '.join(sorted(jurisdiction_codes)))
+            )
 
-        # Get all compliance rules for these jurisdictions
-        jurisdictions = db.query(Jurisdiction).filter(
-            Jurisdiction.code.in_(list(jurisdiction_codes))
-        ).all()
+        return self._result(
+            "WARNING",
+            finding("JCR_NO_RULES", codes=', '.join([j.code for j in context.jurisdictions]))
+        )
 
-        print(f"Jurisdictions found in DB: {[j.code for j in jurisdictions]}")
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
+        # Jurisdictions for the directory codes were preloaded with the context
+        jurisdictions = context.jurisdictions
 
-        if not jurisdictions:
-            print("RESULT: No matching jurisdictions found in DB - returning WARNING")
-            return {
-                "status": "WARNING",
-                "error_message": f"No jurisdiction records found for codes: {', '.join(jurisdiction_codes)}"
-            }
+        trace.step(
+            "jurisdictions",
+            codes=context.jurisdiction_codes,
+            found=[j.code for j in jurisdictions] if trace.enabled else None
+        )
 
         # Collect all compliance rules for these jurisdictions
         all_compliance_rules = []
         for jurisdiction in jurisdictions:
-            compliance_rules = db.query(ComplianceRule).filter(
-                ComplianceRule.jurisdiction_id == jurisdiction.id
-            ).all()
-
-            print(f"\nCompliance rules for {jurisdiction.code} ({jurisdiction.name}):")
-            for rule in compliance_rules:
-                print(f"  - {rule.rule_name} (type: {rule.rule_type}, severity: {rule.severity})")
-                print(f"    Definition: {rule.rule_definition}")
-
-            all_compliance_rules.extend(compliance_rules)
-
-        if not all_compliance_rules:
-            print("\nRESULT: No compliance rules found - returning WARNING")
-            return {
-                "status": "WARNING",
-                "error_message": f"No compliance rules found for jurisdictions: {', '.join([j.code for j in jurisdictions])}"
-            }
-
-        print(f"\nTotal compliance rules to check: {len(all_compliance_rules)}")
+            all_compliance_rules.extend(context.rules_for(jurisdiction))
 
         errors = []
         warnings = []
 
         for rule in all_compliance_rules:
-            print(f"\nChecking rule: {rule.rule_name} ({rule.rule_type})")
-            result = self._check_rule(bid, rule, db)
+            try:
+                compiled = get_compiled_rule(rule)
+            except ValueError as e:
+                # Stored definitions are validated on write; this only catches rows edited by hand
+                trace.step("compliance_rule", rule_name=rule.rule_name, rule_type=rule.rule_type, error=str(e))
+                warnings.append(finding("JCR_INVALID_DEFINITION", rule_name=rule.rule_name, error=e))
+                continue
+
+            result = compiled.evaluate(context)
+            trace.step(
+                "compliance_rule",
+                rule_name=rule.rule_name,
+                rule_type=rule.rule_type,
+                severity=compiled.severity,
+                definition=rule.rule_definition,
+                passed=result is None,
+                finding=result
+            )
             if result:
-                print(f"  FAILED: {result}")
-                if rule.severity == "ERROR":
+                if compiled.severity == "ERROR":
                     errors.append(result)
                 else:
                     warnings.append(result)
-            else:
-                print(f"  PASSED")
 
         if errors:
-            print(f"\nRESULT: FAIL with {len(errors)} error(s)")
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
         elif warnings:
-            print(f"\nRESULT: WARNING with {len(warnings)} warning(s)")
-            return {
-                "status": "WARNING",
-                "error_message": "; ".join(warnings)
-            }
-
-        print("\nRESULT: PASS - All compliance rules satisfied")
-        return {
-            "status": "PASS",
-            "error_message": "All jurisdiction-specific compliance rules satisfied"
-        }
-    
-    def _check_rule(self, bid: Bid, rule: ComplianceRule, db: Session) -> str:
-        """Check a specific compliance rule using directory DB"""
-        rule_def = rule.rule_definition
-
-        if rule.rule_type == "MBE":
-            return self._check_mbe_rule(bid, rule, rule_def, db)
-        elif rule.rule_type == "VSBE":
-            return self._check_vsbe_rule(bid, rule, rule_def, db)
-        elif rule.rule_type == "LOCAL_PREF":
-            return self._check_local_preference_rule(bid, rule, rule_def)
-        elif rule.rule_type == "DBE":
-            return self._check_dbe_rule(bid, rule, rule_def, db)
-
-        return None
-    
-    def _check_mbe_rule(self, bid: Bid, rule: ComplianceRule, rule_def: dict, db: Session) -> str:
-        """Check MBE compliance rule - using breakdown data when available"""
-        threshold = Decimal(str(rule_def.get('threshold', 0)))
-        print(f"    MBE Rule - Threshold: {threshold}%")
-
-        if not bid.total_amount or bid.total_amount == 0:
-            print(f"    WARNING: Bid total_amount is 0 or None, skipping MBE check")
-            return None
-
-        mbe_total = Decimal('0')
-        mbe_count = 0
-
-        for bs in bid.bid_subcontractors:
-            subcontractor = bs.subcontractor
-            if not subcontractor:
-                continue
-
-            print(f"    Checking {subcontractor.legal_name}: value=${bs.subcontract_value}")
-
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            # Check if breakdown data exists
-            if bs.category_breakdown:
-                print(f"      Using category breakdown: {bs.category_breakdown}")
-                # Use breakdown to calculate MBE portion - NO certification check needed when using breakdown
-                for entry in bs.category_breakdown:
-                    if entry.get('category', '').lower() == 'mbe':
-                        percentage = Decimal(str(entry.get('percentage', 0)))
-                        allocated_amount = bs.subcontract_value * (percentage / Decimal('100'))
-                        mbe_total += allocated_amount
-                        mbe_count += 1
-                        print(f"      ✓ Allocated ${allocated_amount} ({percentage}%) to MBE from breakdown")
-                        break
-            elif bs.counts_toward_mbe:
-                # Fallback: use counts_toward_mbe flag (old behavior)
-                if directory_entry and directory_entry.certifications:
-                    has_mbe = directory_entry.certifications.get('mbe', False)
-                    print(f"      Directory MBE certification: {has_mbe}")
-                    if has_mbe:
-                        mbe_total += bs.subcontract_value
-                        mbe_count += 1
-                        print(f"      ✓ Counted full amount toward MBE total")
-                else:
-                    print(f"      ✗ No directory entry or certifications")
-
-        subcontract_sum = sum(bs.subcontract_value for bs in bid.bid_subcontractors)
-        denominator = subcontract_sum or bid.total_amount
-        mbe_percentage = (mbe_total / denominator) * 100
-        print(f"    MBE Total: ${mbe_total} ({mbe_count} entries)")
-        print(f"    MBE Percentage: {mbe_percentage:.2f}% (required: {threshold}%)")
-
-        if mbe_percentage < threshold:
-            return f"{rule.rule_name}: MBE participation {mbe_percentage:.2f}% is below required {threshold}%"
-
-        return None
-    
-    def _check_vsbe_rule(self, bid: Bid, rule: ComplianceRule, rule_def: dict, db: Session) -> str:
-        """Check VSBE compliance rule - using breakdown data when available"""
-        threshold = Decimal(str(rule_def.get('threshold', 0)))
-        print(f"    VSBE Rule - Threshold: {threshold}%")
-
-        if not bid.total_amount or bid.total_amount == 0:
-            print(f"    WARNING: Bid total_amount is 0 or None, skipping VSBE check")
-            return None
-
-        vsbe_total = Decimal('0')
-        vsbe_count = 0
-
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = bid_sub.subcontractor
-            if not subcontractor:
-                continue
-
-            print(f"    Checking {subcontractor.legal_name}: value=${bid_sub.subcontract_value}")
-
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            # Check if breakdown data exists
-            if bid_sub.category_breakdown:
-                print(f"      Using category breakdown: {bid_sub.category_breakdown}")
-                # Use breakdown to calculate VSBE portion - NO certification check needed when using breakdown
-                for entry in bid_sub.category_breakdown:
-                    if entry.get('category', '').lower() == 'vsbe':
-                        percentage = Decimal(str(entry.get('percentage', 0)))
-                        allocated_amount = bid_sub.subcontract_value * (percentage / Decimal('100'))
-                        vsbe_total += allocated_amount
-                        vsbe_count += 1
-                        print(f"      ✓ Allocated ${allocated_amount} ({percentage}%) to VSBE from breakdown")
-                        break
-            else:
-                # Fallback: check directory certifications (old behavior)
-                if directory_entry and directory_entry.certifications:
-                    has_vsbe = directory_entry.certifications.get('vsbe', False)
-                    print(f"      Directory VSBE certification: {has_vsbe}")
-                    if has_vsbe:
-                        vsbe_total += bid_sub.subcontract_value
-                        vsbe_count += 1
-                        print(f"      ✓ Counted full amount toward VSBE total")
-                else:
-                    print(f"      ✗ No directory entry or certifications")
-
-        vsbe_percentage = (vsbe_total / bid.total_amount) * 100
-        print(f"    VSBE Total: ${vsbe_total} ({vsbe_count} entries)")
-        print(f"    VSBE Percentage: {vsbe_percentage:.2f}% (required: {threshold}%)")
-
-        if vsbe_percentage < threshold:
-            return f"{rule.rule_name}: VSBE participation {vsbe_percentage:.2f}% is below required {threshold}%"
-
-        return None
-    
-    def _check_local_preference_rule(self, bid: Bid, rule: ComplianceRule, rule_def: dict) -> str:
-        """Check local preference rule"""
-        # This would check if local businesses are given preference
-        # Implementation depends on specific jurisdiction requirements
-        return None
-    
-    def _check_dbe_rule(self, bid: Bid, rule: ComplianceRule, rule_def: dict, db: Session) -> str:
-        """Check DBE compliance rule - using breakdown data when available"""
-        threshold = Decimal(str(rule_def.get('threshold', 0)))
-        print(f"    DBE Rule - Threshold: {threshold}%")
-
-        if not bid.total_amount or bid.total_amount == 0:
-            print(f"    WARNING: Bid total_amount is 0 or None, skipping DBE check")
-            return None
-
-        dbe_total = Decimal('0')
-        dbe_count = 0
-
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = bid_sub.subcontractor
-            if not subcontractor:
-                continue
+            return self._result("WARNING", *warnings)
 
-            print(f"    Checking {subcontractor.legal_name}: value=${bid_sub.subcontract_value}")
-
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            # Check if breakdown data exists
-            if bid_sub.category_breakdown:
-                print(f"      Using category breakdown: {bid_sub.category_breakdown}")
-                # Use breakdown to calculate DBE portion - NO certification check needed when using breakdown
-                for entry in bid_sub.category_breakdown:
-                    if entry.get('category', '').lower() == 'dbe':
-                        percentage = Decimal(str(entry.get('percentage', 0)))
-                        allocated_amount = bid_sub.subcontract_value * (percentage / Decimal('100'))
-                        dbe_total += allocated_amount
-                        dbe_count += 1
-                        print(f"      ✓ Allocated ${allocated_amount} ({percentage}%) to DBE from breakdown")
-                        break
-            else:
-                # Fallback: check directory certifications (old behavior)
-                if directory_entry and directory_entry.certifications:
-                    has_dbe = directory_entry.certifications.get('dbe', False)
-                    print(f"      Directory DBE certification: {has_dbe}")
-                    if has_dbe:
-                        dbe_total += bid_sub.subcontract_value
-                        dbe_count += 1
-                        print(f"      ✓ Counted full amount toward DBE total")
-                else:
-                    print(f"      ✗ No directory entry or certifications")
-
-        dbe_percentage = (dbe_total / bid.total_amount) * 100
-        print(f"    DBE Total: ${dbe_total} ({dbe_count} entries)")
-        print(f"    DBE Percentage: {dbe_percentage:.2f}% (required: {threshold}%)")
+        return self._result("PASS", finding("JCR_OK"))
 
-        if dbe_percentage < threshold:
-            return f"{rule.rule_name}: DBE participation {dbe_percentage:.2f}% is below required {threshold}%"
 
-        return None
+class MBEPercentageRule(ValidationRule):
+    """
+    Check if MBE percentage meets goal - using breakdown data when available
 
+    Bids without a total get a "cannot calculate" WARNING without being evaluated.
+    """
 
-class MBEPercentageRule(ValidationRule):
-    """Check if MBE percentage meets goal - using breakdown data when available"""
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_TOTAL_AMOUNT}))
 
     def __init__(self):
         super().__init__(
             "mbe_percentage",
+            "MBP",
             "Verify MBE participation meets goal (using breakdown when available, verified from directory DB)"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        if not bid.total_amount or bid.total_amount == 0:
-            return {
-                "status": "WARNING",
-                "error_message": "Cannot calculate MBE percentage: total amount is 0"
-            }
-
-        mbe_total = Decimal('0')
-        for bs in bid.bid_subcontractors:
-            subcontractor = bs.subcontractor
-            if not subcontractor:
-                continue
+    def skipped_result(self, context: BidValidationContext) -> Optional[Dict]:
+        return self._result("WARNING", finding("MBE_NO_TOTAL"))
 
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            # Check if breakdown data exists
-            if bs.category_breakdown:
-                # Use breakdown to calculate MBE portion
-                for entry in bs.category_breakdown:
-                    if entry.get('category', '').lower() == 'mbe':
-                        percentage = Decimal(str(entry.get('percentage', 0)))
-                        allocated_amount = bs.subcontract_value * (percentage / Decimal('100'))
-
-                        # Verify MBE certification in directory
-                        if directory_entry and directory_entry.certifications:
-                            if directory_entry.certifications.get('mbe', False):
-                                mbe_total += allocated_amount
-                        break
-            elif bs.counts_toward_mbe:
-                # Fallback: use counts_toward_mbe flag (old behavior)
-                if directory_entry and directory_entry.certifications:
-                    if directory_entry.certifications.get('mbe', False):
-                        mbe_total += bs.subcontract_value
-
-        subcontract_sum = sum(bs.subcontract_value for bs in bid.bid_subcontractors)
-        denominator = subcontract_sum or bid.total_amount
-        mbe_percentage = (mbe_total / denominator) * 100
-
-        if mbe_percentage < bid.mbe_goal:
-            return {
-                "status": "FAIL",
-                "error_message": f"MBE percentage {mbe_percentage:.2f}% is below goal of {bid.mbe_goal}% (verified from directory DB)"
-            }
-
-        return {
-            "status": "PASS",
-            "error_message": f"MBE percentage {mbe_percentage:.2f}% meets goal of {bid.mbe_goal}% (verified from directory DB)"
-        }
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
+        # Certified MBE share of the subcontracted amount (breakdown verified against directory DB)
+        mbe_percentage = context.participation.percentage(
+            'mbe', basis=CERTIFIED, denominator=SUBCONTRACT_TOTAL
+        )
+
+        trace.step(
+            "goal_check",
+            category="MBE",
+            actual=f"{mbe_percentage:.2f}",
+            goal=context.mbe_goal,
+            passed=not mbe_percentage < context.mbe_goal
+        )
+
+        if mbe_percentage < context.mbe_goal:
+            return self._result(
+                "FAIL",
+                finding("MBE_BELOW", actual=f"{mbe_percentage:.2f}", goal=context.mbe_goal)
+            )
+
+        return self._result(
+            "PASS",
+            finding("MBE_MEETS", actual=f"{mbe_percentage:.2f}", goal=context.mbe_goal)
+        )
 
 
 class SubcontractorNAICSMatchRule(ValidationRule):
     """Check if bid NAICS matches subcontractor NAICS codes from directory DB"""
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_LINES}))
+    cost_tier = COST_FLAGS
+
     def __init__(self):
         super().__init__(
             "naics_match_certification",
+            "NMC",
             "Verify NAICS code matches subcontractor NAICS codes in directory DB"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        print(f"\n=== DEBUG: SubcontractorNAICSMatchRule ===")
-        print(f"Bid ID: {bid.id}")
-
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
         errors = []
 
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
+        for line in context.lines:
+            if line.legal_name is None:
                 continue
 
-            print(f"\nChecking NAICS for: {subcontractor.legal_name}")
-            print(f"  Bid NAICS code: '{bid_sub.naics_code}'")
-
             # Get NAICS codes from directory DB
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
+            directory_entry = line.directory
 
             if not directory_entry:
-                print(f"  ✗ Not found in directory DB")
-                errors.append(
-                    f"{subcontractor.legal_name}: Not found in directory DB"
-                )
+                trace.step("directory_lookup", name=line.legal_name, found=False, passed=False)
+                errors.append(finding("NAICS_MATCH_DIR_NOT_FOUND", name=line.legal_name))
                 continue
 
-            if not directory_entry.naics_codes or len(directory_entry.naics_codes) == 0:
-                print(f"  ✗ No NAICS codes in directory DB")
-                errors.append(
-                    f"{subcontractor.legal_name}: No NAICS codes in directory DB"
-                )
+            listed = line.naics_code in directory_entry.naics_codes
+            trace.step(
+                "naics_check",
+                name=line.legal_name,
+                naics_code=line.naics_code,
+                directory_codes=directory_entry.naics_codes,
+                passed=listed
+            )
+
+            if not directory_entry.naics_codes:
+                errors.append(finding("NAICS_MATCH_DIR_EMPTY", name=line.legal_name))
                 continue
 
-            print(f"  Directory NAICS codes: {directory_entry.naics_codes}")
-
             # Check if bid NAICS code is in directory NAICS codes
-            if bid_sub.naics_code not in directory_entry.naics_codes:
-                print(f"  ✗ NAICS code '{bid_sub.naics_code}' NOT in directory list")
-                errors.append(
-                    f"{subcontractor.legal_name}: NAICS code '{bid_sub.naics_code}' not listed in directory DB. Valid codes: {', '.join(directory_entry.naics_codes)}"
-                )
-            else:
-                print(f"  ✓ NAICS code '{bid_sub.naics_code}' found in directory")
+            if not listed:
+                errors.append(finding(
+                    "NAICS_MATCH_NOT_LISTED",
+                    name=line.legal_name,
+                    naics_code=line.naics_code,
+                    directory_codes=', '.join(directory_entry.naics_codes)
+                ))
 
         if errors:
-            print(f"\nRESULT: FAIL with {len(errors)} error(s)")
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
 
-        print("\nRESULT: PASS - All NAICS codes match directory DB")
-        return {
-            "status": "PASS",
-            "error_message": "All NAICS codes match directory DB"
-        }
+        return self._result("PASS", finding("NAICS_OK"))
 
 
 class JurisdictionSpecificGoalRule(ValidationRule):
     """
     Check if bid meets jurisdiction-specific category goals (MBE, VSBE, WBE, SBE, DBE, CBE, etc.)
     Gets jurisdiction codes from subcontractor_directory and validates against jurisdiction's typical goals
+
+    Bids without a total or jurisdictions get a "cannot verify" WARNING without
+    being evaluated.
     """
 
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_TOTAL_AMOUNT, REQUIRES_JURISDICTIONS}))
+
     def __init__(self):
         super().__init__(
             "jurisdiction_specific_goals",
+            "JSG",
             "Verify bid meets jurisdiction-specific category goals from directory DB"
         )
 
-    def validate(self, bid: Bid, db: Session) -> Dict:
-        print(f"\n=== DEBUG: JurisdictionSpecificGoalRule ===")
-        print(f"Bid ID: {bid.id}")
-        print(f"Bid total_amount: {bid.total_amount}")
-        print(f"Bid mbe_goal: {bid.mbe_goal}%")
-
-        if not bid.total_amount or bid.total_amount == 0:
-            print("WARNING: Bid total_amount is 0, cannot verify goals")
-            return {
-                "status": "WARNING",
-                "error_message": "Cannot verify jurisdiction-specific goals: total amount is 0"
-            }
-
-        # Collect all unique jurisdiction codes from subcontractors in directory
-        jurisdiction_codes = set()
-
-        print(f"\nNumber of bid subcontractors: {len(bid.bid_subcontractors)}")
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = db.query(Subcontractor).filter(
-                Subcontractor.id == bid_sub.subcontractor_id
-            ).first()
-
-            if not subcontractor:
-                continue
-
-            # Get jurisdiction codes from directory
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
+    def skipped_result(self, context: BidValidationContext) -> Optional[Dict]:
+        if not context.total_amount:
+            return self._result("WARNING", finding("JSG_NO_TOTAL"))
 
-            if directory_entry and directory_entry.jurisdiction_codes:
-                print(f"  {subcontractor.legal_name}: jurisdictions {directory_entry.jurisdiction_codes}")
-                jurisdiction_codes.update(directory_entry.jurisdiction_codes)
+        jurisdiction_codes = context.jurisdiction_codes
 
         if not jurisdiction_codes:
-            print("\nRESULT: No jurisdiction codes found in directory")
-            return {
-                "status": "WARNING",
-                "error_message": "Cannot verify jurisdiction-specific goals: jurisdiction not identified"
-            }
-
-        print(f"\nUnique jurisdiction codes found: {list(jurisdiction_codes)}")
-
-        # Get jurisdiction records
-        jurisdictions = db.query(Jurisdiction).filter(
-            Jurisdiction.code.in_(list(jurisdiction_codes))
-        ).all()
+            return self._result("WARNING", finding("JSG_NO_CODES"))
 
-        if not jurisdictions:
-            print("RESULT: No matching jurisdictions found in DB")
-            return {
-                "status": "WARNING",
-                "error_message": f"Cannot verify jurisdiction-specific goals: no jurisdiction records found for {', '.join(jurisdiction_codes)}"
-            }
+        return self._result(
+            "WARNING",
+            finding("JSG_NO_JURISDICTIONS", codes=', '.join(sorted(jurisdiction_codes)))
+        )
 
-        print(f"Jurisdictions found: {[(j.code, j.name) for j in jurisdictions]}")
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
+        # Jurisdiction records were preloaded with the context
+        jurisdictions = context.jurisdictions
 
         errors = []
         warnings = []
 
-        # Calculate actual percentages for each certification type
-        cert_totals = {
-            'mbe': Decimal('0'),
-            'vsbe': Decimal('0'),
-            'wbe': Decimal('0'),
-            'sbe': Decimal('0'),
-            'dbe': Decimal('0'),
-            'cbe': Decimal('0')
-        }
-
-        print("\n--- Calculating Certification Totals from Breakdown & Directory ---")
-        for bid_sub in bid.bid_subcontractors:
-            subcontractor = bid_sub.subcontractor
-            if not subcontractor:
-                continue
+        # Certified totals for each category come from the shared participation ledger
+        ledger = context.participation
 
-            directory_entry = db.query(SubcontractorDirectory).filter(
-                SubcontractorDirectory.legal_name == subcontractor.legal_name
-            ).first()
-
-            print(f"\n{subcontractor.legal_name} (${bid_sub.subcontract_value}):")
-
-            # Check if category_breakdown exists
-            if bid_sub.category_breakdown:
-                print(f"  Using category breakdown: {bid_sub.category_breakdown}")
-                # Use the breakdown to allocate amounts to categories
-                for entry in bid_sub.category_breakdown:
-                    category = entry.get('category', '').lower()
-                    percentage = Decimal(str(entry.get('percentage', 0)))
-                    allocated_amount = bid_sub.subcontract_value * (percentage / Decimal('100'))
-
-                    # Verify certification exists in directory
-                    if directory_entry and directory_entry.certifications:
-                        if directory_entry.certifications.get(category, False):
-                            cert_totals[category] += allocated_amount
-                            print(f"  ✓ Allocated ${allocated_amount} ({percentage}%) to {category.upper()} (verified in directory)")
-                        else:
-                            print(f"  ✗ {category.upper()} not certified in directory, skipping")
-                    else:
-                        print(f"  ✗ No directory entry or certifications, skipping {category.upper()}")
-            elif directory_entry and directory_entry.certifications:
-                # Fallback: Use directory certifications (old behavior)
-                print(f"  No breakdown, using directory certifications: {directory_entry.certifications}")
-                # Count each certification type
-                for cert_type in cert_totals.keys():
-                    if directory_entry.certifications.get(cert_type, False):
-                        cert_totals[cert_type] += bid_sub.subcontract_value
-                        print(f"  ✓ Counted full amount toward {cert_type.upper()}")
-
-        # Calculate percentages
         cert_percentages = {}
-        print("\n--- Certification Percentages ---")
-        for cert_type, total in cert_totals.items():
-            percentage = (total / bid.total_amount) * 100
+        for cert_type in CATEGORIES:
+            percentage = ledger.percentage(cert_type, basis=CERTIFIED, denominator=BID_TOTAL)
             cert_percentages[cert_type] = percentage
-            if total > 0:
-                print(f"{cert_type.upper()}: ${total} = {percentage:.2f}%")
+            if trace.enabled and percentage > 0:
+                trace.step(
+                    "participation",
+                    category=cert_type.upper(),
+                    amount=ledger.amount(cert_type),
+                    percentage=f"{percentage:.2f}"
+                )
 
         # Check against each jurisdiction's goals
         for jurisdiction in jurisdictions:
-            print(f"\n--- Checking {jurisdiction.code} ({jurisdiction.name}) Goals ---")
-
             # Check MBE goal
             if jurisdiction.mbe_goal_typical:
-                print(f"MBE Goal: {jurisdiction.mbe_goal_typical}% (Actual: {cert_percentages['mbe']:.2f}%)")
-                if cert_percentages['mbe'] < jurisdiction.mbe_goal_typical:
-                    errors.append(
-                        f"{jurisdiction.name}: MBE {cert_percentages['mbe']:.2f}% is below required {jurisdiction.mbe_goal_typical}%"
-                    )
-                    print(f"  FAIL: Below threshold")
-                else:
-                    print(f"  PASS: Meets threshold")
+                passed = not cert_percentages['mbe'] < jurisdiction.mbe_goal_typical
+                trace.step(
+                    "goal_check",
+                    jurisdiction=jurisdiction.code,
+                    category="MBE",
+                    actual=f"{cert_percentages['mbe']:.2f}",
+                    goal=jurisdiction.mbe_goal_typical,
+                    passed=passed
+                )
+                if not passed:
+                    errors.append(finding(
+                        "JSG_BELOW",
+                        jurisdiction=jurisdiction.name,
+                        category="MBE",
+                        actual=f"{cert_percentages['mbe']:.2f}",
+                        required=jurisdiction.mbe_goal_typical
+                    ))
 
             # Check VSBE goal
             if jurisdiction.vsbe_goal_typical:
-                print(f"VSBE Goal: {jurisdiction.vsbe_goal_typical}% (Actual: {cert_percentages['vsbe']:.2f}%)")
-                if cert_percentages['vsbe'] < jurisdiction.vsbe_goal_typical:
-                    errors.append(
-                        f"{jurisdiction.name}: VSBE {cert_percentages['vsbe']:.2f}% is below required {jurisdiction.vsbe_goal_typical}%"
-                    )
-                    print(f"  FAIL: Below threshold")
-                else:
-                    print(f"  PASS: Meets threshold")
+                passed = not cert_percentages['vsbe'] < jurisdiction.vsbe_goal_typical
+                trace.step(
+                    "goal_check",
+                    jurisdiction=jurisdiction.code,
+                    category="VSBE",
+                    actual=f"{cert_percentages['vsbe']:.2f}",
+                    goal=jurisdiction.vsbe_goal_typical,
+                    passed=passed
+                )
+                if not passed:
+                    errors.append(finding(
+                        "JSG_BELOW",
+                        jurisdiction=jurisdiction.name,
+                        category="VSBE",
+                        actual=f"{cert_percentages['vsbe']:.2f}",
+                        required=jurisdiction.vsbe_goal_typical
+                    ))
 
             # Note: Other certification goals (WBE, SBE, DBE, CBE) would be checked here
             # if the jurisdiction model is extended to include those fields
 
         if errors:
-            print(f"\nRESULT: FAIL with {len(errors)} error(s)")
-            return {
-                "status": "FAIL",
-                "error_message": "; ".join(errors)
-            }
+            return self._result("FAIL", *errors)
         elif warnings:
-            print(f"\nRESULT: WARNING with {len(warnings)} warning(s)")
-            return {
-                "status": "WARNING",
-                "error_message": "; ".join(warnings)
-            }
+            return self._result("WARNING", *warnings)
+
+        return self._result("PASS", finding("JSG_OK"))
+
+
+class SubcontractorCommitmentRule(ValidationRule):
+    """
+    Flag subcontractors committed to more concurrent bids, or more subcontract value,
+    than they can realistically deliver
 
-        print("\nRESULT: PASS - All jurisdiction-specific goals met")
-        return {
-            "status": "PASS",
-            "error_message": "All jurisdiction-specific goals met from directory DB"
-        }
+    Reads the cross-bid totals loaded with each bid line from subcontractor_commitments,
+    so the check is one lookup per line. The limits are part of the rule version,
+    so changing them invalidates cached results.
+    """
+
+    depends_on = RuleDependencies(requires=frozenset({REQUIRES_LINES}))
+    cost_tier = COST_FLAGS
+
+    def __init__(self, max_bids: Optional[int] = None, max_value: Optional[Decimal] = None):
+        super().__init__(
+            "subcontractor_overcommitment",
+            "OVC",
+            "Flag subcontractors committed across too many concurrent bids"
+        )
+        self.max_bids = settings.OVERCOMMIT_MAX_BIDS if max_bids is None else max_bids
+        self.max_value = Decimal(str(settings.OVERCOMMIT_MAX_VALUE if max_value is None else max_value))
+        self.version = f"1:{self.max_bids}:{self.max_value}"
+
+    def validate(self, context: BidValidationContext, trace: NullTrace = NULL_TRACE) -> Dict:
+        warnings = []
+        checked = set()
 
+        for line in context.lines:
+            commitment = line.commitment
+            if commitment is None or line.subcontractor_id in checked:
+                continue
+            checked.add(line.subcontractor_id)
+
+            name = line.legal_name or line.subcontractor_id
+            too_many_bids = bool(self.max_bids) and commitment.bid_count > self.max_bids
+            too_much_value = bool(self.max_value) and commitment.committed_value > self.max_value
+            trace.step(
+                "commitment_check",
+                name=name,
+                bid_count=commitment.bid_count,
+                committed_value=commitment.committed_value,
+                passed=not (too_many_bids or too_much_value)
+            )
+
+            if too_many_bids:
+                warnings.append(finding(
+                    "OVC_TOO_MANY_BIDS", name=name, bid_count=commitment.bid_count, limit=self.max_bids
+                ))
+            if too_much_value:
+                warnings.append(finding(
+                    "OVC_TOO_MUCH_VALUE",
+                    name=name,
+                    committed_value=f"{commitment.committed_value:,.2f}",
+                    limit=f"{self.max_value:,.2f}"
+                ))
+
+        if warnings:
+            return self._result("WARNING", *warnings)
+
+        return self._result("PASS", finding("OVC_OK"))
+
+
+# Part of the validation cache key - bump whenever rule logic or ALL_RULES changes
+RULESET_VERSION = "2025.11.6"
 
 # List of all validation rules - ALL VERIFIED FROM DIRECTORY DB
 # Validation order:
@@ -873,4 +630,5 @@ ALL_RULES = [
     JurisdictionComplianceRule(),        # Check compliance rules (amounts only, verified from directory DB)
     MBEPercentageRule(),                 # Count amounts for MBE percentage (verified from directory DB)
     JurisdictionSpecificGoalRule(),      # Check jurisdiction-specific goals
+    SubcontractorCommitmentRule(),       # Flag subcontractors overcommitted across all bids
 ]
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Shadow evaluation of compliance rule drafts
+
+A ComplianceRuleDraft is a proposed version of a compliance rule. While one is
+active, a /bids/{id}/validate call that records a new run schedules
+run_shadow_evaluation after the response has been sent: the bid's context is
+loaded in a separate session, the jurisdiction compliance rule is evaluated
+once with the live rules and once with the draft swapped in, the way the engine
+would, and the two outcomes are upserted into shadow_rule_diffs. Only the
+active-draft check runs on the request path.
+"""
+import dataclasses
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import ComplianceRuleDraft, ShadowRuleDiff
+from app.validation.context import BidValidationContext, RuleSnapshot, load_bid_context
+from app.validation.registry import RuleRegistry, registry
+from app.validation.rules import ValidationRule
+
+logger = logging.getLogger(__name__)
+
+COMPLIANCE_RULE_CODE = "JCR"  # JurisdictionComplianceRule, the rule drafts feed into
+
+
+@dataclass(frozen=True)
+class ShadowDraft:
+    """A draft as a rule snapshot, plus the live rule it would replace"""
+    draft_id: UUID
+    replaces: Optional[UUID]
+    rule: RuleSnapshot
+
+    @classmethod
+    def from_model(cls, draft: ComplianceRuleDraft) -> "ShadowDraft":
+        return cls(
+            draft_id=draft.id,
+            replaces=draft.compliance_rule_id,
+            # Keyed by the draft id so the compiled-rule cache never mixes it up with the live rule
+            rule=RuleSnapshot(
+                id=draft.id,
+                jurisdiction_id=draft.jurisdiction_id,
+                rule_name=draft.rule_name,
+                rule_type=draft.rule_type,
+                rule_definition=dict(draft.rule_definition or {}),
+                severity=draft.severity
+            )
+        )
+
+
+def shadow_context(context: BidValidationContext, draft: ShadowDraft) -> Optional[BidValidationContext]:
+    """
+    The context with the draft in place of the live rule, None if the draft cannot affect the bid
+
+    The draft takes the live rule's position so findings keep their order.
+    """
+    applies = any(j.id == draft.rule.jurisdiction_id for j in context.jurisdictions)
+    replaced = draft.replaces is not None and any(r.id == draft.replaces for r in context.compliance_rules)
+
+    if not applies and not replaced:
+        return None
+
+    rules: List[RuleSnapshot] = []
+    for rule in context.compliance_rules:
+        if rule.id == draft.replaces:
+            if applies:
+                rules.append(draft.rule)
+            continue
+        rules.append(rule)
+
+    if applies and not replaced:
+        rules.append(draft.rule)
+
+    return dataclasses.replace(context, compliance_rules=tuple(rules))
+
+
+def _evaluate(rule: ValidationRule, context: BidValidationContext) -> Optional[Dict]:
+    """The result evaluate_context would record for the rule, None if it records none"""
+    if rule.applies_to(context):
+        return rule.validate(context)
+    return rule.skipped_result(context)
+
+
+def compare(
+    context: BidValidationContext,
+    draft: ShadowDraft,
+    rule_registry: RuleRegistry = registry
+) -> Optional[Dict]:
+    """
+    Live and shadow jurisdiction compliance results for one bid
+
+    None if the draft does not apply, or if validation would record no compliance
+    result for the bid either way (e.g. the rule is not registered).
+    """
+    rule = rule_registry.get(COMPLIANCE_RULE_CODE)
+    if rule is None:
+        return None
+
+    shadow = shadow_context(context, draft)
+    if shadow is None:
+        return None
+
+    live_result = _evaluate(rule, context)
+    shadow_result = _evaluate(rule, shadow)
+    if live_result is None or shadow_result is None:
+        return None
+
+    return {
+        "draft_id": draft.draft_id,
+        "bid_id": context.bid_id,
+        "jurisdiction_id": draft.rule.jurisdiction_id,
+        "live_status": live_result["status"],
+        "shadow_status": shadow_result["status"],
+        "diverged": (
+            live_result["status"] != shadow_result["status"]
+            or live_result["findings"] != shadow_result["findings"]
+        ),
+        "live_findings": [list(f) for f in live_result["findings"]],
+        "shadow_findings": [list(f) for f in shadow_result["findings"]],
+    }
+
+
+def has_active_drafts(db: Session) -> bool:
+    """Whether validated bids should be shadow-evaluated: SHADOW_EVALUATION is on and a draft is active"""
+    if not settings.SHADOW_EVALUATION:
+        return False
+    return db.query(
+        db.query(ComplianceRuleDraft.id).filter(ComplianceRuleDraft.is_active.is_(True)).exists()
+    ).scalar()
+
+
+class ShadowEvaluator:
+    """Evaluate the active drafts against one bid and record the outcome"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def active_drafts(self) -> List[ShadowDraft]:
+        drafts = self.db.query(ComplianceRuleDraft).filter(
+            ComplianceRuleDraft.is_active.is_(True)
+        ).order_by(ComplianceRuleDraft.created_at).all()
+        return [ShadowDraft.from_model(d) for d in drafts]
+
+    def evaluate_bid(self, bid_id: UUID) -> int:
+        """Compare every active draft on the bid; returns the number of diff rows written"""
+        drafts = self.active_drafts()
+        if not drafts:
+            return 0
+
+        context = load_bid_context(self.db, bid_id)
+        if context is None:
+            return 0
+
+        rows = [row for row in (compare(context, draft) for draft in drafts) if row is not None]
+
+        if not rows:
+            self.db.rollback()
+            return 0
+
+        evaluated_at = datetime.utcnow()
+        for row in rows:
+            row["evaluated_at"] = evaluated_at
+
+        table = ShadowRuleDiff.__table__
+        statement = pg_insert(table).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.draft_id, table.c.bid_id],
+            set_={
+                column: statement.excluded[column]
+                for column in (
+                    "jurisdiction_id", "live_status", "shadow_status", "diverged",
+                    "live_findings", "shadow_findings", "evaluated_at"
+                )
+            }
+        )
+        self.db.execute(statement)
+        self.db.commit()
+        return len(rows)
+
+
+def run_shadow_evaluation(bid_id: UUID) -> None:
+    """Background task: evaluate active drafts for a bid in its own session"""
+    if not settings.SHADOW_EVALUATION:
+        return
+
+    db = SessionLocal()
+    try:
+        ShadowEvaluator(db).evaluate_bid(bid_id)
+    except Exception:
+        logger.exception("Shadow evaluation of bid %s failed", bid_id)
+        db.rollback()
+    finally:
+        db.close()
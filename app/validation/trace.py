@@ -0,0 +1,67 @@
+"""
+Structured trace of a validation run
+
+Rules receive a trace object and report evaluation steps to it. The default
+NULL_TRACE does nothing, so tracing costs a no-op method call when disabled.
+TraceCollector records the steps per rule for ?trace=1 responses.
+"""
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+
+class NullTrace:
+    """Trace that discards everything"""
+
+    enabled = False
+
+    def begin_rule(self, code: str, name: str) -> None:
+        pass
+
+    def step(self, event: str, **data) -> None:
+        pass
+
+    def end_rule(self, status: str) -> None:
+        pass
+
+
+NULL_TRACE = NullTrace()
+
+
+def _plain(value: Any) -> Any:
+    """JSON-friendly copy of a traced value"""
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(_plain(v) for v in value)
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _plain(v) for k, v in value.items()}
+    return value
+
+
+class TraceCollector(NullTrace):
+    """Records evaluation steps grouped by rule"""
+
+    enabled = True
+
+    def __init__(self):
+        self.rules: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+
+    def begin_rule(self, code: str, name: str) -> None:
+        self._current = {"rule_code": code, "rule_name": name, "status": None, "steps": []}
+        self.rules.append(self._current)
+
+    def step(self, event: str, **data) -> None:
+        if self._current is None:
+            return
+        entry = {"event": event}
+        entry.update((key, _plain(value)) for key, value in data.items())
+        self._current["steps"].append(entry)
+
+    def end_rule(self, status: str) -> None:
+        if self._current is not None:
+            self._current["status"] = status
+            self._current = None